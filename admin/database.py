@@ -1,10 +1,18 @@
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo import MongoClient
 from pymongo.database import Database
 from fastapi import HTTPException
 from settings import settings
 
+# Holds one {_id: <collection name>, version, updated_at} document per versioned collection.
+# The backend uses the version of the hackathons collection to answer conditional GETs.
+COLLECTION_VERSIONS = "collection_versions"
+# Materialized facet counts of the public filters, one {status, location.country, location.city, date.start_date, count}
+# bucket per start day. Built by the backend (see backend/hackathon_facets.py), kept up to date here.
+HACKATHON_FACETS = "hackathon_facets"
+
 # Initialize clients as None - they will be created on first use
 _async_client: Optional[AsyncIOMotorClient] = None
 _sync_client: Optional[MongoClient] = None
@@ -51,6 +59,38 @@ def get_db() -> Database:
     """
     return get_sync_client()[settings.mongodb_database]
 
+async def bump_collection_version(db: AsyncIOMotorDatabase, collection_name: str, session=None):
+    """
+    Marks a collection as changed so cached public reads get invalidated.
+    Call this after every write to the hackathons collection, inside the same transaction if there is one.
+    """
+    await db[COLLECTION_VERSIONS].update_one(
+        {"_id": collection_name},
+        {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+        upsert=True,
+        session=session
+    )
+
+async def increment_hackathon_facets(db: AsyncIOMotorDatabase, hackathon_doc: Dict[str, Any], session=None):
+    """
+    Counts a newly inserted hackathon in its facet bucket.
+    Call this after every insert into the hackathons collection, inside the same transaction if there is one.
+    """
+    start_date = hackathon_doc["date"]["start_date"]
+    if start_date.tzinfo is not None:
+        start_date = start_date.astimezone(timezone.utc).replace(tzinfo=None)
+    await db[HACKATHON_FACETS].update_one(
+        {
+            "status": hackathon_doc.get("status"),
+            "location.country": hackathon_doc["location"]["country"],
+            "location.city": hackathon_doc["location"]["city"],
+            "date.start_date": datetime(start_date.year, start_date.month, start_date.day),
+        },
+        {"$inc": {"count": 1}},
+        upsert=True,
+        session=session
+    )
+
 async def close_async_connection():
     """
     Close the async MongoDB connection.
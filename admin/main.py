@@ -8,7 +8,7 @@ from settings import settings
 import httpx
 import os
 from shared_models import Hackathon, HackathonStatus, Location, Coordinates, DateRange, InboxStatus
-from database import get_db, get_async_db, init_db
+from database import get_db, get_async_db, init_db, bump_collection_version, increment_hackathon_facets
 import logging
 from bson import ObjectId
 
@@ -94,10 +94,13 @@ async def approve_inbox_item(db, inbox_item_id: str, session=None) -> bool:
 
 async def perform_transaction(session, db, hackathon, inbox_item_id=None):
     """Function to run within a transaction"""
+    hackathon_doc = hackathon.to_mongo()
     insert_result = await db.hackathons.insert_one(
-        hackathon.to_mongo(),
+        hackathon_doc,
         session=session
     )
+    await increment_hackathon_facets(db, hackathon_doc, session=session)
+    await bump_collection_version(db, "hackathons", session=session)
     
     if inbox_item_id:
         try:
@@ -218,9 +221,10 @@ async def trigger_scrape():
 
 
 @app.get("/inbox")
-async def get_inbox_items(status: str | None = None, db = Depends(get_db)):
+async def get_inbox_items(status: str | None = None, needs_review: bool | None = None, db = Depends(get_db)):
     """
     Get all items from the inbox collection with optional status filtering.
+    needs_review=true returns the reviewed items that changed since (see inbox_processor.content_update).
     """
     try:
         # Get the inbox collection
@@ -230,6 +234,8 @@ async def get_inbox_items(status: str | None = None, db = Depends(get_db)):
         query = {}
         if status:
             query["review_status"] = status.lower()
+        if needs_review is not None:
+            query["needs_review"] = needs_review
         
         # Fetch all matching documents
         cursor = collection.find(query)
@@ -272,6 +278,22 @@ async def reject_inbox_item(request: Request, db=Depends(get_async_db)):
     return {"status": "success"}
     
 
+@app.post("/inbox/reviewed")
+async def mark_inbox_item_reviewed(request: Request, db=Depends(get_async_db)):
+    """Clears needs_review once the change of a reviewed item has been checked against its hackathon."""
+    data = await request.json()
+    inbox_item_id = data.get("inbox_item_id")
+    if not inbox_item_id:
+        raise HTTPException(status_code=400, detail="Missing inbox_item_id")
+    result = await db.inbox.update_one(
+        {"_id": ObjectId(inbox_item_id)},
+        {"$set": {"needs_review": False}},
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Inbox item not found")
+    return {"status": "success"}
+
+
 @app.post("/toggle-database")
 async def toggle_database(request: Request):
     """
@@ -0,0 +1,134 @@
+"""
+Benchmark of the fuzzy duplicate detection at scale.
+
+Builds N synthetic stored hackathons and an in-memory version of the dedup_blocks index (block -> records, what
+the multikey index answers in MongoDB), then matches scraped items against it: half of them are variants of stored
+events (other spelling, year in the name, dates shifted by a day), half are new events. Reports the cost of blocking
+(candidates per item, time per item) and its recall compared to scoring a sample against every stored record.
+
+Run from the backend folder:
+    python benchmarks/bench_fuzzy_dedup.py
+    python benchmarks/bench_fuzzy_dedup.py --records 100000 --items 1000 --brute-force-sample 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fuzzy_dedup import MatchRecord, best_match  # noqa: E402
+from shared_models import InboxItem, DateRange  # noqa: E402
+from shared_models.dedup import candidate_blocks, dedup_blocks  # noqa: E402
+
+SYLLABLES = ["ka", "zu", "ri", "lo", "mex", "tor", "an", "vel", "io", "quan", "dra", "sol", "pix", "nor", "bit",
+             "cy", "ber", "lum", "ost", "var", "gen", "hel", "ix", "mo", "ra", "sy", "tek", "ul", "wa", "zen"]
+WORDS = ["Hack", "Code", "Hacks", "Jam", "Sprint", "Build", "Summit", "Days", "Camp", "Lab"]
+CITIES = [("Zurich", "Switzerland"), ("Berlin", "Germany"), ("Toronto", "Canada"), ("Espoo", "Finland"),
+          ("London", "United Kingdom"), ("Paris", "France"), ("Boston", "USA"), ("Online", "Online")]
+
+
+def make_records(n: int, rng: random.Random) -> list[dict]:
+    start = datetime(2030, 1, 1)
+    docs = []
+    for i in range(n):
+        stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        name = f"{stem}{rng.choice(WORDS)} {i % 97}"
+        day = start + timedelta(days=rng.randint(0, 3 * 365))
+        city, country = rng.choice(CITIES)
+        docs.append({
+            "_id": ObjectId(),
+            "name": name,
+            "date": {"start_date": day, "end_date": day + timedelta(days=2)},
+            "location": {"city": city, "state": None, "country": country},
+            "url_key": f"hackathon-{i}.example.com",
+        })
+    return docs
+
+
+def variant_of(doc: dict, rng: random.Random) -> InboxItem:
+    name = doc["name"]
+    name = rng.choice([name.upper(), name.replace(" ", "  "), f"{name} {doc['date']['start_date'].year}", f"The {name}"])
+    shift = timedelta(days=rng.choice([-1, 0, 0, 1]))
+    location = doc["location"]
+    return InboxItem(
+        name=name,
+        date=DateRange(start_date=doc["date"]["start_date"] + shift, end_date=doc["date"]["end_date"] + shift),
+        location=f"{location['city']}, {location['country']}",
+        url=f"https://other-source.example.com/{doc['_id']}",
+    )
+
+
+def new_item(i: int, rng: random.Random) -> InboxItem:
+    doc = make_records(1, rng)[0]
+    return InboxItem(
+        name=f"Brand New {doc['name']} {i}",
+        date=DateRange(start_date=doc["date"]["start_date"], end_date=doc["date"]["end_date"]),
+        location=doc["location"]["city"],
+        url=f"https://new.example.com/{i}",
+    )
+
+
+def main(args):
+    rng = random.Random(1)
+    docs = make_records(args.records, rng)
+
+    t0 = time.perf_counter()
+    index = defaultdict(list)
+    records = []
+    for doc in docs:
+        record = MatchRecord.from_doc("hackathons", doc)
+        records.append(record)
+        for block in dedup_blocks(doc["name"], doc["date"]["start_date"]):
+            index[block].append(record)
+    build_seconds = time.perf_counter() - t0
+    print(f"{args.records} stored records, {len(index)} blocks, index built in {build_seconds:.1f}s "
+          f"({build_seconds / args.records * 1e6:.0f} us per record, i.e. the cost per insert)")
+
+    variants = [variant_of(rng.choice(docs), rng) for _ in range(args.items // 2)]
+    new_items = [new_item(i, rng) for i in range(args.items - len(variants))]
+    items = variants + new_items
+
+    candidate_counts = []
+    found = {}
+    t0 = time.perf_counter()
+    for position, item in enumerate(items):
+        candidates = {}
+        for block in candidate_blocks(item.name, item.date.start_date):
+            for record in index.get(block, []):
+                candidates[record.id] = record
+        candidate_counts.append(len(candidates))
+        found[position] = best_match(MatchRecord.from_inbox_item(item), candidates.values())
+    match_seconds = time.perf_counter() - t0
+    flagged_variants = sum(1 for p in range(len(variants)) if found[p] is not None)
+    flagged_new = sum(1 for p in range(len(variants), len(items)) if found[p] is not None)
+    candidate_counts.sort()
+    print(f"{len(items)} scraped items matched in {match_seconds:.2f}s ({match_seconds / len(items) * 1000:.2f} ms per item)")
+    print(f"candidates per item: mean {sum(candidate_counts) / len(candidate_counts):.1f}, "
+          f"p50 {candidate_counts[len(candidate_counts) // 2]}, max {candidate_counts[-1]} (of {args.records})")
+    print(f"flagged: {flagged_variants}/{len(variants)} variants of stored events, {flagged_new}/{len(new_items)} new events")
+
+    sample = rng.sample(range(len(items)), min(args.brute_force_sample, len(items)))
+    t0 = time.perf_counter()
+    agree = 0
+    for position in sample:
+        brute = best_match(MatchRecord.from_inbox_item(items[position]), records)
+        blocked = found[position]
+        agree += (brute is None and blocked is None) or (
+            brute is not None and blocked is not None and brute[0].id == blocked[0].id)
+    brute_seconds = time.perf_counter() - t0
+    print(f"brute force: {brute_seconds / len(sample) * 1000:.0f} ms per item, "
+          f"blocked result identical for {agree}/{len(sample)} sampled items")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--brute-force-sample", type=int, default=20)
+    main(parser.parse_args())
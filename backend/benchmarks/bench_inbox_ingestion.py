@@ -0,0 +1,110 @@
+"""
+Benchmark of inbox ingestion: the per-item loop (is_duplicate + insert_one, up to 3 round trips per item)
+against the batched process_scraped_items (one $in lookup per 1000 items + one unordered bulk write of upserts).
+
+Needs a running MongoDB. Works on its own database, which is dropped before every run, and reports wall time
+and the number of commands sent to the server, which is what dominates against a remote cluster.
+
+Run from the backend folder:
+    python benchmarks/bench_inbox_ingestion.py --uri mongodb://localhost:27017
+    python benchmarks/bench_inbox_ingestion.py --items 10000 --existing 0.3
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo import MongoClient, monitoring
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import inbox_processor  # noqa: E402
+from database import ensure_indexes  # noqa: E402
+from shared_models import InboxItem, InboxStatus, DateRange  # noqa: E402
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name in ("find", "insert", "update", "getMore"):
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def make_items(n: int) -> list[InboxItem]:
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    return [
+        InboxItem(
+            name=f"Benchmark Hackathon {i}",
+            date=DateRange(start_date=start + timedelta(hours=i), end_date=start + timedelta(hours=i + 48)),
+            location="Online",
+            url=f"https://hackathon-{i}.example.com/",
+            source_url="https://benchmark.example.com/events",
+            scraper_name="benchmark",
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_process(items: list[InboxItem], db) -> None:
+    """process_scraped_items before batching: one duplicate check and one insert per item."""
+    for item in items:
+        item.review_status = InboxStatus.PENDING
+        if inbox_processor.is_duplicate(item, db):
+            continue
+        item_dict = item.model_dump(mode='python', by_alias=True)
+        if item_dict.get('_id') is None:
+            item_dict.pop('_id', None)
+        db['inbox'].insert_one(item_dict)
+
+
+def prepare(db, items: list[InboxItem], existing: float) -> None:
+    """Pre-inserts a share of the items, half into the inbox and half into the main collection."""
+    db.client.drop_database(db.name)
+    ensure_indexes(db)
+    pre_existing = items[:int(len(items) * existing)]
+    inbox_docs = [{"url": str(item.url), "url_key": item.url_key, "name": item.name} for item in pre_existing[::2]]
+    hackathon_docs = [{"url": str(item.url), "url_key": item.url_key, "name": item.name} for item in pre_existing[1::2]]
+    if inbox_docs:
+        db['inbox'].insert_many(inbox_docs)
+    if hackathon_docs:
+        db['hackathons'].insert_many(hackathon_docs)
+
+
+def main(args):
+    counter = CommandCounter()
+    client = MongoClient(args.uri, event_listeners=[counter])
+    db = client[args.database]
+    # process_scraped_items gets its database from get_db()
+    inbox_processor.get_db = lambda: db
+
+    items = make_items(args.items)
+    print(f"{args.items} items, {args.existing:.0%} already known, database {args.database}")
+    print(f"{'path':>8} {'seconds':>9} {'commands':>9} {'inbox docs':>11}")
+    for label, run in [("loop", lambda: legacy_process(items, db)),
+                       ("batched", lambda: inbox_processor.process_scraped_items(items))]:
+        prepare(db, items, args.existing)
+        counter.count = 0
+        t0 = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - t0
+        commands = counter.count
+        print(f"{label:>8} {elapsed:>9.2f} {commands:>9} {db['inbox'].count_documents({}):>11}")
+    client.drop_database(args.database)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="hackathondb_benchmark")
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--existing", type=float, default=0.3, help="Share of items that are already known")
+    main(parser.parse_args())
@@ -0,0 +1,112 @@
+"""
+Benchmark of the public listing response path: per-request Pydantic validation + FastAPI serialization
+(how read_hackathons used to work) against the pre-serialized orjson snapshot.
+
+Documents are generated in memory so only the response path is measured, not MongoDB. Each request returns
+all N documents in one body, i.e. the listing before pagination or a page size of N.
+
+Run from the backend folder:
+    python benchmarks/bench_listing_snapshot.py
+    python benchmarks/bench_listing_snapshot.py --sizes 1000 10000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from fastapi import FastAPI, Response
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from listing_snapshot import ListingSnapshotCache, render_json  # noqa: E402
+from shared_models import Hackathon  # noqa: E402
+
+
+def make_docs(n: int) -> list[dict]:
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    statuses = ["announced", "applications_open", "applications_closed", "expected"]
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Benchmark Hackathon {i}",
+            "date": {"start_date": start + timedelta(hours=i), "end_date": start + timedelta(hours=i + 48)},
+            "location": {
+                "city": f"City {i % 500}",
+                "state": None,
+                "country": f"Country {i % 60}",
+                "coordinates": {"lat": 48.1 + i % 10, "long": 11.5 - i % 10},
+            },
+            "url": f"https://hackathon-{i}.example.com/",
+            "notes": "Some notes about the event that are a bit longer than the name.",
+            "status": statuses[i % len(statuses)],
+            "source": "benchmark",
+            "created_at": start,
+        }
+        for i in range(n)
+    ]
+
+
+def make_app(docs: list[dict]) -> FastAPI:
+    app = FastAPI()
+    cache = ListingSnapshotCache(max_bytes=1024 * 1024 * 1024)
+    version = 1
+
+    @app.get("/baseline")
+    async def baseline():
+        # Copy the docs because from_mongo mutates them, like a fresh cursor would return new dicts
+        hackathons = [h for h in (Hackathon.safe_from_mongo(dict(doc)) for doc in docs) if h is not None]
+        return {"data": hackathons, "next_cursor": None}
+
+    @app.get("/snapshot")
+    async def snapshot():
+        body = cache.get(version, ())
+        if body is None:
+            hackathons = [h for h in (Hackathon.safe_from_mongo(dict(doc)) for doc in docs) if h is not None]
+            body = render_json({"data": hackathons, "next_cursor": None})
+            cache.put(version, (), body)
+        return Response(content=body, media_type="application/json")
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> dict:
+    await client.get(path)  # Warm up, this also builds the snapshot
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": requests / total,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "bytes": len(response.content),
+    }
+
+
+async def run(sizes: list[int]):
+    print(f"{'docs':>8} {'path':>9} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'body KiB':>10}")
+    for n in sizes:
+        app = make_app(make_docs(n))
+        requests = max(5, min(100, 500_000 // n))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for path in ("/baseline", "/snapshot"):
+                result = await measure(client, path, requests)
+                print(f"{n:>8} {path[1:]:>9} {result['rps']:>10.1f} {result['p50_ms']:>10.2f} "
+                      f"{result['p99_ms']:>10.2f} {result['bytes'] / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes))
@@ -0,0 +1,63 @@
+"""
+Benchmark of the MlhScraper parsing engines (see PARSERS in scrapers/mlh_scraper.py).
+
+Builds a season page with --cards event cards by repeating the cards of the saved fixture page, parses it with
+every engine and reports the time per page and per card. Also checks that every engine returns the same cards as
+the BeautifulSoup reference engine.
+
+Run from the backend folder:
+    python benchmarks/bench_mlh_parsing.py
+    python benchmarks/bench_mlh_parsing.py --cards 2000 --repeat 5
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scrapers.mlh_scraper import PARSERS  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "..", "tests", "backend", "fixtures", "mlh_season_2030.html")
+_CARD_RE = re.compile(r'      <div class="col-lg-3 col-md-4 col-sm-6.*?\n      </div>\n', re.S)
+
+
+def build_page(cards: int) -> bytes:
+    """The fixture page with its upcoming events section repeated up to the given number of cards."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        page = f.read()
+    heading = page.index("Upcoming Events</h3>")
+    section_end = page.index("    </div>\n    <div class=\"row\">", heading)
+    fixture_cards = _CARD_RE.findall(page, heading, section_end)
+    repeated = [fixture_cards[i % len(fixture_cards)] for i in range(cards)]
+    section_start = page.index("\n", heading) + 1
+    return (page[:section_start] + "".join(repeated) + page[section_end:]).encode()
+
+
+def main(args):
+    page = build_page(args.cards)
+    print(f"Season page with {args.cards} cards, {len(page) / 1024:.0f} KiB, best of {args.repeat} runs")
+    reference = PARSERS["soup"](page)
+    assert reference is not None and len(reference) == args.cards, "Fixture page has an unexpected structure"
+
+    results = {}
+    for name, parse in PARSERS.items():
+        timings = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            cards = parse(page)
+            timings.append(time.perf_counter() - t0)
+        results[name] = min(timings)
+        status = "identical" if cards == reference else "DIFFERENT"
+        print(f"{name:>6}: {results[name] * 1000:8.1f} ms per page, {results[name] / args.cards * 1e6:6.0f} us per card, "
+              f"{status} cards")
+    fastest = min(results, key=results.get)
+    print(f"{fastest} is {results['soup'] / results[fastest]:.1f}x faster than soup")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
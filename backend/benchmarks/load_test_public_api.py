@@ -0,0 +1,82 @@
+"""
+Concurrent load test against a running backend.
+
+Keeps --concurrency requests in flight for --duration seconds and reports throughput and latency
+percentiles. With --bust-cache every request gets a unique query parameter, so the snapshot cache
+never hits and every request goes to MongoDB. That is the number to compare when changing the data
+access layer (e.g. sync PyMongo vs. Motor: with a blocking driver, throughput stays flat as
+concurrency grows because requests are serialized on the event loop).
+
+Run from the backend folder while the API is running:
+    python benchmarks/load_test_public_api.py --url http://localhost:8000 --concurrency 1 10 50 --bust-cache
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+import httpx
+
+
+async def worker(client: httpx.AsyncClient, path: str, deadline: float, counter, bust_cache: bool,
+                 latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        url = path
+        if bust_cache:
+            url += ("&" if "?" in path else "?") + f"_load_test={next(counter)}"
+        t0 = time.perf_counter()
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - t0)
+        except httpx.HTTPError as e:
+            errors.append(e)
+
+
+async def run_level(base_url: str, path: str, concurrency: int, duration: float, bust_cache: bool) -> dict:
+    latencies: list = []
+    errors: list = []
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            worker(client, path, deadline, counter, bust_cache, latencies, errors) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return float("nan")
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+async def main(args):
+    print(f"{args.url}{args.path} for {args.duration}s per level, bust cache: {args.bust_cache}")
+    print(f"{'concurrency':>11} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        r = await run_level(args.url, args.path, concurrency, args.duration, args.bust_cache)
+        print(f"{concurrency:>11} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/hackathons?limit=100")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--bust-cache", action="store_true", help="Make every request miss the snapshot cache")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,49 @@
+"""
+Records the HTTP traffic of the enabled scrapers into cassettes (see scrapers/http_replay.py), one per registered
+scraper, named after its name in scraper_registry.py. The cassettes let tests and
+tests/backend/test_scraper_benchmarks.py run scrapers offline against real responses.
+
+Run from the backend folder:
+    python benchmarks/record_scraper_fixtures.py
+    python benchmarks/record_scraper_fixtures.py --only mlh --fixtures /tmp/cassettes
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scraper_registry import ScraperEntry, enabled_scrapers  # noqa: E402
+from scrapers.http_replay import Cassette, cassette_path, recording  # noqa: E402
+
+CASSETTES = Path(__file__).parent.parent.parent / "tests" / "backend" / "fixtures" / "cassettes"
+
+
+def record(entry: ScraperEntry, fixtures: Path, transport: Optional[httpx.BaseTransport] = None) -> Cassette:
+    """Runs the scrapers of a registered scraper and records their traffic, from the network unless transport."""
+    scrapers = entry.load()
+    path = cassette_path(fixtures, entry.name)
+    with recording(path, scrapers, transport) as cassette:
+        items = [item for scraper in scrapers for item in scraper.scrape()]
+    print(f"{entry.name}: {len(items)} items, {len(cassette.interactions)} responses -> {path}")
+    return cassette
+
+
+def main(args):
+    entries = enabled_scrapers(enabled=args.only)
+    if not entries:
+        sys.exit("No scraper to record")
+    for entry in entries:
+        record(entry, Path(args.fixtures))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append",
+                        help="Name of a registered scraper to record, repeatable. Default: the enabled scrapers")
+    parser.add_argument("--fixtures", default=str(CASSETTES), help="Folder for the cassettes")
+    main(parser.parse_args())
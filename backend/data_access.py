@@ -0,0 +1,137 @@
+"""
+Async data access for the public API.
+
+Routes go through these functions instead of using collections directly, so every database call
+is awaited on the Motor client and never blocks the event loop.
+"""
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from database import COLLECTION_VERSIONS
+from hackathon_facets import HACKATHON_FACETS
+from hackathon_queries import LISTING_SORT
+from scrape_jobs import SCRAPE_JOBS, failed_job_update, stale_jobs_filter
+from scrape_telemetry import SCRAPE_RUNS
+
+
+async def get_collection_version(db: AsyncIOMotorDatabase, collection_name: str) -> Tuple[int, Optional[datetime]]:
+    """
+    Returns the current (version, updated_at) of a collection.
+    Collections that were never written through a versioned write path are at version 0.
+    """
+    doc = await db[COLLECTION_VERSIONS].find_one({"_id": collection_name})
+    if doc is None:
+        return 0, None
+    return doc.get("version", 0), doc.get("updated_at")
+
+
+async def find_hackathons(
+    db: AsyncIOMotorDatabase,
+    query: Dict[str, Any],
+    limit: int,
+    projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Returns up to limit raw hackathon documents matching query, in listing order."""
+    cursor = db.hackathons.find(query, projection).sort(LISTING_SORT).limit(limit)
+    return await cursor.to_list(length=limit)
+
+
+async def iter_hackathons(
+    db: AsyncIOMotorDatabase,
+    query: Dict[str, Any],
+    batch_size: int,
+    projection: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yields every raw hackathon document matching query, in listing order, fetching batch_size at a time."""
+    cursor = db.hackathons.find(query, projection).sort(LISTING_SORT).batch_size(batch_size)
+    async for doc in cursor:
+        yield doc
+
+
+async def load_all_hackathons(db: AsyncIOMotorDatabase, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Returns every raw hackathon document, for building in-memory indexes."""
+    return await db.hackathons.find({}, projection).to_list(length=None)
+
+
+async def find_hackathons_near(
+    db: AsyncIOMotorDatabase,
+    lat: float,
+    long: float,
+    max_distance_m: float,
+    query: Dict[str, Any],
+    limit: int,
+    projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Returns up to limit raw hackathon documents within max_distance_m of the point, nearest first.
+    The distance in meters is added to every document as distance_m.
+    """
+    pipeline = [
+        {"$geoNear": {
+            "near": {"type": "Point", "coordinates": [long, lat]},
+            "key": "location.geo",
+            "distanceField": "distance_m",
+            "maxDistance": max_distance_m,
+            "query": query,
+            "spherical": True,
+        }},
+        {"$limit": limit},
+    ]
+    if projection is not None:
+        pipeline.append({"$project": {**projection, "distance_m": 1}})
+    return await db.hackathons.aggregate(pipeline).to_list(length=limit)
+
+
+async def aggregate_hackathon_facets(db: AsyncIOMotorDatabase, pipeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Runs a $facet pipeline (see hackathon_facets.build_facets_pipeline) over the facet buckets."""
+    results = await db[HACKATHON_FACETS].aggregate(pipeline).to_list(length=1)
+    return results[0] if results else {}
+
+
+async def insert_email(db: AsyncIOMotorDatabase, data: Dict[str, Any]) -> Any:
+    """Stores a newsletter signup and returns its id."""
+    result = await db.emails.insert_one(data)
+    return result.inserted_id
+
+
+async def insert_hackathon_suggestion(db: AsyncIOMotorDatabase, data: Dict[str, Any]) -> Any:
+    """Stores a hackathon suggested by a visitor and returns its id."""
+    result = await db.hackathon_suggestions.insert_one(data)
+    return result.inserted_id
+
+
+async def find_latest_scrape_job(db: AsyncIOMotorDatabase) -> Optional[Dict[str, Any]]:
+    """The most recently triggered scrape job, None if there never was one."""
+    return await db[SCRAPE_JOBS].find_one({}, sort=[("created_at", -1)])
+
+
+async def insert_scrape_job(db: AsyncIOMotorDatabase, job: Dict[str, Any]) -> Any:
+    """
+    Queues a scrape job and returns its id.
+
+    Raises:
+        DuplicateKeyError: If another job is already queued or running.
+    """
+    result = await db[SCRAPE_JOBS].insert_one(job)
+    return result.inserted_id
+
+
+async def fail_stale_scrape_job(db: AsyncIOMotorDatabase, job_id: Any) -> bool:
+    """
+    Fails the job if it is running on a worker that stopped sending heartbeats, so another job can be queued.
+    False if it isn't (anymore).
+    """
+    result = await db[SCRAPE_JOBS].update_one(
+        {"_id": job_id, **stale_jobs_filter()},
+        failed_job_update("Worker stopped responding, replaced by a new trigger"),
+    )
+    return result.modified_count == 1
+
+
+async def find_scrape_runs(db: AsyncIOMotorDatabase, since: datetime, limit: int = 10000) -> List[Dict[str, Any]]:
+    """The telemetry of the latest limit scrape runs finished since the given time, oldest first."""
+    cursor = db[SCRAPE_RUNS].find({"finished_at": {"$gte": since}}, {"_id": 0, "finished_at": 1, "scrapers": 1})
+    latest = await cursor.sort("finished_at", -1).limit(limit).to_list(length=limit)
+    return latest[::-1]
@@ -1,8 +1,135 @@
-from pymongo import MongoClient
+import logging
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import MongoClient, ASCENDING, DESCENDING, GEOSPHERE
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
 from settings import settings
 
+logger = logging.getLogger(__name__)
+
+# Holds one {_id: <collection name>, version, updated_at} document per versioned collection.
+# Every write to a versioned collection has to bump its version, see bump_collection_version.
+COLLECTION_VERSIONS = "collection_versions"
+
+
+def client_options() -> Dict[str, Any]:
+    """Connection pool and timeout options shared by the sync and the async client."""
+    return {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+    }
+
+
 # Create MongoDB client at module level
-mongo_client = MongoClient(settings.MONGODB_URI)
+# The sync client is for scrapers, scripts and other code that doesn't run on the event loop.
+mongo_client = MongoClient(settings.MONGODB_URI, **client_options())
 
 def get_db():
     return mongo_client[settings.mongodb_database]
+
+
+# The async client is created on first use, so it binds to the event loop of the running app
+_async_client: Optional[AsyncIOMotorClient] = None
+
+def get_async_client() -> AsyncIOMotorClient:
+    """
+    Get or create the async MongoDB client.
+    Uses singleton pattern to avoid creating multiple connection pools.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncIOMotorClient(settings.MONGODB_URI, **client_options())
+    return _async_client
+
+def get_async_db() -> AsyncIOMotorDatabase:
+    """
+    Get the async database instance.
+    For use in FastAPI routes, so database calls don't block the event loop.
+    """
+    return get_async_client()[settings.mongodb_database]
+
+def close_async_connection():
+    """Close the async MongoDB connection. Called when the application shuts down."""
+    global _async_client
+    if _async_client is not None:
+        _async_client.close()
+        _async_client = None
+
+
+def bump_collection_version(db: Database, collection_name: str, session=None) -> None:
+    """Marks a collection as changed. Call this after every write to a versioned collection."""
+    db[COLLECTION_VERSIONS].update_one(
+        {"_id": collection_name},
+        {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+        upsert=True,
+        session=session,
+    )
+
+
+def ensure_indexes(db: Database) -> None:
+    """
+    Creates the indexes the public read endpoints and the inbox processor rely on.
+    create_index is a no-op if the index already exists, so this is safe to call on every startup.
+    """
+    hackathons = db.hackathons
+    # Equality fields first, then the start date range/sort (ESR rule).
+    # Every index ends in _id so the keyset pagination sort can be served from the index.
+    hackathons.create_index([("date.start_date", ASCENDING), ("_id", ASCENDING)], name="start_date_id")
+    hackathons.create_index(
+        [("status", ASCENDING), ("date.start_date", ASCENDING), ("_id", ASCENDING)],
+        name="status_start_date_id",
+    )
+    hackathons.create_index(
+        [("location.country", ASCENDING), ("location.city", ASCENDING), ("date.start_date", ASCENDING), ("_id", ASCENDING)],
+        name="country_city_start_date_id",
+    )
+    hackathons.create_index(
+        [("location.city", ASCENDING), ("date.start_date", ASCENDING), ("_id", ASCENDING)],
+        name="city_start_date_id",
+    )
+    # For /api/hackathons/near, documents without location.geo are simply not in this index
+    hackathons.create_index([("location.geo", GEOSPHERE)], name="location_geo")
+    # Duplicate lookups of the inbox processor, url for documents stored before url_key existed
+    hackathons.create_index([("url_key", ASCENDING)], name="url_key")
+    hackathons.create_index([("url", ASCENDING)], name="url")
+    # Candidate lookups of the fuzzy duplicate detection (multikey)
+    hackathons.create_index([("dedup_blocks", ASCENDING)], name="dedup_blocks")
+    logger.info(f"Ensured indexes on {db.name}.hackathons")
+
+    # inbox_processor upserts on url_key, so a URL can only be in the inbox once. Items without URL aren't indexed.
+    for field in ("url_key", "url"):
+        try:
+            db.inbox.create_index(
+                [(field, ASCENDING)],
+                name=f"{field}_unique",
+                unique=True,
+                partialFilterExpression={field: {"$type": "string"}},
+            )
+        except OperationFailure as e:
+            logger.warning(f"Could not create unique index on {db.name}.inbox.{field}, remove the duplicates first: {e}")
+    db.inbox.create_index([("dedup_blocks", ASCENDING)], name="dedup_blocks")
+    logger.info(f"Ensured indexes on {db.name}.inbox")
+
+    # Only one scrape job can be queued or running at a time, see scrape_jobs.py
+    db.scrape_jobs.create_index(
+        [("active", ASCENDING)], name="active_unique", unique=True, partialFilterExpression={"active": True},
+    )
+    # Claiming the oldest queued job, and the latest job for /scraping/status
+    db.scrape_jobs.create_index([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at")
+    db.scrape_jobs.create_index([("created_at", DESCENDING)], name="created_at")
+    logger.info(f"Ensured indexes on {db.name}.scrape_jobs")
+
+    # Finding the scrapers that are due, see scrape_scheduler.py
+    db.scrape_schedule.create_index([("next_run_at", ASCENDING)], name="next_run_at")
+    logger.info(f"Ensured indexes on {db.name}.scrape_schedule")
+
+    # Runs of a time window for /scraping/stats, see scrape_telemetry.py
+    db.scrape_runs.create_index([("finished_at", ASCENDING)], name="finished_at")
+    logger.info(f"Ensured indexes on {db.name}.scrape_runs")
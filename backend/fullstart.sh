@@ -1 +1 @@
-pip install -e ../shared && python main.py
\ No newline at end of file
+pip install -e ../shared && { python scrape_worker.py & python main.py; }
\ No newline at end of file
@@ -0,0 +1,196 @@
+"""
+Fuzzy duplicate detection for scraped items.
+
+The same event often reaches the inbox under different URLs from different sources, which url_key can't catch.
+Items are compared by name similarity, date proximity and location against records that share a blocking key
+(start week + name MinHash band, see shared_models.dedup), so every item is scored against a handful of
+neighbours instead of the whole inbox and hackathon collections.
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pymongo.database import Database
+
+from shared_models import DuplicateMatch, InboxItem
+from shared_models.dedup import candidate_blocks, name_shingles
+
+logger = logging.getLogger(__name__)
+
+# Matches scoring at least this much are flagged on the inbox item
+FUZZY_MATCH_THRESHOLD = 0.75
+# Same day and place but a different name is a different event
+MIN_NAME_SIMILARITY = 0.5
+SCORE_WEIGHTS = {"name": 0.6, "date": 0.25, "location": 0.15}
+# Start/end dates further apart than this don't count as the same event
+DATE_TOLERANCE_DAYS = 3
+# Blocks per $in query
+LOOKUP_BATCH_SIZE = 1000
+
+_CANDIDATE_PROJECTION = {"name": 1, "date": 1, "location": 1, "url_key": 1, "dedup_blocks": 1}
+_LOCATION_TOKEN_RE = re.compile(r"\w+")
+_LOCATION_SYNONYMS = {"virtual": "online", "remote": "online", "digital": "online"}
+
+
+def _to_date(value: Any) -> Optional[date]:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def location_tokens(*parts: Optional[str]) -> Set[str]:
+    tokens = set()
+    for part in parts:
+        for token in _LOCATION_TOKEN_RE.findall((part or "").casefold()):
+            tokens.add(_LOCATION_SYNONYMS.get(token, token))
+    return tokens
+
+
+@dataclass
+class MatchRecord:
+    """The fields of an inbox item or hackathon that matching looks at."""
+    collection: str
+    id: Any
+    name: Optional[str]
+    start: Optional[date]
+    end: Optional[date]
+    location: Set[str]
+    url_key: Optional[str] = None
+    shingles: Set[str] = field(init=False)
+
+    def __post_init__(self):
+        self.shingles = name_shingles(self.name)
+
+    @classmethod
+    def from_inbox_item(cls, item: InboxItem) -> "MatchRecord":
+        return cls(
+            collection="inbox",
+            id=item.id,
+            name=item.name,
+            start=_to_date(item.date.start_date) if item.date else None,
+            end=_to_date(item.date.end_date) if item.date else None,
+            location=location_tokens(item.location),
+            url_key=item.url_key,
+        )
+
+    @classmethod
+    def from_doc(cls, collection: str, doc: Dict[str, Any]) -> "MatchRecord":
+        dates = doc.get("date") or {}
+        location = doc.get("location")
+        if isinstance(location, dict):  # Hackathons have a structured location, the inbox a plain string
+            tokens = location_tokens(location.get("city"), location.get("state"), location.get("country"))
+        else:
+            tokens = location_tokens(location)
+        return cls(
+            collection=collection,
+            id=doc["_id"],
+            name=doc.get("name"),
+            start=_to_date(dates.get("start_date")),
+            end=_to_date(dates.get("end_date")),
+            location=tokens,
+            url_key=doc.get("url_key"),
+        )
+
+
+def name_similarity(a: MatchRecord, b: MatchRecord) -> float:
+    """Jaccard similarity of the character trigrams of the normalized names."""
+    if not a.shingles or not b.shingles:
+        return 0.0
+    return len(a.shingles & b.shingles) / len(a.shingles | b.shingles)
+
+
+def date_similarity(a: MatchRecord, b: MatchRecord) -> Optional[float]:
+    """1 for the same dates, falling linearly to 0 at DATE_TOLERANCE_DAYS + 1 days apart. None if unknown."""
+    if a.start is None or b.start is None:
+        return None
+    start_diff = abs((a.start - b.start).days)
+    end_diff = abs(((a.end or a.start) - (b.end or b.start)).days)
+    return max(0.0, 1 - (start_diff + end_diff) / (2 * (DATE_TOLERANCE_DAYS + 1)))
+
+
+def location_similarity(a: MatchRecord, b: MatchRecord) -> Optional[float]:
+    """Overlap coefficient of the location words, so "Zurich" fully matches "Zurich, Switzerland". None if unknown."""
+    if not a.location or not b.location:
+        return None
+    return len(a.location & b.location) / min(len(a.location), len(b.location))
+
+
+def match_score(a: MatchRecord, b: MatchRecord) -> float:
+    """
+    Weighted similarity of two records between 0 and 1. Unknown dates or locations don't count
+    against a match, their weight goes to the known components. Known dates further apart than
+    DATE_TOLERANCE_DAYS rule a match out, like a name that is too different.
+    """
+    name = name_similarity(a, b)
+    if name < MIN_NAME_SIMILARITY:
+        return 0.0
+    dates = date_similarity(a, b)
+    if dates == 0.0:
+        return 0.0
+    components = {"name": name, "date": dates, "location": location_similarity(a, b)}
+    known = {key: value for key, value in components.items() if value is not None}
+    total_weight = sum(SCORE_WEIGHTS[key] for key in known)
+    return sum(SCORE_WEIGHTS[key] * value for key, value in known.items()) / total_weight
+
+
+def best_match(record: MatchRecord, candidates: Iterable[MatchRecord]) -> Optional[Tuple[MatchRecord, float]]:
+    """The highest scoring candidate at or above FUZZY_MATCH_THRESHOLD, if any."""
+    best = None
+    for candidate in candidates:
+        if record.url_key is not None and candidate.url_key == record.url_key:
+            continue  # Same URL, that's the exact duplicate check's job
+        score = match_score(record, candidate)
+        if score >= FUZZY_MATCH_THRESHOLD and (best is None or score > best[1]):
+            best = (candidate, score)
+    return best
+
+
+def find_candidates(db: Database, blocks: List[str]) -> Dict[str, List[MatchRecord]]:
+    """Inbox items and hackathons stored under any of the blocks, grouped by block."""
+    by_block: Dict[str, List[MatchRecord]] = {}
+    wanted = set(blocks)
+    for start in range(0, len(blocks), LOOKUP_BATCH_SIZE):
+        batch = blocks[start:start + LOOKUP_BATCH_SIZE]
+        for collection in ("hackathons", "inbox"):
+            for doc in db[collection].find({"dedup_blocks": {"$in": batch}}, _CANDIDATE_PROJECTION):
+                record = MatchRecord.from_doc(collection, doc)
+                for block in doc.get("dedup_blocks") or []:
+                    if block in wanted:
+                        by_block.setdefault(block, []).append(record)
+    return by_block
+
+
+def find_fuzzy_matches(items: List[InboxItem], db: Database) -> Dict[int, DuplicateMatch]:
+    """
+    Finds likely duplicates of scraped items among the stored inbox items and hackathons.
+    Costs two queries per LOOKUP_BATCH_SIZE distinct blocks of the batch.
+
+    Returns:
+        Position of the item in items -> its best match, for the items that have one.
+    """
+    item_blocks = [
+        candidate_blocks(item.name, item.date.start_date if item.date else None)
+        for item in items
+    ]
+    all_blocks = list(dict.fromkeys(block for blocks in item_blocks for block in blocks))
+    if not all_blocks:
+        return {}
+    by_block = find_candidates(db, all_blocks)
+
+    matches: Dict[int, DuplicateMatch] = {}
+    for position, (item, blocks) in enumerate(zip(items, item_blocks)):
+        candidates = {}
+        for block in blocks:
+            for candidate in by_block.get(block, []):
+                candidates[(candidate.collection, candidate.id)] = candidate
+        if not candidates:
+            continue
+        match = best_match(MatchRecord.from_inbox_item(item), candidates.values())
+        if match is not None:
+            candidate, score = match
+            matches[position] = DuplicateMatch(
+                collection=candidate.collection, id=candidate.id, name=candidate.name, score=round(score, 3),
+            )
+            logger.info(f"Possible duplicate: '{item.name}' ({item.url}) looks like {candidate.collection} "
+                        f"'{candidate.name}' ({candidate.id}), score {score:.2f}")
+    return matches
@@ -0,0 +1,116 @@
+"""
+Materialized facet counts for the listing filters.
+
+hackathon_facets holds one bucket per (status, country, city, start day) with the number of hackathons in it.
+Buckets use the same field paths as hackathon documents, so build_hackathon_filter works on them unchanged,
+including the default "upcoming only" window (buckets are per day, the window starts at midnight).
+
+The collection is rebuilt from scratch by rebuild_hackathon_facets and kept up to date on writes by the admin
+app, which increments the bucket of every hackathon it inserts (see admin/database.increment_hackathon_facets).
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING
+from pymongo.database import Database
+
+from hackathon_queries import build_hackathon_filter
+from shared_models import HackathonStatus
+
+logger = logging.getLogger(__name__)
+
+HACKATHON_FACETS = "hackathon_facets"
+
+# Fields that make up a bucket, in the order of its unique index
+BUCKET_FIELDS = ["status", "location.country", "location.city", "date.start_date"]
+
+
+def ensure_facet_indexes(db: Database) -> None:
+    """Unique index on the bucket fields, needed for race-free upserts of incremental updates."""
+    db[HACKATHON_FACETS].create_index([(f, ASCENDING) for f in BUCKET_FIELDS], name="bucket", unique=True)
+
+
+def rebuild_hackathon_facets(db: Database) -> None:
+    """Recomputes every bucket from the hackathons collection and atomically replaces hackathon_facets."""
+    ensure_facet_indexes(db)
+    db.hackathons.aggregate([
+        {"$group": {
+            "_id": {
+                "status": "$status",
+                "country": "$location.country",
+                "city": "$location.city",
+                "day": {"$dateTrunc": {"date": "$date.start_date", "unit": "day"}},
+            },
+            "count": {"$sum": 1},
+        }},
+        {"$project": {
+            "_id": 0,
+            "status": "$_id.status",
+            "location": {"country": "$_id.country", "city": "$_id.city"},
+            "date": {"start_date": "$_id.day"},
+            "count": 1,
+        }},
+        # $out keeps the indexes of the existing collection and swaps it in only when the result is complete
+        {"$out": HACKATHON_FACETS},
+    ])
+    logger.info(f"Rebuilt {db.name}.{HACKATHON_FACETS}")
+
+
+def ensure_hackathon_facets(db: Database) -> None:
+    """Builds hackathon_facets if it doesn't exist yet, e.g. on a fresh database."""
+    if db[HACKATHON_FACETS].estimated_document_count() == 0 and db.hackathons.estimated_document_count() > 0:
+        rebuild_hackathon_facets(db)
+    else:
+        ensure_facet_indexes(db)
+
+
+def build_facets_pipeline(
+    status: Optional[List[HackathonStatus]] = None,
+    country: Optional[List[str]] = None,
+    city: Optional[List[str]] = None,
+    start_from: Optional[date] = None,
+    start_to: Optional[date] = None,
+    include_past: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Builds the aggregation over hackathon_facets that counts hackathons per status, country and city.
+
+    Each facet is scoped by every filter except its own, so the counts show what selecting another value
+    would add (e.g. country counts ignore the selected countries and cities, but respect the statuses).
+    City counts respect the selected countries, as the city list only offers cities of those countries.
+    total is the number of hackathons matching all filters.
+    """
+    def facet(group_id: Any, match: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {"$match": match},
+            {"$group": {"_id": group_id, "count": {"$sum": "$count"}}},
+            {"$sort": {"_id": ASCENDING}},
+        ]
+
+    date_filter = build_hackathon_filter(start_from=start_from, start_to=start_to, include_past=include_past)
+    return [
+        {"$match": date_filter},
+        {"$facet": {
+            "status": facet("$status", build_hackathon_filter(country=country, city=city, include_past=True)),
+            "country": facet("$location.country", build_hackathon_filter(status=status, include_past=True)),
+            "city": facet(
+                {"city": "$location.city", "country": "$location.country"},
+                build_hackathon_filter(status=status, country=country, include_past=True),
+            ),
+            "total": facet(None, build_hackathon_filter(status=status, country=country, city=city, include_past=True)),
+        }},
+    ]
+
+
+def format_facets(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Turns the $facet output into the response of /api/hackathons/facets."""
+    return {
+        "status": [{"value": b["_id"], "count": b["count"]} for b in result.get("status", [])],
+        "country": [{"value": b["_id"], "count": b["count"]} for b in result.get("country", [])],
+        "city": [
+            {"value": b["_id"]["city"], "country": b["_id"]["country"], "count": b["count"]}
+            for b in result.get("city", [])
+        ],
+        "total": result["total"][0]["count"] if result.get("total") else 0,
+    }
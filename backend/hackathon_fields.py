@@ -0,0 +1,82 @@
+"""
+Sparse fieldsets for the hackathon read endpoints (?fields=name,date,location,status).
+
+A selection turns into a MongoDB projection, so unselected fields never leave the database, and into a
+reduced version of the Hackathon model that only validates and serializes the selected fields.
+"""
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Type
+
+from pydantic import create_model, model_serializer
+
+from shared_models import Hackathon
+
+# Public name (as in the JSON response) -> model field name. The id is always returned.
+SELECTABLE_FIELDS: Dict[str, str] = {
+    (info.alias or name): name for name, info in Hackathon.model_fields.items() if name != "id"
+}
+# Needed to build next_cursor, projected even when not selected and dropped before validation
+_CURSOR_PROJECTION = {"_id": 1, "date.start_date": 1}
+
+
+def parse_fields(raw: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Parses a comma separated fields parameter. None means all fields.
+    Raises ValueError for unknown field names.
+    """
+    if raw is None or not raw.strip():
+        return None
+    fields = frozenset(f.strip() for f in raw.split(",") if f.strip())
+    unknown = fields - SELECTABLE_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. "
+                         f"Available fields: {', '.join(SELECTABLE_FIELDS)}")
+    return fields
+
+
+def mongo_projection(fields: Optional[FrozenSet[str]]) -> Optional[Dict[str, int]]:
+    """Projection for find()/$project, None if all fields are selected."""
+    if fields is None:
+        return None
+    projection = {field: 1 for field in fields}
+    for path, include in _CURSOR_PROJECTION.items():
+        if path.split(".")[0] not in projection:
+            projection[path] = include
+    return projection
+
+
+@lru_cache(maxsize=128)
+def hackathon_model(fields: Optional[FrozenSet[str]]) -> Type[Hackathon]:
+    """
+    Hackathon model for a field selection: unselected fields are optional and left out when serializing.
+    Validators and serializers of the selected fields are the ones of Hackathon, so the output is identical.
+    """
+    if fields is None:
+        return Hackathon
+
+    keep = set(fields) | {"_id", "id"}  # Serialized by alias or by name, depending on by_alias
+
+    @model_serializer(mode="wrap")
+    def only_selected_fields(self, handler):
+        return {key: value for key, value in handler(self).items() if key in keep}
+
+    overrides: Dict[str, Any] = {
+        name: (Optional[info.annotation], None)
+        for public_name, name in SELECTABLE_FIELDS.items()
+        if public_name not in fields
+        for info in [Hackathon.model_fields[name]]
+    }
+    return create_model(
+        "Hackathon[" + ",".join(sorted(fields)) + "]",
+        __base__=Hackathon,
+        __validators__={"only_selected_fields": only_selected_fields},
+        **overrides,
+    )
+
+
+def safe_from_mongo(doc: Dict[str, Any], fields: Optional[FrozenSet[str]]) -> Optional[Hackathon]:
+    """Validates a (projected) hackathon document against the model of the selection, None if invalid."""
+    if fields is not None:
+        # Drop what was only projected for the cursor
+        doc = {key: value for key, value in doc.items() if key == "_id" or key in fields}
+    return hackathon_model(fields).safe_from_mongo(doc)
@@ -0,0 +1,125 @@
+import base64
+import json
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING
+
+from shared_models import HackathonStatus
+
+# Order of the public listing. _id breaks ties between hackathons starting at the same time,
+# which makes the order total and lets us paginate with a keyset cursor instead of skip().
+LISTING_SORT = [("date.start_date", ASCENDING), ("_id", ASCENDING)]
+
+
+def start_of_day(day: date) -> datetime:
+    """Returns midnight UTC of the given day, which is how dates are compared in MongoDB."""
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def build_hackathon_filter(
+    status: Optional[List[HackathonStatus]] = None,
+    country: Optional[List[str]] = None,
+    city: Optional[List[str]] = None,
+    start_from: Optional[date] = None,
+    start_to: Optional[date] = None,
+    include_past: bool = False,
+    name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Builds the MongoDB filter for the public hackathon listing.
+
+    Equality filters (status, country, city) come first and the start date range last, so the
+    compound indexes created in database.ensure_indexes can serve every combination.
+
+    Args:
+        status: Only return hackathons with one of these statuses.
+        country: Only return hackathons in one of these countries.
+        city: Only return hackathons in one of these cities.
+        start_from: Earliest start date (inclusive). Defaults to today unless include_past is set.
+        start_to: Latest start date (inclusive).
+        include_past: Don't apply the default "upcoming only" window.
+        name: Case-insensitive substring the hackathon name has to contain.
+
+    Returns:
+        A filter document that can be passed to collection.find().
+    """
+    query: Dict[str, Any] = {}
+
+    if status:
+        query["status"] = {"$in": [s.value for s in status]}
+    if country:
+        query["location.country"] = {"$in": country}
+    if city:
+        query["location.city"] = {"$in": city}
+
+    if start_from is None and not include_past:
+        start_from = datetime.now(timezone.utc).date()  # Same "upcoming" definition the frontend uses
+
+    date_range: Dict[str, datetime] = {}
+    if start_from is not None:
+        date_range["$gte"] = start_of_day(start_from)
+    if start_to is not None:
+        # Inclusive end: everything before the start of the following day
+        date_range["$lt"] = start_of_day(start_to + timedelta(days=1))
+    if date_range:
+        query["date.start_date"] = date_range
+
+    if name:
+        query["name"] = {"$regex": re.escape(name.strip()), "$options": "i"}
+
+    return query
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Encodes the sort key of the last document of a page into an opaque cursor string."""
+    start_date = (doc.get("date") or {}).get("start_date")
+    payload = {
+        "d": start_date.isoformat() if start_date is not None else None,
+        "id": str(doc["_id"]),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    """
+    Decodes a cursor created by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        start_date = datetime.fromisoformat(payload["d"]) if payload["d"] is not None else None
+        return start_date, ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def apply_cursor(query: Dict[str, Any], cursor: str) -> Dict[str, Any]:
+    """
+    Restricts a listing query to documents that come after the cursor in LISTING_SORT order.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    start_date, last_id = decode_cursor(cursor)
+    if start_date is None:
+        # Documents without a start date sort first, so everything with a date comes after them
+        after_cursor = {"$or": [
+            {"date.start_date": {"$ne": None}},
+            {"date.start_date": None, "_id": {"$gt": last_id}},
+        ]}
+    else:
+        after_cursor = {"$or": [
+            {"date.start_date": {"$gt": start_date}},
+            {"date.start_date": start_date, "_id": {"$gt": last_id}},
+        ]}
+    if not query:
+        return after_cursor
+    return {"$and": [query, after_cursor]}
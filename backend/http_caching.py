@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request
+
+from settings import settings
+
+
+def make_etag(*parts) -> str:
+    """Builds a weak ETag from the parts that determine a response body."""
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def listing_last_modified(updated_at: Optional[datetime]) -> datetime:
+    """
+    Last-Modified of a listing that defaults to "upcoming only".
+    That window moves at midnight even without writes, so it is never older than the start of today.
+    """
+    start_of_today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if updated_at is None:
+        return start_of_today
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)  # MongoDB returns naive UTC datetimes
+    return max(updated_at.replace(microsecond=0), start_of_today)
+
+
+def cache_headers(etag: str, last_modified: datetime) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE}, must-revalidate",
+    }
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    Evaluates If-None-Match / If-Modified-Since of a GET request (RFC 9110, section 13.2.2).
+    If-Modified-Since is only looked at when the client didn't send If-None-Match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" and "x" match
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False  # Invalid dates have to be ignored
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+
+    return False
+
@@ -1,19 +1,62 @@
 import logging
-from typing import List
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from pymongo import InsertOne, UpdateOne
 from pymongo.database import Database
-from pymongo.errors import DuplicateKeyError # Good to handle just in case
+from pymongo.errors import BulkWriteError
 
 # Adjust import paths as needed
 from database import get_db
-from shared_models.models import InboxItem, InboxStatus
+from fuzzy_dedup import find_fuzzy_matches
+from shared_models import InboxItem, InboxStatus, ContentChange, canonicalize_url
+from shared_models.dedup import dedup_blocks
+from shared_models.models import INBOX_CONTENT_FIELDS
 
 # Get logger instance (child logger of the one in run_scrapers if run via that)
 logger = logging.getLogger(__name__)
 
+# Items per $in query. Keeps each query well below the 16 MB command limit.
+LOOKUP_BATCH_SIZE = 1000
+DUPLICATE_KEY_ERROR = 11000
+# Entries kept in an inbox item's change_log, older ones are dropped
+CHANGE_LOG_SIZE = 10
+
+
+@dataclass
+class ProcessingStats:
+    """What process_scraped_items did with a batch of scraped items."""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged + self.skipped
+
+    def __add__(self, other: "ProcessingStats") -> "ProcessingStats":
+        return ProcessingStats(
+            inserted=self.inserted + other.inserted,
+            updated=self.updated + other.updated,
+            unchanged=self.unchanged + other.unchanged,
+            skipped=self.skipped + other.skipped,
+        )
+
+
+def url_filter(url_keys: List[str], urls: List[str]) -> Dict[str, Any]:
+    """
+    Matches documents by url_key, or by their raw url if they were stored before url_key existed
+    (see migrations/backfill_url_keys.py).
+    """
+    return {"$or": [{"url_key": {"$in": url_keys}}, {"url": {"$in": urls}}]}
+
+
 def is_duplicate(item: InboxItem, db: Database) -> bool:
     """
     Checks if an item with the same URL already exists in the inbox or main hackathon collection.
+    URLs are compared by their canonical form, so "http://www.example.com/x/" and "https://example.com/x" match.
 
     Args:
         item: The InboxItem to check.
@@ -27,17 +70,18 @@ def is_duplicate(item: InboxItem, db: Database) -> bool:
         return False
 
     query_url = str(item.url)
+    query = url_filter([canonicalize_url(query_url)], [query_url])
 
     # Check 1: Exists in inbox collection (regardless of status)
     inbox_collection = db['inbox']
-    existing_inbox = inbox_collection.find_one({"url": query_url})
+    existing_inbox = inbox_collection.find_one(query)
     if existing_inbox:
         logger.debug(f"Duplicate found in inbox: URL='{query_url}', Name='{item.name}', Existing ID='{existing_inbox.get('_id')}'")
         return True
 
     # Check 2: Exists in the main hackathons collection
     hackathons_collection = db['hackathons']
-    existing_hackathon = hackathons_collection.find_one({"url": query_url})
+    existing_hackathon = hackathons_collection.find_one(query)
     if existing_hackathon:
         logger.debug(f"Duplicate found in main collection: URL='{query_url}', Name='{item.name}', Existing ID='{existing_hackathon.get('_id')}'")
         return True
@@ -46,56 +90,234 @@ def is_duplicate(item: InboxItem, db: Database) -> bool:
     return False
 
 
-def process_scraped_items(items: List[InboxItem]):
+def find_inbox_items(items: List[InboxItem], db: Database) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the stored inbox documents of the items' URLs by url_key, with the fields needed to detect changes.
+    Costs one query per LOOKUP_BATCH_SIZE items.
+    """
+    with_url = [item for item in items if item.url]
+    projection = {"url_key": 1, "content_hash": 1, "review_status": 1, **{field: 1 for field in INBOX_CONTENT_FIELDS}}
+    stored: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(with_url), LOOKUP_BATCH_SIZE):
+        batch = with_url[start:start + LOOKUP_BATCH_SIZE]
+        query = url_filter([item.url_key for item in batch], [str(item.url) for item in batch])
+        for doc in db['inbox'].find(query, projection):
+            stored[doc.get("url_key") or canonicalize_url(str(doc.get("url")))] = doc
+    return stored
+
+
+def find_known_hackathon_keys(items: List[InboxItem], db: Database) -> Set[str]:
+    """
+    Returns the url_keys of the items that are already in the main hackathon collection.
+    Costs one query per LOOKUP_BATCH_SIZE items.
+    """
+    with_url = [item for item in items if item.url]
+    known: Set[str] = set()
+    for start in range(0, len(with_url), LOOKUP_BATCH_SIZE):
+        batch = with_url[start:start + LOOKUP_BATCH_SIZE]
+        query = url_filter([item.url_key for item in batch], [str(item.url) for item in batch])
+        for doc in db['hackathons'].find(query, {"url_key": 1, "url": 1, "_id": 0}):
+            known.add(doc.get("url_key") or canonicalize_url(str(doc.get("url"))))
+    return known
+
+
+def content_update(item: InboxItem, stored: Dict[str, Any]) -> Optional[UpdateOne]:
+    """
+    Update of a stored inbox item to the content of its re-scrape, None if nothing changed.
+    Only the changed fields are written, together with an entry in the item's change_log. An item that was already
+    approved or rejected gets needs_review, so a reviewer checks the change against the published hackathon.
+    """
+    if stored.get("content_hash") == item.content_hash:
+        return None
+
+    try:
+        old_content = InboxItem.model_validate(stored).content()
+    except Exception as e:
+        logger.warning(f"Stored inbox item {stored.get('_id')} is not a valid InboxItem, treating all fields as changed: {e}")
+        old_content = {}
+    new_content = item.content()
+    changed = [field for field in INBOX_CONTENT_FIELDS if old_content.get(field) != new_content[field]]
+
+    updates: Dict[str, Any] = {"content_hash": item.content_hash}
+    if not stored.get("url_key"):
+        updates["url_key"] = item.url_key  # Stored before url_key existed
+    if not changed:
+        # Stored before content hashes existed, only the hash is missing
+        return UpdateOne({"_id": stored["_id"]}, {"$set": updates})
+
+    change = ContentChange(
+        scraper_name=item.scraper_name,
+        changes={field: {"old": old_content.get(field), "new": new_content[field]} for field in changed},
+    )
+    logger.info(f"Content changed: URL='{item.url}', Name='{item.name}', Fields={changed}")
+    updates.update(item.model_dump(mode='python', include=set(changed)))
+    updates["content_updated_at"] = change.at
+    if stored.get("review_status", InboxStatus.PENDING.value) != InboxStatus.PENDING.value:
+        logger.warning(f"Reviewed inbox item changed, flagging it for review: URL='{item.url}', Fields={changed}")
+        updates["needs_review"] = True
+    if "name" in changed or "date" in changed:
+        updates["dedup_blocks"] = dedup_blocks(item.name, item.date.start_date if item.date else None)
+    return UpdateOne(
+        {"_id": stored["_id"]},
+        {
+            "$set": updates,
+            "$push": {"change_log": {"$each": [change.model_dump()], "$slice": -CHANGE_LOG_SIZE}},
+        },
+    )
+
+
+def process_scraped_items(items: List[InboxItem], seen_keys: Optional[Set[str]] = None,
+                          by_scraper: Optional[Dict[Optional[str], Counter]] = None) -> ProcessingStats:
     """
     Processes a list of scraped InboxItems, checks for duplicates,
-    and inserts new items into the 'inbox' database collection.
+    inserts new items into the 'inbox' database collection and updates the ones that changed.
+
+    Items whose URL is already in the inbox are compared by content hash: unchanged ones cost no write at all,
+    changed ones get only their changed fields set (see content_update). New items are written as upserts on
+    their url_key with $setOnInsert, so the unique index on inbox.url_key (see database.ensure_indexes) keeps
+    concurrent runs from inserting the same URL twice. Everything is sent in one unordered bulk write.
+    New items that look like a known event under another URL get possible_duplicate set (see fuzzy_dedup.py).
+
+    Args:
+        items: The scraped items.
+        seen_keys: url_keys already processed in this run. When a run is processed in several batches
+            (see run_scrapers.run_all_scrapes), passing the same set to every call keeps the first item of a URL
+            instead of updating it with every later one. Updated in place.
+        by_scraper: Outcome counts per scraper_name of the items (inserted, updated, unchanged, duplicates,
+            errors), for the run telemetry (see scrape_telemetry.py). Updated in place.
+
+    Returns:
+        The counts of inserted, updated, unchanged and skipped items.
     """
     if not items:
         logger.info("No items to process.")
-        return
+        return ProcessingStats()
 
     logger.info(f"Starting processing of {len(items)} scraped items...")
     db = get_db()
     inbox_collection = db['inbox']
 
-    inserted_count = 0
-    skipped_count = 0
+    for item in items:
+        if item.url and item.url_key is None:
+            item.url_key = canonicalize_url(str(item.url))
+        item.content_hash = item.compute_content_hash()
+    stored_items = find_inbox_items(items, db)
+    # Only URLs that aren't in the inbox have to be looked up in the main collection
+    known_keys = find_known_hackathon_keys([item for item in items if item.url_key not in stored_items], db)
+
+    def count(item: InboxItem, outcome: str) -> None:
+        if by_scraper is not None:
+            by_scraper.setdefault(item.scraper_name, Counter())[outcome] += 1
 
+    skipped_count = 0
+    unchanged_count = 0
+    if seen_keys is None:
+        seen_keys = set()
+    new_items: List[InboxItem] = []
+    operations = []
+    # Item and kind (update, upsert or insert) of every operation
+    written: List[Tuple[InboxItem, str]] = []
     for item in items:
         try:
-            # Ensure status is PENDING before check/insert
-            item.review_status = InboxStatus.PENDING
-
-            if is_duplicate(item, db):
+            if not item.url:
+                logger.warning(f"InboxItem '{item.name}' has no URL, cannot check for duplicates based on URL.")
+                new_items.append(item)
+                continue
+            if item.url_key in seen_keys:
+                # The same URL scraped twice in this run, the first one wins
                 logger.info(f"Skipping duplicate item: URL='{item.url}', Name='{item.name}'")
                 skipped_count += 1
+                count(item, "duplicates")
                 continue
+            seen_keys.add(item.url_key)
 
-            # Item is new, prepare for insertion
-            # Convert Pydantic model to dict for MongoDB insertion
-            # Use exclude_unset=True? Or default values are fine? Let's keep defaults for now.
-            # Use by_alias=True if your model uses aliases like '_id'
-            item_dict = item.model_dump(mode='python', by_alias=True)
+            if item.url_key in stored_items:
+                update = content_update(item, stored_items[item.url_key])
+                if update is None:
+                    unchanged_count += 1
+                    count(item, "unchanged")
+                else:
+                    operations.append(update)
+                    written.append((item, "update"))
+            elif item.url_key in known_keys:
+                logger.info(f"Skipping duplicate item: URL='{item.url}', Name='{item.name}'")
+                skipped_count += 1
+                count(item, "duplicates")
+            else:
+                new_items.append(item)
+
+        except Exception as e:
+            item_name = getattr(item, 'name', 'UNKNOWN')
+            logger.error(f"Failed to process item: Name='{item_name}', URL='{getattr(item, 'url', 'N/A')}' - Error: {e}", exc_info=True)
+            skipped_count += 1
+            count(item, "errors")
+    update_count = len(operations)
+
+    # The same event under another URL (e.g. from another source) is still inserted, but flagged for the reviewer
+    try:
+        fuzzy_matches = find_fuzzy_matches(new_items, db)
+    except Exception as e:
+        logger.error(f"Fuzzy duplicate detection failed, inserting without it: {e}", exc_info=True)
+        fuzzy_matches = {}
 
+    for position, item in enumerate(new_items):
+        try:
+            # Ensure status is PENDING before insert
+            item.review_status = InboxStatus.PENDING
+            item.possible_duplicate = fuzzy_matches.get(position)
+
+            item_dict = item.model_dump(mode='python', by_alias=True)
             # Remove '_id' if it's None, MongoDB will generate one
             if '_id' in item_dict and item_dict['_id'] is None:
                 del item_dict['_id']
 
-            logger.debug(f"Attempting to insert new item: {item_dict.get('name')}")
-            insert_result = inbox_collection.insert_one(item_dict)
-            logger.info(f"Successfully inserted new item: Name='{item.name}', DB_ID='{insert_result.inserted_id}'")
-            inserted_count += 1
+            if item.url:
+                operations.append(UpdateOne({"url_key": item.url_key}, {"$setOnInsert": item_dict}, upsert=True))
+                written.append((item, "upsert"))
+            else:
+                operations.append(InsertOne(item_dict))
+                written.append((item, "insert"))
 
-        except DuplicateKeyError:
-             # This might happen in rare race conditions or if duplicate check logic is imperfect
-             logger.warning(f"DuplicateKeyError on inserting item (likely race condition or check mismatch): URL='{item.url}', Name='{item.name}'")
-             skipped_count += 1
         except Exception as e:
             item_name = getattr(item, 'name', 'UNKNOWN')
             logger.error(f"Failed to process item: Name='{item_name}', URL='{getattr(item, 'url', 'N/A')}' - Error: {e}", exc_info=True)
-            # Decide if you want to count this as skipped or handle differently
             skipped_count += 1
+            count(item, "errors")
 
+    inserted_count = 0
+    updated_count = 0
+    if operations:
+        try:
+            # Unordered, so one failing operation doesn't stop the rest of the batch
+            result = inbox_collection.bulk_write(operations, ordered=False)
+            inserted_count = result.upserted_count + result.inserted_count
+            updated_count = result.modified_count
+            upserted, write_errors = set(result.upserted_ids), {}
+        except BulkWriteError as e:
+            inserted_count = e.details.get("nUpserted", 0) + e.details.get("nInserted", 0)
+            updated_count = e.details.get("nModified", 0)
+            upserted = {entry["index"] for entry in e.details.get("upserted", [])}
+            write_errors = {error["index"]: error.get("code") for error in e.details.get("writeErrors", [])}
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") == DUPLICATE_KEY_ERROR:
+                    # A concurrent run inserted the same URL between our upsert's match and insert
+                    logger.warning(f"DuplicateKeyError on upserting item (likely race condition): {error.get('errmsg')}")
+                else:
+                    logger.error(f"Failed to write item: {error.get('errmsg')}")
+        # Upserts that matched a document inserted since our lookup, and failed writes
+        skipped_count += len(operations) - inserted_count - min(updated_count, update_count)
+        for index, (item, kind) in enumerate(written):
+            if index in write_errors:
+                count(item, "duplicates" if write_errors[index] == DUPLICATE_KEY_ERROR else "errors")
+            elif kind == "update":
+                count(item, "updated")
+            elif kind == "insert" or index in upserted:
+                count(item, "inserted")
+            else:
+                count(item, "duplicates")
 
-    logger.info(f"Finished processing items. Inserted: {inserted_count}, Skipped (Duplicates/Errors): {skipped_count}")
+    logger.info(f"Finished processing items. Inserted: {inserted_count}, Updated: {updated_count}, "
+                f"Unchanged: {unchanged_count}, Skipped (Duplicates/Errors): {skipped_count}")
+    return ProcessingStats(
+        inserted=inserted_count, updated=updated_count, unchanged=unchanged_count, skipped=skipped_count,
+    )
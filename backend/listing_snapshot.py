@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+import orjson
+from pydantic import BaseModel
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Serializes a response body with orjson.
+    Pydantic models are dumped the same way FastAPI does it (JSON mode, by alias), so the output matches
+    what returning the models from a route would produce.
+    """
+    return orjson.dumps(content, default=_dump_model)
+
+
+def _dump_model(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ListingSnapshotCache:
+    """
+    Keeps pre-serialized JSON bodies of the public listing, keyed by collection version and query.
+
+    The bytes are built once per (version, query) and served as-is afterwards, so cache hits skip the
+    database, Pydantic validation and serialization entirely. Entries of older versions are dropped as
+    soon as a newer version is stored, the rest is evicted least recently used once max_bytes is exceeded.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._version: Optional[Hashable] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, version: Hashable, key: Hashable) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            if version != self._version:
+                return None
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, version: Hashable, key: Hashable, body: bytes) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                # Data changed, every stored body is outdated
+                self._entries.clear()
+                self._size = 0
+                self._version = version
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+def query_key(params: Iterable[tuple]) -> tuple:
+    """Order-independent cache key for a request's query parameters."""
+    return tuple(sorted(params))
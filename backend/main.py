@@ -1,4 +1,5 @@
-from database import get_db
+from database import mongo_client, get_db, ensure_indexes, close_async_connection
+from hackathon_facets import ensure_hackathon_facets
 from fastapi import FastAPI, Security, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import APIKeyHeader
@@ -11,6 +12,9 @@ from limiter import limiter
 from settings import settings
 import logging
 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
 app = FastAPI()
 
 # Set up rate limiter
@@ -30,6 +34,28 @@ app.add_middleware(
 app.include_router(public_router, prefix="/api")
 app.include_router(scraping_router, prefix="/scraping")
 
+@app.on_event("startup")
+def create_indexes():
+    # Both environments, /set-environment can switch to the other one at any time
+    for database_name in settings.environment_databases:
+        db = mongo_client[database_name]
+        try:
+            ensure_indexes(db)
+        except Exception as e:
+            # Don't keep the API from starting, queries still work without indexes (just slower)
+            logger.error(f"Could not ensure MongoDB indexes on {database_name}: {e}", exc_info=True)
+        try:
+            ensure_hackathon_facets(db)
+        except Exception as e:
+            # /api/hackathons/facets returns empty counts until the facets are built
+            logger.error(f"Could not build hackathon facets on {database_name}: {e}", exc_info=True)
+
+
+@app.on_event("shutdown")
+def shutdown_db_clients():
+    close_async_connection()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
@@ -42,9 +68,6 @@ Remove this once migrated to automated scraping from deployed backend
 """
 api_key_scheme = APIKeyHeader(name="X-API-Key")
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
 def get_api_key(api_key: str = Security(api_key_scheme)):
     if api_key != settings.ADMIN_API_KEY:
         raise HTTPException(status_code=403, detail="Invalid API key")
@@ -0,0 +1,48 @@
+"""
+Backfills dedup_blocks (blocking keys of the fuzzy duplicate detection, see shared_models.dedup) on inbox items
+and hackathons stored before they were written on insert.
+
+Safe to run more than once, documents that already have dedup_blocks are skipped.
+
+Run from the backend folder:
+    python -m migrations.backfill_dedup_blocks
+"""
+import logging
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from database import get_db, ensure_indexes
+from shared_models.dedup import dedup_blocks
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def backfill_dedup_blocks(db: Database, collection_name: str) -> int:
+    """Sets dedup_blocks on every document of the collection that doesn't have them. Returns the number updated."""
+    collection = db[collection_name]
+    cursor = collection.find({"dedup_blocks": {"$exists": False}}, {"name": 1, "date.start_date": 1})
+
+    updated = 0
+    operations = []
+    for doc in cursor:
+        start_date = (doc.get("date") or {}).get("start_date")
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"dedup_blocks": dedup_blocks(doc.get("name"), start_date)}}))
+        if len(operations) >= BATCH_SIZE:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return updated
+
+
+if __name__ == "__main__":
+    database = get_db()
+    ensure_indexes(database)
+    for name in ("inbox", "hackathons"):
+        logger.info(f"Backfilling dedup_blocks in {database.name}.{name}...")
+        count = backfill_dedup_blocks(database, name)
+        logger.info(f"Done. Updated {count} documents in {name}.")
@@ -0,0 +1,62 @@
+"""
+Backfills location.geo (GeoJSON point for the 2dsphere index) from location.coordinates
+on hackathons that were stored before Hackathon.to_mongo started writing it.
+
+Safe to run more than once, documents that already have location.geo are skipped.
+
+Run from the backend folder:
+    python -m migrations.backfill_geo_points
+"""
+import logging
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from database import get_db, bump_collection_version, ensure_indexes
+from shared_models import Coordinates
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def backfill_geo_points(db: Database) -> int:
+    """Adds location.geo to every hackathon that has coordinates but no GeoJSON point. Returns the number updated."""
+    collection = db.hackathons
+    cursor = collection.find(
+        {"location.coordinates": {"$exists": True}, "location.geo": {"$exists": False}},
+        {"location.coordinates": 1},
+    )
+
+    updated = 0
+    operations = []
+    for doc in cursor:
+        try:
+            coordinates = Coordinates.model_validate(doc["location"]["coordinates"])
+        except Exception as e:
+            logger.warning(f"Skipping hackathon {doc['_id']}, invalid coordinates: {e}")
+            continue
+        if not (-90 <= coordinates.lat <= 90 and -180 <= coordinates.long <= 180):
+            # The 2dsphere index rejects points outside of these bounds
+            logger.warning(f"Skipping hackathon {doc['_id']}, coordinates out of range: {coordinates}")
+            continue
+
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"location.geo": coordinates.to_geojson()}}))
+        if len(operations) >= BATCH_SIZE:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+
+    if updated:
+        bump_collection_version(db, "hackathons")
+    return updated
+
+
+if __name__ == "__main__":
+    database = get_db()
+    logger.info(f"Backfilling location.geo in {database.name}.hackathons...")
+    count = backfill_geo_points(database)
+    ensure_indexes(database)
+    logger.info(f"Done. Updated {count} hackathons.")
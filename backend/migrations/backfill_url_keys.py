@@ -0,0 +1,59 @@
+"""
+Backfills url_key (see shared_models.canonicalize_url) on inbox items and hackathons stored before
+it was written on insert.
+
+Safe to run more than once, documents that already have url_key are skipped. Inbox items whose key is
+already taken by another inbox item are duplicates of it and are reported but left without a key.
+
+Run from the backend folder:
+    python -m migrations.backfill_url_keys
+"""
+import logging
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+from database import get_db, ensure_indexes
+from shared_models import canonicalize_url
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def _write(collection, operations) -> int:
+    try:
+        return collection.bulk_write(operations, ordered=False).modified_count
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            logger.warning(f"Could not set url_key in {collection.name}: {error.get('errmsg')}")
+        return e.details.get("nModified", 0)
+
+
+def backfill_url_keys(db: Database, collection_name: str) -> int:
+    """Sets url_key on every document of the collection that has a url but no url_key. Returns the number updated."""
+    collection = db[collection_name]
+    cursor = collection.find({"url": {"$type": "string"}, "url_key": {"$exists": False}}, {"url": 1})
+
+    updated = 0
+    operations = []
+    for doc in cursor:
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"url_key": canonicalize_url(doc["url"])}}))
+        if len(operations) >= BATCH_SIZE:
+            updated += _write(collection, operations)
+            operations = []
+    if operations:
+        updated += _write(collection, operations)
+    return updated
+
+
+if __name__ == "__main__":
+    database = get_db()
+    # The unique index on inbox.url_key makes sure the backfill can't introduce duplicate keys
+    ensure_indexes(database)
+    for name in ("inbox", "hackathons"):
+        logger.info(f"Backfilling url_key in {database.name}.{name}...")
+        count = backfill_url_keys(database, name)
+        logger.info(f"Done. Updated {count} documents in {name}.")
@@ -0,0 +1,25 @@
+"""
+Recomputes the hackathon_facets buckets from the hackathons collection.
+
+The admin app keeps the buckets up to date on every insert and the backend builds them on startup
+if they are missing. Run this after changing hackathons outside of the admin app (e.g. edits in Atlas).
+
+Run from the backend folder:
+    python -m migrations.rebuild_hackathon_facets
+"""
+import logging
+
+from database import get_db, bump_collection_version
+from hackathon_facets import rebuild_hackathon_facets
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    database = get_db()
+    logger.info(f"Rebuilding facets of {database.name}.hackathons...")
+    rebuild_hackathon_facets(database)
+    # Cached facet responses are keyed by the hackathons version
+    bump_collection_version(database, "hackathons")
+    logger.info("Done.")
@@ -1,49 +1,279 @@
 # backend/public_routes.py
-from fastapi import APIRouter, Depends, Request, HTTPException
-from datetime import datetime
-from database import get_db
+from fastapi import APIRouter, Depends, Request, Response, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime, date, timezone
+from typing import Any, AsyncIterable, AsyncIterator, Dict, FrozenSet, List, Optional
+from data_access import (
+    get_collection_version, find_hackathons, find_hackathons_near, iter_hackathons, load_all_hackathons,
+    aggregate_hackathon_facets, insert_email, insert_hackathon_suggestion,
+)
+from database import get_async_db
+from hackathon_fields import parse_fields, mongo_projection, safe_from_mongo
+from hackathon_facets import build_facets_pipeline, format_facets
+from hackathon_queries import build_hackathon_filter, apply_cursor, encode_cursor, start_of_day
+from http_caching import make_etag, listing_last_modified, cache_headers, is_not_modified
 from limiter import limiter
-from shared_models import Hackathon, EmailSubmission, HackathonSubmission
+from listing_snapshot import ListingSnapshotCache, render_json, query_key
+from search_index import HackathonSearchIndex
+from settings import settings
+from shared_models import EmailSubmission, HackathonSubmission, HackathonStatus
 
 # Create the router
 public_router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_SEARCH_RESULTS = 50
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+# Pre-serialized listing pages, see listing_snapshot.py
+listing_cache = ListingSnapshotCache(max_bytes=settings.LISTING_SNAPSHOT_MAX_BYTES)
+# Typeahead search, rebuilt when the hackathons version changes
+search_index = HackathonSearchIndex()
+
+
+class CacheValidators:
+    """ETag/Last-Modified of a hackathon read and access to its pre-serialized body."""
+
+    def __init__(self, request: Request, etag: str, version: tuple, last_modified: datetime):
+        self.etag = etag
+        self.version = version  # (database name, collection version)
+        self.headers = cache_headers(etag, last_modified)
+        self.headers["Vary"] = "Accept"  # The representation depends on the Accept header
+        self.not_modified = is_not_modified(request, etag, last_modified)
+        # Bodies only depend on the version (part of the ETag), the path and the query
+        self._cache_key = (request.url.path, query_key(request.query_params.multi_items()))
+
+    def cached_body(self) -> Optional[bytes]:
+        return listing_cache.get(self.etag, self._cache_key)
+
+    def store_body(self, body: bytes) -> None:
+        listing_cache.put(self.etag, self._cache_key, body)
+
+
+def parse_field_selection(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """Parses the fields parameter of a read endpoint, see hackathon_fields.py."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def get_cache_validators(request: Request, db, representation: str) -> CacheValidators:
+    """
+    The body of every hackathon read only changes when the collection is written to (or the "upcoming" window
+    moves at midnight), so the collection version is enough to revalidate a response without running the query.
+    """
+    version, updated_at = await get_collection_version(db, "hackathons")
+    etag = make_etag(db.name, version, datetime.now(timezone.utc).date().isoformat(), representation)
+    return CacheValidators(request, etag, (db.name, version), listing_last_modified(updated_at))
+
+
+async def stream_ndjson(
+    docs: AsyncIterable[Dict[str, Any]],
+    batch_size: int = STREAM_BATCH_SIZE,
+    fields: Optional[FrozenSet[str]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Serializes hackathon documents to newline-delimited JSON while they are read from the cursor.
+    Lines are flushed once per batch, so memory only ever holds a single batch.
+    """
+    buffer = bytearray()
+    count = 0
+    async for doc in docs:
+        hackathon = safe_from_mongo(doc, fields)
+        if hackathon is None:
+            continue
+        buffer += render_json(hackathon)
+        buffer += b"\n"
+        count += 1
+        if count % batch_size == 0:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
 @public_router.get("/hackathons")
-async def read_hackathons(db = Depends(get_db)):
-    collection = db.hackathons
-    hackathons = [h for h in (Hackathon.safe_from_mongo(doc) for doc in collection.find({})) if h is not None]    
-    return hackathons
+async def read_hackathons(
+    request: Request,
+    status: Optional[List[HackathonStatus]] = Query(None),
+    country: Optional[List[str]] = Query(None),
+    city: Optional[List[str]] = Query(None),
+    start_from: Optional[date] = Query(None, description="Earliest start date, defaults to today"),
+    start_to: Optional[date] = Query(None, description="Latest start date"),
+    include_past: bool = Query(False, description="Also return hackathons that already started"),
+    q: Optional[str] = Query(None, max_length=100, description="Text the hackathon name has to contain"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. name,date,location,status. Defaults to all"),
+    stream: bool = Query(False, description=f"Stream every match as {NDJSON_MEDIA_TYPE}, same as sending that Accept header"),
+    db = Depends(get_async_db),
+):
+    stream = stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    selection = parse_field_selection(fields)
+    validators = await get_cache_validators(request, db, "ndjson" if stream else "json")
+    if validators.not_modified:
+        return Response(status_code=304, headers=validators.headers)
+    headers = validators.headers
+
+    if not stream:
+        body = validators.cached_body()
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=headers)
+
+    query = build_hackathon_filter(
+        status=status,
+        country=country,
+        city=city,
+        start_from=start_from,
+        start_to=start_to,
+        include_past=include_past,
+        name=q,
+    )
+    if cursor:
+        try:
+            query = apply_cursor(query, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if stream:
+        # Exports get every match (after the cursor, if given) without pagination
+        docs = iter_hackathons(db, query, batch_size=STREAM_BATCH_SIZE, projection=mongo_projection(selection))
+        return StreamingResponse(stream_ndjson(docs, fields=selection), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    # Fetch one extra document to find out whether there is a next page
+    docs = await find_hackathons(db, query, limit=limit + 1, projection=mongo_projection(selection))
+    has_next = len(docs) > limit
+    docs = docs[:limit]
+    # The cursor is built from the raw document so invalid documents can't stall pagination
+    next_cursor = encode_cursor(docs[-1]) if has_next else None
+
+    hackathons = [h for h in (safe_from_mongo(doc, selection) for doc in docs) if h is not None]
+    body = render_json({"data": hackathons, "next_cursor": next_cursor})
+    validators.store_body(body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@public_router.get("/hackathons/facets")
+async def read_hackathon_facets(
+    request: Request,
+    status: Optional[List[HackathonStatus]] = Query(None),
+    country: Optional[List[str]] = Query(None),
+    city: Optional[List[str]] = Query(None),
+    start_from: Optional[date] = Query(None, description="Earliest start date, defaults to today"),
+    start_to: Optional[date] = Query(None, description="Latest start date"),
+    include_past: bool = Query(False, description="Also count hackathons that already started"),
+    db = Depends(get_async_db),
+):
+    """
+    Number of hackathons per status, country and city, for rendering the filters without loading the listing.
+    Every facet is scoped by the other filters (see hackathon_facets.build_facets_pipeline).
+    """
+    validators = await get_cache_validators(request, db, "json")
+    if validators.not_modified:
+        return Response(status_code=304, headers=validators.headers)
+    body = validators.cached_body()
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=validators.headers)
+
+    pipeline = build_facets_pipeline(
+        status=status,
+        country=country,
+        city=city,
+        start_from=start_from,
+        start_to=start_to,
+        include_past=include_past,
+    )
+    body = render_json(format_facets(await aggregate_hackathon_facets(db, pipeline)))
+    validators.store_body(body)
+    return Response(content=body, media_type="application/json", headers=validators.headers)
+
+
+@public_router.get("/hackathons/search")
+async def search_hackathons(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_RESULTS),
+    include_past: bool = Query(False, description="Also return hackathons that already started"),
+    db = Depends(get_async_db),
+):
+    """
+    Typeahead search over name, city and country. Every word of q has to match the start of a word of the hackathon.
+    Results are ranked by where the words matched (name > city > country) and whole words beat prefixes.
+    """
+    validators = await get_cache_validators(request, db, "json")
+    if validators.not_modified:
+        return Response(status_code=304, headers=validators.headers)
+    body = validators.cached_body()
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=validators.headers)
+
+    await search_index.ensure_current(lambda: load_all_hackathons(db), validators.version)
+    start_from = None if include_past else start_of_day(datetime.now(timezone.utc).date())
+    results = search_index.search(q, limit=limit, start_from=start_from)
+
+    body = render_json({"data": [{**hackathon, "score": score} for score, hackathon in results]})
+    validators.store_body(body)
+    return Response(content=body, media_type="application/json", headers=validators.headers)
+
+
+@public_router.get("/hackathons/near")
+async def read_hackathons_near(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    long: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(50, gt=0, le=20_000),
+    status: Optional[List[HackathonStatus]] = Query(None),
+    start_from: Optional[date] = Query(None, description="Earliest start date, defaults to today"),
+    start_to: Optional[date] = Query(None, description="Latest start date"),
+    include_past: bool = Query(False, description="Also return hackathons that already started"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. name,date,location,status. Defaults to all"),
+    db = Depends(get_async_db),
+):
+    """Hackathons within radius_km of a point, nearest first. Served by the 2dsphere index on location.geo."""
+    selection = parse_field_selection(fields)
+    validators = await get_cache_validators(request, db, "json")
+    if validators.not_modified:
+        return Response(status_code=304, headers=validators.headers)
+    body = validators.cached_body()
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=validators.headers)
+
+    query = build_hackathon_filter(status=status, start_from=start_from, start_to=start_to, include_past=include_past)
+    docs = await find_hackathons_near(
+        db, lat, long, max_distance_m=radius_km * 1000, query=query, limit=limit, projection=mongo_projection(selection),
+    )
+
+    results = []
+    for doc in docs:
+        distance_m = doc.pop("distance_m")
+        hackathon = safe_from_mongo(doc, selection)
+        if hackathon is not None:
+            results.append({**hackathon.model_dump(mode="json", by_alias=True), "distance_km": round(distance_m / 1000, 3)})
+    body = render_json({"data": results})
+    validators.store_body(body)
+    return Response(content=body, media_type="application/json", headers=validators.headers)
 
 
 @public_router.post("/submit-email")
 @limiter.limit("3/minute")
-async def submit_email(submission: EmailSubmission, request: Request, db = Depends(get_db)):
-    data = submission.dict()
+async def submit_email(submission: EmailSubmission, request: Request, db = Depends(get_async_db)):
+    data = submission.model_dump()
     data["timestamp"] = datetime.now()
-    result = db.emails.insert_one(data)
-    if result.inserted_id:
+    if await insert_email(db, data):
         return {"message": "Email submitted successfully"}
     raise HTTPException(status_code=500, detail="Failed to submit email")
 
 
 @public_router.post("/submit-hackathon")
 @limiter.limit("5/minute")
-async def submit_hackathon(submission: HackathonSubmission, request: Request, db = Depends(get_db)):
-    result = db.hackathon_suggestions.insert_one({
-        "hackathon": submission.hackathon,
-        "handled": submission.handled,
-        "timestamp": datetime.now()
-    })
-    if result.inserted_id:
-        return {"message": "Hackathon submitted successfully"}
-
-
-@public_router.post("/submit-hackathon")
-@limiter.limit("5/minute")
-async def submit_hackathon(submission: HackathonSubmission, request: Request, db = Depends(get_db)):
-    data = submission.dict()
+async def submit_hackathon(submission: HackathonSubmission, request: Request, db = Depends(get_async_db)):
+    data = submission.model_dump()
     data["timestamp"] = datetime.now()
-    result = db.hackathon_suggestions.insert_one(data)
-    if result.inserted_id:
+    if await insert_hackathon_suggestion(db, data):
         return {"message": "Hackathon submitted successfully"}
     raise HTTPException(status_code=500, detail="Failed to submit hackathon")
@@ -1,79 +1,187 @@
 import logging
-from typing import List
+import queue
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set
 import time
 
 from scrapers.base_scraper import BaseScraper
-from scrapers.mlh_scraper import MlhScraper
-from scrapers.mock_scraper import MockScraper
-# Import the processing function we will create in Step 4
-from inbox_processor import process_scraped_items
+from inbox_processor import process_scraped_items, ProcessingStats
+from scraper_pool import PageCommit, ScraperTiming, format_timings, put_item, run_concurrently
+from scraper_registry import enabled_scrapers, load_scrapers
 from shared_models.models import InboxItem
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Items per process_scraped_items call
+SCRAPE_BATCH_SIZE = 200
+# Items buffered between the scrapers and the processor. A full queue pauses the scrapers, which keeps memory
+# constant no matter how much a scrape yields.
+SCRAPE_QUEUE_SIZE = 2 * SCRAPE_BATCH_SIZE
+# A partial batch is processed once its first item has waited this long, so a slow scrape still lands items early
+FLUSH_INTERVAL_SECONDS = 5.0
+# Put on the queue after the last item
+_DONE = object()
+
+
+@dataclass
+class ScrapeRun:
+    """Result of run_all_scrapes."""
+    stats: ProcessingStats = field(default_factory=ProcessingStats)
+    timings: List[ScraperTiming] = field(default_factory=list)
+    seconds: float = 0.0
+    # Per scraper_name of the items: what processing did with them, and their share of the processing time
+    outcomes: Dict[Optional[str], Counter] = field(default_factory=dict)
+    ingest_seconds: Dict[Optional[str], float] = field(default_factory=dict)
+
 
 def get_active_scrapers() -> List[BaseScraper]:
     """
-    Defines and returns the list of scraper instances to be run.
-    This could be configured externally in the future (e.g., via settings or DB).
+    Creates the scrapers enabled for this environment (see scraper_registry.py), importing only their modules.
     """
-    scrapers = []
-    try:
-        # Example: Scrape MLH for the current year + 1 (adjust year as needed)
-        from datetime import date
-        current_year = date.today().year
-        scrapers.append(MlhScraper(year=current_year)) # Use both current and next year in the future
-    except ValueError as e:
-        logger.error(f"Failed to initialize MlhScraper: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error initializing MlhScraper: {e}")
-
-    # Always include MockScraper for demonstration/testing if needed
-    # In production, you might comment this out or control it via settings
-    # scrapers.append(MockScraper())
-
-    # Add other scrapers here later, e.g.:
-    # scrapers.append(DevpostScraper())
-
+    scrapers = load_scrapers(enabled_scrapers())
     logger.info(f"Initialized {len(scrapers)} active scrapers: {[s.SCRAPER_NAME for s in scrapers]}")
     return scrapers
 
 
-def run_all_scrapes():
+def produce_items(scrapers: List[BaseScraper], item_queue: queue.Queue, stop: threading.Event,
+                  timings: Optional[List[ScraperTiming]] = None) -> None:
     """
-    Runs all active scrapers, collects their results, and passes them to the processor.
+    Runs the scrapers concurrently (see scraper_pool.run_concurrently) and puts every item they yield on the
+    queue, followed by _DONE. Their timings are appended to timings.
     """
-    logger.info("Starting scraping cycle...")
-    active_scrapers = get_active_scrapers()
+    try:
+        results = run_concurrently(scrapers, item_queue, stop)
+        if timings is not None:
+            timings.extend(results)
+    finally:
+        put_item(item_queue, _DONE, stop)
 
-    if not active_scrapers:
-        logger.warning("No active scrapers configured. Exiting scraping cycle.")
-        return
 
-    all_results: List[InboxItem] = []
+def iter_batches(item_queue: queue.Queue, batch_size: int = SCRAPE_BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS,
+                 commits: Optional[List[Callable[[], None]]] = None) -> Iterator[List[InboxItem]]:
+    """
+    Groups the queued items into batches of batch_size until _DONE is read. A batch is yielded early when
+    its first item has waited flush_interval seconds.
 
-    for scraper_instance in active_scrapers:
-        scraper_name = getattr(scraper_instance, 'SCRAPER_NAME', 'UnknownScraper')
-        logger.info(f"--- Running scraper: {scraper_name} ---")
+    Queued PageCommits are appended to commits. The ones appended by the time a batch is yielded only depend on
+    the items of that batch and the ones before it.
+    """
+    batch: List[InboxItem] = []
+    deadline = 0.0
+    while True:
         try:
-            # Call the scrape method defined in the BaseScraper interface
-            items: List[InboxItem] = scraper_instance.scrape()
-            logger.info(f"  -> Scraper {scraper_name} finished. Found {len(items)} potential items.")
-            all_results.extend(items)
-            time.sleep(1)
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            item = item_queue.get(timeout=timeout)
+        except queue.Empty:
+            yield batch
+            batch = []
+            continue
+        if item is _DONE:
+            break
+        if isinstance(item, PageCommit):
+            if commits is not None:
+                commits.append(item.commit)
+            continue
+        if not batch:
+            deadline = time.monotonic() + flush_interval
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_page_commits(commits: List[Callable[[], None]], batch_failed: bool) -> None:
+    """Commits the pages whose items are stored, unless a batch failed. Empties commits."""
+    pending, commits[:] = list(commits), []
+    if batch_failed:
+        return
+    for commit in pending:
+        try:
+            commit()
         except Exception as e:
-            # Catch errors from individual scrapers so one failure doesn't stop all
-            logger.error(f"  ERROR running scraper {scraper_name}: {e}", exc_info=True) # Log traceback
+            # The page is just fetched and parsed again next time
+            logger.error(f"  ERROR committing a page to the HTTP cache: {e}", exc_info=True)
+
 
-    logger.info(f"--- Scraping cycle finished. Collected {len(all_results)} total items. ---")
+def run_all_scrapes(scrapers: Optional[List[BaseScraper]] = None, batch_size: int = SCRAPE_BATCH_SIZE,
+                    flush_interval: float = FLUSH_INTERVAL_SECONDS) -> ScrapeRun:
+    """
+    Runs all active scrapers and streams their items to the processor.
+
+    The scrapers run concurrently in background threads, within the per-host and timeout limits of
+    scraper_pool, and put the items they yield on a bounded queue. This thread takes them off in batches of
+    batch_size and passes each batch to process_scraped_items. Items land in the inbox while the scrapers are
+    still running, and no more than SCRAPE_QUEUE_SIZE + batch_size items are held in memory at any time.
 
-    # --- Step 4 Placeholder ---
-    logger.info("Proceeding to process scraped items...")
-    process_scraped_items(all_results)
+    Args:
+        scrapers: The scrapers to run, get_active_scrapers() by default.
+        batch_size: Items per process_scraped_items call.
+        flush_interval: Seconds after which a partial batch is processed anyway.
 
-    logger.info("Scraping and processing initiation complete.")
+    Returns:
+        The summed processing counts of all batches and the timings of the scrapers.
+    """
+    logger.info("Starting scraping cycle...")
+    active_scrapers = get_active_scrapers() if scrapers is None else scrapers
+
+    run = ScrapeRun()
+    if not active_scrapers:
+        logger.warning("No active scrapers configured. Exiting scraping cycle.")
+        return run
+
+    started_at = time.monotonic()
+    item_queue: queue.Queue = queue.Queue(maxsize=SCRAPE_QUEUE_SIZE)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=produce_items, args=(active_scrapers, item_queue, stop, run.timings), name="scrapers", daemon=True,
+    )
+    producer.start()
+
+    # The same URL from several batches (or scrapers) is only processed once per run
+    seen_keys: Set[str] = set()
+    # Page commits of the items processed so far. Dropped once a batch failed: its pages have to be fetched again.
+    commits: List[Callable[[], None]] = []
+    batch_failed = False
+    item_count = 0
+    batch_count = 0
+    try:
+        for batch in iter_batches(item_queue, batch_size, flush_interval, commits):
+            item_count += len(batch)
+            batch_count += 1
+            processing_started_at = time.monotonic()
+            try:
+                run.stats += process_scraped_items(batch, seen_keys, run.outcomes)
+            except Exception as e:
+                # Keep consuming, the next batch may well succeed (e.g. after a lost connection)
+                logger.error(f"  ERROR processing a batch of {len(batch)} items: {e}", exc_info=True)
+                run.stats.skipped += len(batch)
+                batch_failed = True
+            processing_seconds = time.monotonic() - processing_started_at
+            for scraper_name, count in Counter(item.scraper_name for item in batch).items():
+                run.ingest_seconds[scraper_name] = (run.ingest_seconds.get(scraper_name, 0.0)
+                                                    + processing_seconds * count / len(batch))
+            run_page_commits(commits, batch_failed)
+        run_page_commits(commits, batch_failed)
+    finally:
+        # Unblocks the producer if we stopped early
+        stop.set()
+        producer.join()
+
+    run.seconds = time.monotonic() - started_at
+    totals = run.stats
+    logger.info(f"--- Scraping cycle finished in {run.seconds:.1f}s. Processed {item_count} items in {batch_count} "
+                f"batches. Inserted: {totals.inserted}, Updated: {totals.updated}, Unchanged: {totals.unchanged}, "
+                f"Skipped: {totals.skipped} ---")
+    if run.timings:
+        logger.info("Scraper timings:\n" + format_timings(run.timings))
+    return run
 
 
 # Example of how to run this service directly (for testing)
@@ -0,0 +1,161 @@
+"""
+Scrape jobs, stored in the scrape_jobs collection.
+
+/scraping/trigger only inserts a queued job and returns; a separate worker process (scrape_worker.py) claims it
+with an atomic find_one_and_update, runs the scrapers and writes the result back. Job state therefore survives
+restarts, is the same for every API worker, and a scrape never runs on the API's threads.
+
+At most one job is queued or running at a time: such jobs carry active: true, which has a unique partial index
+(see database.ensure_indexes), so concurrent triggers can't queue two. A running job's worker refreshes its
+heartbeat_at; if it stops doing so (the worker crashed or was killed), requeue_stale_jobs puts the job back in
+the queue, or fails it after MAX_ATTEMPTS claims. Until a worker does that, the API doesn't count the stale job as
+running, and a new trigger fails it to queue its own (see scraping_routes.trigger_scrape).
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.database import Database
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_JOBS = "scrape_jobs"
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# Minimum time between two triggered scrapes
+MIN_SCRAPE_INTERVAL = timedelta(seconds=30)
+# How often a worker refreshes heartbeat_at of its running job
+HEARTBEAT_INTERVAL_SECONDS = 15
+# A running job whose heartbeat is older than this is considered abandoned
+STALE_AFTER = timedelta(minutes=2)
+# Claims of a job before it is failed instead of requeued
+MAX_ATTEMPTS = 3
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """MongoDB returns naive UTC datetimes."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def new_job(scrapers: Optional[List[str]] = None, trigger: str = "manual") -> Dict[str, Any]:
+    """
+    Args:
+        scrapers: SCRAPER_NAMEs of the scrapers to run, None for all active scrapers.
+        trigger: What queued the job, "manual" (/scraping/trigger) or "schedule" (scrape_scheduler.py).
+    """
+    return {
+        "status": QUEUED, "active": True, "created_at": utc_now(), "attempts": 0,
+        "scrapers": scrapers, "trigger": trigger,
+    }
+
+
+def claim_next_job(db: Database, worker_id: str) -> Optional[Dict[str, Any]]:
+    """Atomically moves the oldest queued job to running and assigns it to the worker. None if there is none."""
+    now = utc_now()
+    return db[SCRAPE_JOBS].find_one_and_update(
+        {"status": QUEUED},
+        {
+            "$set": {"status": RUNNING, "worker_id": worker_id, "started_at": now, "heartbeat_at": now},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def heartbeat(db: Database, job_id: ObjectId, worker_id: str) -> bool:
+    """Refreshes heartbeat_at. Returns False if the job isn't running on this worker anymore (it was requeued)."""
+    result = db[SCRAPE_JOBS].update_one(
+        {"_id": job_id, "status": RUNNING, "worker_id": worker_id},
+        {"$set": {"heartbeat_at": utc_now()}},
+    )
+    return result.matched_count == 1
+
+
+def _finish(db: Database, job_id: ObjectId, worker_id: str, fields: Dict[str, Any]) -> bool:
+    result = db[SCRAPE_JOBS].update_one(
+        {"_id": job_id, "status": RUNNING, "worker_id": worker_id},
+        {"$set": {**fields, "finished_at": utc_now()}, "$unset": {"active": ""}},
+    )
+    if result.matched_count == 0:
+        logger.warning(f"Scrape job {job_id} is no longer running on worker {worker_id}, result not recorded")
+    return result.matched_count == 1
+
+
+def complete_job(db: Database, job_id: ObjectId, worker_id: str, stats: Dict[str, int],
+                 timings: List[Dict[str, Any]]) -> bool:
+    """Records the result of a finished job. Returns False if the job was taken away from the worker."""
+    return _finish(db, job_id, worker_id, {"status": COMPLETED, "stats": stats, "timings": timings})
+
+
+def fail_job(db: Database, job_id: ObjectId, worker_id: str, error: str) -> bool:
+    return _finish(db, job_id, worker_id, {"status": FAILED, "error": error})
+
+
+def stale_jobs_filter() -> Dict[str, Any]:
+    """Query for running jobs whose worker stopped sending heartbeats."""
+    return {"status": RUNNING, "heartbeat_at": {"$lt": utc_now() - STALE_AFTER}}
+
+
+def is_stale(job: Dict[str, Any]) -> bool:
+    """Whether the job is running on a worker that stopped sending heartbeats, see stale_jobs_filter."""
+    heartbeat_at = as_utc(job.get("heartbeat_at"))
+    return job["status"] == RUNNING and heartbeat_at is not None and heartbeat_at < utc_now() - STALE_AFTER
+
+
+def is_active(job: Dict[str, Any]) -> bool:
+    """Whether the job is queued, or running on a worker that is still alive."""
+    return job["status"] in ACTIVE_STATUSES and not is_stale(job)
+
+
+def failed_job_update(error: str) -> Dict[str, Any]:
+    """Update that fails a job and frees the queue for the next one."""
+    return {"$set": {"status": FAILED, "error": error, "finished_at": utc_now()}, "$unset": {"active": ""}}
+
+
+def requeue_stale_jobs(db: Database) -> int:
+    """Requeues (or fails, after MAX_ATTEMPTS) running jobs whose worker stopped sending heartbeats."""
+    stale = stale_jobs_filter()
+    failed = db[SCRAPE_JOBS].update_many(
+        {**stale, "attempts": {"$gte": MAX_ATTEMPTS}},
+        failed_job_update(f"Worker stopped responding {MAX_ATTEMPTS} times"),
+    )
+    requeued = db[SCRAPE_JOBS].update_many(
+        {**stale, "attempts": {"$lt": MAX_ATTEMPTS}},
+        {"$set": {"status": QUEUED}, "$unset": {"worker_id": "", "heartbeat_at": ""}},
+    )
+    if failed.modified_count or requeued.modified_count:
+        logger.warning(f"Stale scrape jobs: {requeued.modified_count} requeued, {failed.modified_count} failed")
+    return requeued.modified_count + failed.modified_count
+
+
+def job_status(job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The /scraping/status view of a job document (None: no job was ever triggered)."""
+    if job is None:
+        return {"job_id": None, "is_running": False, "last_run": None, "last_status": None, "items_collected": 0}
+    last_run = as_utc(job.get("started_at") or job.get("created_at"))
+    last_status = job["status"]
+    if last_status == FAILED and job.get("error"):
+        last_status = f"failed: {job['error']}"
+    elif is_stale(job):
+        last_status = "stalled: worker stopped responding"
+    return {
+        "job_id": str(job["_id"]),
+        "is_running": is_active(job),
+        "last_run": last_run.isoformat() if last_run else None,
+        "last_status": last_status,
+        "items_collected": sum((job.get("stats") or {}).values()),
+    }
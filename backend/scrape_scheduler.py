@@ -0,0 +1,131 @@
+"""
+Periodic, adaptive scheduling of scrapers.
+
+Every scraper has a document in scrape_schedule with its current interval and next_run_at. The scheduler queues
+a scrape job (see scrape_jobs.py) for the scrapers that are due. After a run, each scraper's interval adapts to how
+often its source actually changes: a run whose item fingerprint (see scraper_pool.ScraperTiming) differs from the
+last one divides the interval by SPEEDUP, a run without changes multiplies it by BACKOFF, within the
+SCRAPE_INTERVAL_* settings. Fetch volume so follows the rate of change of each source. Next runs are jittered,
+so scrapers that started together drift apart.
+
+The scheduler ticks in the scrape workers (scrape_worker.py). Only the holder of the lease in scheduler_locks
+schedules, so any number of workers can run; if the holder dies, another worker takes over once the lease expired.
+"""
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from scrapers.base_scraper import BaseScraper
+from scrape_jobs import SCRAPE_JOBS, new_job, utc_now
+from scraper_pool import ScraperTiming
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_SCHEDULE = "scrape_schedule"
+SCHEDULER_LOCKS = "scheduler_locks"
+LOCK_ID = "scrape_scheduler"
+# Seconds between two scheduler ticks, and how long a tick's lease on the lock is valid
+TICK_SECONDS = 60
+LOCK_LEASE = timedelta(seconds=3 * TICK_SECONDS)
+
+# Interval factors for sources that changed / didn't change since the last run
+SPEEDUP = 2.0
+BACKOFF = 1.5
+
+
+def acquire_scheduler_lock(db: Database, owner: str, now: Optional[datetime] = None) -> bool:
+    """Takes or renews the scheduler lease. False if another owner holds an unexpired lease."""
+    now = now or utc_now()
+    try:
+        db[SCHEDULER_LOCKS].find_one_and_update(
+            {"_id": LOCK_ID, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + LOCK_LEASE}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # The lock document exists but didn't match: it's held by someone else
+        return False
+    return True
+
+
+def jittered(seconds: float) -> float:
+    return seconds * random.uniform(1 - settings.SCRAPE_INTERVAL_JITTER, 1 + settings.SCRAPE_INTERVAL_JITTER)
+
+
+def adapt_interval(interval: float, changed: bool) -> float:
+    """The next interval of a scraper, shorter if its source changed, longer if it didn't."""
+    interval = interval / SPEEDUP if changed else interval * BACKOFF
+    return min(settings.SCRAPE_INTERVAL_MAX_SECONDS, max(settings.SCRAPE_INTERVAL_MIN_SECONDS, interval))
+
+
+def initial_interval(scraper: BaseScraper) -> float:
+    return scraper.SCRAPE_INTERVAL_SECONDS or settings.SCRAPE_INTERVAL_SECONDS
+
+
+def ensure_schedule(db: Database, scrapers: Iterable[BaseScraper], now: Optional[datetime] = None) -> None:
+    """Adds scrapers without a schedule yet, due right away."""
+    now = now or utc_now()
+    for scraper in scrapers:
+        db[SCRAPE_SCHEDULE].update_one(
+            {"_id": scraper.SCRAPER_NAME},
+            {"$setOnInsert": {"interval_seconds": initial_interval(scraper), "next_run_at": now,
+                              "last_fingerprint": None, "last_changed_at": None}},
+            upsert=True,
+        )
+
+
+def schedule_due_scrapers(db: Database, owner: str, scrapers: List[BaseScraper],
+                          now: Optional[datetime] = None) -> Optional[Any]:
+    """
+    One scheduler tick: if this owner holds the lock, queues a job for the scrapers that are due.
+    Returns the job id, None if nothing was queued.
+    """
+    now = now or utc_now()
+    if not acquire_scheduler_lock(db, owner, now):
+        return None
+    ensure_schedule(db, scrapers, now)
+    scraper_names = [scraper.SCRAPER_NAME for scraper in scrapers]
+    due = list(db[SCRAPE_SCHEDULE].find({"_id": {"$in": scraper_names}, "next_run_at": {"$lte": now}}))
+    if not due:
+        return None
+    try:
+        job = new_job(scrapers=[doc["_id"] for doc in due], trigger="schedule")
+        job_id = db[SCRAPE_JOBS].insert_one(job).inserted_id
+    except DuplicateKeyError:
+        return None  # A job is queued or running, try again at the next tick
+    for doc in due:
+        # Provisional, record_results sets the real next run. Keeps a job that never completes from being
+        # queued again at every tick.
+        db[SCRAPE_SCHEDULE].update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"next_run_at": now + timedelta(seconds=jittered(doc["interval_seconds"]))}},
+        )
+    logger.info(f"Scheduled scrape job {job_id} for {[doc['_id'] for doc in due]}")
+    return job_id
+
+
+def record_results(db: Database, timings: List[ScraperTiming], now: Optional[datetime] = None) -> None:
+    """
+    Adapts the schedule of the scrapers of a finished run. A scraper counts as changed if it yielded items with
+    another fingerprint than at its last run; yielding nothing means its pages were unchanged (HTTP cache).
+    Failed and timed out scrapers keep their interval.
+    """
+    now = now or utc_now()
+    for timing in timings:
+        doc: Dict[str, Any] = db[SCRAPE_SCHEDULE].find_one({"_id": timing.scraper_name}) or {}
+        interval = doc.get("interval_seconds", settings.SCRAPE_INTERVAL_SECONDS)
+        updates: Dict[str, Any] = {"last_run_at": now, "last_status": timing.status}
+        if timing.status == "ok":
+            changed = timing.items > 0 and timing.fingerprint != doc.get("last_fingerprint")
+            interval = adapt_interval(interval, changed)
+            if changed:
+                updates.update(last_fingerprint=timing.fingerprint, last_changed_at=now)
+            logger.info(f"Scraper {timing.scraper_name} {'changed' if changed else 'unchanged'}, "
+                        f"next run in {interval / 3600:.1f}h")
+        updates.update(interval_seconds=interval, next_run_at=now + timedelta(seconds=jittered(interval)))
+        db[SCRAPE_SCHEDULE].update_one({"_id": timing.scraper_name}, {"$set": updates}, upsert=True)
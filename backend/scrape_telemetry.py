@@ -0,0 +1,131 @@
+"""
+Telemetry of scrape runs, one document per run in the scrape_runs collection.
+
+A run's document has a record per scraper with where its time went (fetching, parsing, ingesting, waiting), how
+much it downloaded, and what became of its items: found, inserted, updated, unchanged, duplicates and errors.
+summarize_runs turns the runs of a time window into percentiles and daily trends per scraper (/scraping/stats),
+so a source that gets slower or yields less shows up before the listings go stale.
+
+Only the scrape worker writes runs; the API reads them. This module doesn't import any scraper code, so the API
+can use it without loading the scrapers (see scraper_registry.py).
+"""
+import math
+from collections import Counter, defaultdict
+from dataclasses import asdict
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from pymongo.database import Database
+
+from scrape_jobs import as_utc, utc_now
+
+if TYPE_CHECKING:
+    from run_scrapers import ScrapeRun
+    from scraper_pool import ScraperTiming
+
+SCRAPE_RUNS = "scrape_runs"
+
+# What processing did with a scraper's items, see inbox_processor.process_scraped_items
+OUTCOMES = ("inserted", "updated", "unchanged", "duplicates", "errors")
+# Seconds per scraper and run that are summarized as percentiles
+LATENCY_METRICS = ("seconds", "waited_seconds", "fetch_seconds", "parse_seconds", "blocked_seconds", "ingest_seconds")
+PERCENTILES = (50, 90, 99)
+# Counts per scraper and run that are summed per day
+DAILY_TOTALS = ("items_found", "bytes_downloaded", "requests", "fetch_errors") + OUTCOMES
+
+
+def scraper_record(timing: "ScraperTiming", run: "ScrapeRun") -> Dict[str, Any]:
+    """The telemetry of one scraper in a run."""
+    outcomes: Counter = Counter()
+    ingest_seconds = 0.0
+    for source in set(timing.sources):
+        outcomes.update(run.outcomes.get(source, {}))
+        ingest_seconds += run.ingest_seconds.get(source, 0.0)
+    return {
+        "scraper_name": timing.scraper_name,
+        "host": timing.host,
+        "status": timing.status,
+        "error": timing.error,
+        "items_found": timing.items,
+        "requests": timing.requests,
+        "fetch_errors": timing.fetch_errors,
+        "bytes_downloaded": timing.bytes_downloaded,
+        "seconds": timing.seconds,
+        "waited_seconds": timing.waited_seconds,
+        "fetch_seconds": timing.fetch_seconds,
+        "parse_seconds": timing.parse_seconds,
+        "blocked_seconds": timing.blocked_seconds,
+        "ingest_seconds": ingest_seconds,
+        **{outcome: outcomes[outcome] for outcome in OUTCOMES},
+    }
+
+
+def run_record(run: "ScrapeRun", job: Optional[Dict[str, Any]] = None,
+               finished_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """The scrape_runs document of a run, linked to its scrape job if there is one."""
+    return {
+        "job_id": job["_id"] if job else None,
+        "trigger": job.get("trigger") if job else None,
+        "finished_at": finished_at or utc_now(),
+        "seconds": run.seconds,
+        "stats": asdict(run.stats),
+        "scrapers": [scraper_record(timing, run) for timing in run.timings],
+    }
+
+
+def record_run(db: Database, run: "ScrapeRun", job: Optional[Dict[str, Any]] = None) -> Any:
+    """Stores the telemetry of a run and returns its id."""
+    return db[SCRAPE_RUNS].insert_one(run_record(run, job)).inserted_id
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """Linear interpolation between the closest ranks, None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percent / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Percentiles and daily trends per scraper over the runs, oldest run first.
+
+    Returns:
+        {"runs": ..., "scrapers": {scraper_name: {"runs", "failures", "last_status", "last_run_at",
+        "percentiles": {metric: {"p50", "p90", "p99"}}, "daily": [{"date", "runs", "failures", "p50_seconds",
+        *DAILY_TOTALS}]}}}
+    """
+    records: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for run in runs:
+        finished_at = as_utc(run["finished_at"])
+        for record in run.get("scrapers", []):
+            records[record["scraper_name"]].append({**record, "finished_at": finished_at})
+
+    scrapers = {}
+    for name, entries in records.items():
+        days: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            days[entry["finished_at"].date().isoformat()].append(entry)
+        scrapers[name] = {
+            "runs": len(entries),
+            "failures": sum(entry["status"] != "ok" for entry in entries),
+            "last_status": entries[-1]["status"],
+            "last_run_at": entries[-1]["finished_at"].isoformat(),
+            "percentiles": {
+                metric: {f"p{p}": percentile([entry.get(metric, 0.0) for entry in entries], p) for p in PERCENTILES}
+                for metric in LATENCY_METRICS
+            },
+            "daily": [
+                {
+                    "date": day,
+                    "runs": len(day_entries),
+                    "failures": sum(entry["status"] != "ok" for entry in day_entries),
+                    "p50_seconds": percentile([entry["seconds"] for entry in day_entries], 50),
+                    **{total: sum(entry.get(total, 0) for entry in day_entries) for total in DAILY_TOTALS},
+                }
+                for day, day_entries in sorted(days.items())
+            ],
+        }
+    return {"runs": len(runs), "scrapers": scrapers}
@@ -0,0 +1,179 @@
+"""
+Worker process for the scrape jobs queued by /scraping/trigger (see scrape_jobs.py).
+
+Polls the scrape_jobs collection, claims the oldest queued job, runs its scrapers and records the result on the
+job. Any number of workers can run against the same database, each job is claimed by exactly one of them.
+Between jobs, the workers also run the scheduler (scrape_scheduler.py), which queues the periodic scrapes; one
+worker at a time holds its lock. SIGTERM/SIGINT let the current job finish before the worker exits.
+
+/set-environment switches the API between the production and the staging database at any time, so a worker
+serves both: it polls the database of each environment in turn, and runs the scheduler and the jobs of a
+database as that environment (its enabled scrapers, its HTTP cache, its inbox).
+
+Run from the backend folder:
+    python scrape_worker.py
+    python scrape_worker.py --once   # Run the next queued job, if any, and exit
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, List, Tuple
+
+from pymongo.database import Database
+
+from database import ensure_indexes, get_db
+from run_scrapers import get_active_scrapers, run_all_scrapes
+from scrape_jobs import (
+    HEARTBEAT_INTERVAL_SECONDS, claim_next_job, complete_job, fail_job, heartbeat, requeue_stale_jobs,
+)
+from scrape_scheduler import TICK_SECONDS, record_results, schedule_due_scrapers
+from scrape_telemetry import record_run
+from scraper_registry import ScraperEntry, enabled_scrapers, load_scrapers
+from scrapers.base_scraper import BaseScraper
+from scrapers.http_client import close_http_client
+from settings import settings
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Seconds between two looks at the queue when it is empty
+POLL_INTERVAL_SECONDS = 5
+
+# The scheduler only reads the names and intervals of the scrapers, so they are loaded once per set of enabled
+# scrapers rather than at every tick
+_scheduled_scrapers: Dict[Tuple[ScraperEntry, ...], List[BaseScraper]] = {}
+
+
+def send_heartbeats(db: Database, job: Dict[str, Any], worker_id: str, done: threading.Event) -> None:
+    while not done.wait(HEARTBEAT_INTERVAL_SECONDS):
+        if not heartbeat(db, job["_id"], worker_id):
+            logger.warning(f"Lost scrape job {job['_id']}, it was requeued while running")
+            return
+
+
+def run_job(db: Database, job: Dict[str, Any], worker_id: str) -> None:
+    """Runs the scrapers for a claimed job and records the result, or the error, on the job."""
+    logger.info(f"Running scrape job {job['_id']} on {db.name} (attempt {job.get('attempts', 1)})")
+    done = threading.Event()
+    heartbeats = threading.Thread(target=send_heartbeats, args=(db, job, worker_id, done), daemon=True)
+    heartbeats.start()
+    try:
+        scrapers = get_active_scrapers()
+        if job.get("scrapers") is not None:
+            scrapers = [scraper for scraper in scrapers if scraper.SCRAPER_NAME in job["scrapers"]]
+        run = run_all_scrapes(scrapers)
+    except Exception as e:
+        logger.error(f"Scrape job {job['_id']} failed: {e}", exc_info=True)
+        fail_job(db, job["_id"], worker_id, str(e))
+        return
+    finally:
+        done.set()
+        heartbeats.join()
+    if complete_job(db, job["_id"], worker_id, asdict(run.stats), [asdict(timing) for timing in run.timings]):
+        record_results(db, run.timings)
+    try:
+        record_run(db, run, job)
+    except Exception as e:
+        # Telemetry is no reason to fail or repeat a scrape
+        logger.error(f"Could not record the telemetry of scrape job {job['_id']}: {e}", exc_info=True)
+    logger.info(f"Scrape job {job['_id']} completed in {run.seconds:.1f}s")
+
+
+def scheduled_scrapers() -> List[BaseScraper]:
+    """The enabled scrapers of the current environment, for the scheduler. Jobs load their own."""
+    entries = tuple(enabled_scrapers())
+    if entries not in _scheduled_scrapers:
+        _scheduled_scrapers[entries] = load_scrapers(list(entries))
+    return _scheduled_scrapers[entries]
+
+
+def run_scheduler_tick(db: Database, worker_id: str) -> None:
+    try:
+        schedule_due_scrapers(db, worker_id, scheduled_scrapers())
+    except Exception as e:
+        logger.error(f"Scheduler tick failed: {e}", exc_info=True)
+
+
+def run_next_job(db: Database, worker_id: str) -> bool:
+    """Claims and runs the next queued job of the database. False if there was none."""
+    try:
+        requeue_stale_jobs(db)
+        job = claim_next_job(db, worker_id)
+    except Exception as e:
+        # The database may be unreachable for a moment, try again at the next poll
+        logger.error(f"Could not claim a scrape job on {db.name}: {e}", exc_info=True)
+        return False
+    if job is None:
+        return False
+    try:
+        run_job(db, job, worker_id)
+    except Exception as e:
+        # Recording the result failed; the job is requeued once its heartbeat is stale
+        logger.error(f"Could not record scrape job {job['_id']}: {e}", exc_info=True)
+    return True
+
+
+def served_environments() -> Dict[str, str]:
+    """
+    The environment to run as per database the worker serves: the worker's own, and every other one
+    /set-environment can switch the API to. While testing that is only the test database.
+    """
+    environments: Dict[str, str] = {}
+    for environment in (settings.ENVIRONMENT, "production", "staging"):
+        environments.setdefault(settings.database_for(environment), environment)
+    return environments
+
+
+@contextmanager
+def running_as(environment: str) -> Iterator[Database]:
+    """Switches the worker's settings to the environment and yields its database."""
+    previous = settings.ENVIRONMENT
+    settings.ENVIRONMENT = environment
+    try:
+        yield get_db()
+    finally:
+        settings.ENVIRONMENT = previous
+
+
+def main(args) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    environments = served_environments()
+    for environment in environments.values():
+        with running_as(environment) as db:
+            ensure_indexes(db)
+    logger.info(f"Scrape worker {worker_id} started on {', '.join(environments)}")
+    next_tick = 0.0
+    while not stop.is_set():
+        tick = settings.SCRAPE_SCHEDULER_ENABLED and not args.once and time.monotonic() >= next_tick
+        if tick:
+            next_tick = time.monotonic() + TICK_SECONDS
+        ran_job = False
+        for environment in environments.values():
+            if stop.is_set() or (args.once and ran_job):
+                break
+            with running_as(environment) as db:
+                if tick:
+                    run_scheduler_tick(db, worker_id)
+                ran_job = run_next_job(db, worker_id) or ran_job
+        if args.once:
+            break
+        if not ran_job:
+            stop.wait(POLL_INTERVAL_SECONDS)
+    close_http_client()
+    logger.info(f"Scrape worker {worker_id} stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="Run the next queued job, if any, and exit")
+    main(parser.parse_args())
@@ -0,0 +1,286 @@
+"""
+Concurrent execution of scrapers.
+
+Scrapers are independent of each other, so they run in parallel threads (they do blocking I/O) and a run takes
+about as long as its slowest scraper instead of the sum of all of them. To stay polite, scrapers of the same host
+share a concurrency limit and start at least a delay apart (see HostLimiter). Every scraper has a timeout; one
+that runs over it or fails is recorded in its ScraperTiming and the others carry on.
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from scrapers.base_scraper import BaseScraper, FetchMetrics
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Final states of a scraper in a run
+FINAL_STATUSES = ("ok", "failed", "timeout", "cancelled")
+# How often the watchdog checks for timeouts
+_POLL_SECONDS = 0.05
+
+
+def put_item(item_queue: queue.Queue, item, cancel: threading.Event) -> bool:
+    """Blocks until the item is queued, unless cancel is set first. Returns whether it was queued."""
+    while not cancel.is_set():
+        try:
+            item_queue.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class PageCommit(NamedTuple):
+    """Queued after the items of a fetched page: commits the page once they are stored (see Page.defer_commit_to)."""
+    commit: Callable[[], None]
+
+
+class HostLimiter:
+    """
+    Allows at most `concurrency` scrapers per host at a time, or the host's value in `per_host`, started at least
+    `delay` seconds apart.
+    """
+
+    def __init__(self, concurrency: int, delay: float, per_host: Optional[Dict[str, int]] = None):
+        self.concurrency = concurrency
+        self.delay = delay
+        self.per_host = per_host or {}
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host.get(host, self.concurrency))
+            return self._semaphores[host]
+
+    def acquire(self, host: str, cancel: threading.Event) -> bool:
+        """Waits for a slot of the host. Returns False if cancel was set while waiting."""
+        semaphore = self._semaphore(host)
+        while not semaphore.acquire(timeout=_POLL_SECONDS):
+            if cancel.is_set():
+                return False
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.delay
+        if cancel.wait(start - now):
+            semaphore.release()
+            return False
+        return True
+
+    def release(self, host: str) -> None:
+        self._semaphore(host).release()
+
+
+@dataclass
+class ScraperTiming:
+    """How a scraper did in a run."""
+    scraper_name: str
+    host: str
+    status: str = "waiting"  # waiting, running, then one of FINAL_STATUSES
+    items: int = 0
+    waited_seconds: float = 0.0  # For a worker and a slot of its host
+    seconds: float = 0.0
+    error: Optional[str] = None
+    # Order independent hash of the content hashes of all items, set once the scraper finished (see scrape_scheduler)
+    fingerprint: Optional[str] = None
+    # Its fetches in this run (see BaseScraper.fetch_metrics)
+    requests: int = 0
+    fetch_errors: int = 0
+    bytes_downloaded: int = 0
+    fetch_seconds: float = 0.0
+    # Waiting for room on the queue, i.e. for the processor to catch up
+    blocked_seconds: float = 0.0
+    # scraper_name of its items, which a composite scraper can set per part
+    sources: List[str] = field(default_factory=list)
+
+    @property
+    def parse_seconds(self) -> float:
+        """Running time that was neither spent fetching nor blocked: parsing and building items."""
+        return max(0.0, self.seconds - self.fetch_seconds - self.blocked_seconds)
+
+
+class _ScraperTask:
+    """Runs one scraper in its own thread and puts its items on the queue."""
+
+    def __init__(self, scraper: BaseScraper, item_queue: queue.Queue, limiter: HostLimiter,
+                 workers: threading.BoundedSemaphore, timeout: float):
+        self.scraper = scraper
+        self.item_queue = item_queue
+        self.limiter = limiter
+        self.workers = workers
+        self.timeout = getattr(scraper, "TIMEOUT_SECONDS", None) or timeout
+        self.timing = ScraperTiming(scraper_name=getattr(scraper, "SCRAPER_NAME", "UnknownScraper"), host=scraper.host)
+        self.cancelled = threading.Event()
+        self.started_at: Optional[float] = None
+        self._queued_at = 0.0
+        self._fetches_before = FetchMetrics()
+        # Releases of the worker and host slots the task holds
+        self._held: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"scraper-{self.timing.scraper_name}", daemon=True)
+        scraper.pending_commits = []
+
+    @property
+    def done(self) -> bool:
+        return self.timing.status in FINAL_STATUSES
+
+    def start(self) -> None:
+        self._queued_at = time.monotonic()
+        self._thread.start()
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        """
+        Sets the final status, unless there already is one. Stops the scraper from queueing more items and frees
+        its slots: a timed out scraper's thread may be stuck in I/O for much longer, but the next scraper of
+        its host doesn't have to wait for it.
+        """
+        with self._lock:
+            if self.done:
+                return
+            self.timing.status = status
+            self.timing.error = error
+            if self.started_at is not None:
+                self.timing.seconds = time.monotonic() - self.started_at
+                fetches = self.scraper.fetch_metrics - self._fetches_before
+                self.timing.requests = fetches.requests
+                self.timing.fetch_errors = fetches.errors
+                self.timing.bytes_downloaded = fetches.bytes_downloaded
+                self.timing.fetch_seconds = fetches.seconds
+        self.cancelled.set()
+        self._release_slots()
+
+    def _hold(self, release: Callable[[], None]) -> bool:
+        """Registers an acquired slot. If the task is already finished, releases it right away and returns False."""
+        with self._lock:
+            if not self.done:
+                self._held.append(release)
+                return True
+        release()
+        return False
+
+    def _release_slots(self) -> None:
+        """Releases the held slots, once: by finish() or at the end of the thread, whichever comes first."""
+        with self._lock:
+            held, self._held = self._held, []
+        for release in held:
+            release()
+
+    def _run(self) -> None:
+        name = self.timing.scraper_name
+        host = self.timing.host
+        while not self.workers.acquire(timeout=_POLL_SECONDS):
+            if self.cancelled.is_set():
+                return
+        try:
+            if not self._hold(self.workers.release):
+                return
+            if not self.limiter.acquire(host, self.cancelled) or not self._hold(lambda: self.limiter.release(host)):
+                return
+            with self._lock:
+                if self.done:
+                    return
+                self.started_at = time.monotonic()
+                self.timing.waited_seconds = self.started_at - self._queued_at
+                self.timing.status = "running"
+                self._fetches_before = replace(self.scraper.fetch_metrics)  # A copy
+            logger.info(f"--- Running scraper: {name} ---")
+            self._scrape()
+        finally:
+            self._release_slots()
+
+    def _queue_commits(self) -> bool:
+        """Queues the commits of the pages whose items were all queued. False if the task was stopped."""
+        pending = self.scraper.pending_commits
+        while pending:
+            if not put_item(self.item_queue, PageCommit(pending.pop(0)), self.cancelled):
+                return False
+        return True
+
+    def _scrape(self) -> None:
+        name = self.timing.scraper_name
+        items = self.scraper.iter_items()
+        fingerprint = 0
+        try:
+            for item in items:
+                if not self._queue_commits():
+                    return
+                fingerprint ^= int(item.compute_content_hash(), 16)
+                if item.scraper_name not in self.timing.sources:
+                    self.timing.sources.append(item.scraper_name)
+                put_at = time.monotonic()
+                queued = put_item(self.item_queue, item, self.cancelled)
+                self.timing.blocked_seconds += time.monotonic() - put_at
+                if not queued:
+                    return  # Timed out or the run was stopped
+                self.timing.items += 1
+            if not self._queue_commits():
+                return
+            self.timing.fingerprint = f"{fingerprint:064x}"
+            self.finish("ok")
+            logger.info(f"  -> Scraper {name} finished. Found {self.timing.items} potential items.")
+        except Exception as e:
+            # Catch errors from individual scrapers so one failure doesn't stop all.
+            # Items it yielded before failing are processed anyway.
+            logger.error(f"  ERROR running scraper {name} after {self.timing.items} items: {e}", exc_info=True)
+            self._queue_commits()  # Pages completed before the error
+            self.finish("failed", str(e))
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+
+def run_concurrently(scrapers: List[BaseScraper], item_queue: queue.Queue, stop: threading.Event,
+                     max_workers: Optional[int] = None, host_concurrency: Optional[int] = None,
+                     host_delay: Optional[float] = None, timeout: Optional[float] = None) -> List[ScraperTiming]:
+    """
+    Runs the scrapers in parallel and puts every item they yield on the queue. Returns once every scraper
+    finished, failed or timed out, or right after stop is set.
+
+    A scraper that runs over its timeout (its TIMEOUT_SECONDS, else timeout) is abandoned: its thread can't be
+    killed, but it can't queue any more items and the run doesn't wait for it. The limits default to the
+    SCRAPER_* settings; host_concurrency applies to every host, the setting has per-host overrides.
+
+    Returns:
+        One ScraperTiming per scraper, in the order of scrapers.
+    """
+    limiter = HostLimiter(
+        settings.SCRAPER_HOST_CONCURRENCY if host_concurrency is None else host_concurrency,
+        settings.SCRAPER_HOST_DELAY_SECONDS if host_delay is None else host_delay,
+        settings.SCRAPER_HOST_CONCURRENCY_BY_HOST if host_concurrency is None else None,
+    )
+    workers = threading.BoundedSemaphore(settings.SCRAPER_MAX_WORKERS if max_workers is None else max_workers)
+    timeout = settings.SCRAPER_TIMEOUT_SECONDS if timeout is None else timeout
+    tasks = [_ScraperTask(scraper, item_queue, limiter, workers, timeout) for scraper in scrapers]
+    for task in tasks:
+        task.start()
+
+    while not all(task.done for task in tasks):
+        if stop.wait(_POLL_SECONDS):
+            for task in tasks:
+                task.finish("cancelled")
+            break
+        now = time.monotonic()
+        for task in tasks:
+            if task.started_at is not None and not task.done and now - task.started_at > task.timeout:
+                logger.error(f"  Scraper {task.timing.scraper_name} timed out after {task.timeout:.0f}s "
+                             f"and {task.timing.items} items.")
+                task.finish("timeout", f"Timed out after {task.timeout:.0f}s")
+    return [task.timing for task in tasks]
+
+
+def format_timings(timings: List[ScraperTiming]) -> str:
+    """Table of the timings for the log, slowest scraper first."""
+    lines = [f"{'scraper':<32} {'host':<24} {'status':<9} {'items':>6} {'waited':>8} {'seconds':>8}"]
+    for timing in sorted(timings, key=lambda t: t.seconds, reverse=True):
+        lines.append(f"{timing.scraper_name:<32} {timing.host:<24} {timing.status:<9} {timing.items:>6} "
+                     f"{timing.waited_seconds:>8.2f} {timing.seconds:>8.2f}")
+    return "\n".join(lines)
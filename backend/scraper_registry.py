@@ -0,0 +1,97 @@
+"""
+Registry of the scrapers the scrape worker can run.
+
+A scraper is registered by name with a "module:factory" target, where the factory returns a BaseScraper or a
+list of them. Targets are only imported when the enabled scrapers are loaded, in the scrape worker: importing
+the registry doesn't import any scraper module or its parsing libraries, and disabled scrapers are never imported.
+
+Scrapers come from BUILTIN_SCRAPERS and from installed packages that declare an entry point in the
+ENTRY_POINT_GROUP group, e.g. in their pyproject.toml:
+
+    [project.entry-points."hackathondb.scrapers"]
+    devpost = "devpost_scraper:DevpostScraper"
+
+Which ones run is set per environment: those listed for it in settings.SCRAPERS_ENABLED if there is an entry,
+else every scraper whose environments include it. A worker serving several databases (see scrape_worker.py) gets the
+scrapers of each one's environment.
+"""
+import importlib
+import logging
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from settings import settings
+
+if TYPE_CHECKING:
+    from scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "hackathondb.scrapers"
+ALL_ENVIRONMENTS = ("production", "staging", "test")
+
+
+@dataclass(frozen=True)
+class ScraperEntry:
+    name: str
+    target: str  # "module:factory"
+    environments: Tuple[str, ...] = ALL_ENVIRONMENTS  # Where it is enabled unless SCRAPERS_ENABLED says otherwise
+
+    def load(self) -> List["BaseScraper"]:
+        """Imports the target and calls it."""
+        module_name, _, attribute = self.target.partition(":")
+        factory = getattr(importlib.import_module(module_name), attribute)
+        scrapers = factory()
+        return scrapers if isinstance(scrapers, list) else [scrapers]
+
+
+BUILTIN_SCRAPERS = (
+    ScraperEntry("mlh", "scrapers.mlh_scraper:current_seasons_scrapers"),
+    # Demonstration/testing data, only runs when listed in SCRAPERS_ENABLED
+    ScraperEntry("mock", "scrapers.mock_scraper:MockScraper", environments=()),
+)
+
+
+def discover_scrapers() -> Dict[str, ScraperEntry]:
+    """The built-in scrapers and those of installed packages, by name. Nothing is imported."""
+    entries = {entry.name: entry for entry in BUILTIN_SCRAPERS}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name in entries:
+            logger.warning(f"Scraper entry point {entry_point.name} ({entry_point.value}) shadows a registered "
+                           f"scraper, ignoring it")
+            continue
+        entries[entry_point.name] = ScraperEntry(entry_point.name, entry_point.value)
+    return entries
+
+
+def enabled_scrapers(environment: Optional[str] = None,
+                     enabled: Optional[List[str]] = None) -> List[ScraperEntry]:
+    """
+    The scrapers to run.
+
+    Args:
+        environment: settings.ENVIRONMENT by default.
+        enabled: Names of the scrapers to run, settings.SCRAPERS_ENABLED[environment] by default. None: those
+            enabled for the environment.
+    """
+    environment = environment or settings.ENVIRONMENT
+    enabled = settings.SCRAPERS_ENABLED.get(environment) if enabled is None else enabled
+    entries = discover_scrapers()
+    if enabled is None:
+        return [entry for entry in entries.values() if environment in entry.environments]
+    unknown = [name for name in enabled if name not in entries]
+    if unknown:
+        logger.warning(f"Unknown scrapers in SCRAPERS_ENABLED: {unknown}, registered are {sorted(entries)}")
+    return [entries[name] for name in enabled if name in entries]
+
+
+def load_scrapers(entries: List[ScraperEntry]) -> List["BaseScraper"]:
+    """Imports and creates the scrapers. One that fails to load is logged and left out."""
+    scrapers = []
+    for entry in entries:
+        try:
+            scrapers.extend(entry.load())
+        except Exception as e:
+            logger.error(f"Failed to load scraper {entry.name} ({entry.target}): {e}", exc_info=True)
+    return scrapers
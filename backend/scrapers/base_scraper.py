@@ -1,13 +1,90 @@
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
 # Adjust import path based on your project structure and how you installed shared_models
 from shared_models.models import InboxItem
+from .http_cache import Page, fetch, get_http_cache
+from .http_client import HttpClient, get_http_client
+
+@dataclass
+class FetchMetrics:
+    """The fetches a scraper made through BaseScraper.fetch."""
+    requests: int = 0
+    errors: int = 0
+    bytes_downloaded: int = 0  # Response bodies, not counting 304 Not Modified
+    seconds: float = 0.0  # Including retries
+
+    def __add__(self, other: "FetchMetrics") -> "FetchMetrics":
+        return FetchMetrics(self.requests + other.requests, self.errors + other.errors,
+                            self.bytes_downloaded + other.bytes_downloaded, self.seconds + other.seconds)
+
+    def __sub__(self, other: "FetchMetrics") -> "FetchMetrics":
+        return FetchMetrics(self.requests - other.requests, self.errors - other.errors,
+                            self.bytes_downloaded - other.bytes_downloaded, self.seconds - other.seconds)
+
 
 class BaseScraper(ABC):
     """Abstract base class for all website scrapers."""
 
     # Class attribute to identify the scraper (optional but useful)
     SCRAPER_NAME = "base"
+    # Seconds the runner gives this scraper, settings.SCRAPER_TIMEOUT_SECONDS if None
+    TIMEOUT_SECONDS: Optional[float] = None
+    # Initial seconds between two scheduled runs, settings.SCRAPE_INTERVAL_SECONDS if None (see scrape_scheduler.py)
+    SCRAPE_INTERVAL_SECONDS: Optional[float] = None
+    # Set by the runner (see scraper_pool): page commits are collected here and only run once the items of the
+    # page are stored. None: Page.commit() writes to the HTTP cache right away.
+    pending_commits: Optional[List[Callable[[], None]]] = None
+
+    @property
+    def host(self) -> str:
+        """
+        The host the scraper fetches from. The runner limits how many scrapers of one host run at once
+        (see scraper_pool.HostLimiter). Taken from target_url if the scraper has one.
+        """
+        target_url = getattr(self, "target_url", None)
+        return (urlsplit(target_url).hostname if target_url else None) or self.SCRAPER_NAME
+
+    @property
+    def http(self) -> HttpClient:
+        """
+        The pooled HTTP client shared by all scrapers, with retries and per-host circuit breakers
+        (see scrapers/http_client.py). Use it for every request so connections are reused.
+        """
+        return get_http_client()
+
+    @property
+    def fetch_metrics(self) -> FetchMetrics:
+        """Totals of all fetch() calls of this scraper. The runner reports them per run (see scraper_pool)."""
+        if not hasattr(self, "_fetch_metrics"):
+            self._fetch_metrics = FetchMetrics()
+        return self._fetch_metrics
+
+    def fetch(self, url: str, **kwargs) -> Page:
+        """
+        GETs a page through the HTTP cache (see scrapers/http_cache.py). If page.unchanged, the page is the same as
+        at the last scrape and can be skipped; otherwise call page.commit() once all its items have been yielded.
+
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status.
+        """
+        metrics = self.fetch_metrics
+        started_at = time.monotonic()
+        try:
+            page = fetch(self.http, get_http_cache(), url, **kwargs)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.requests += 1
+            metrics.seconds += time.monotonic() - started_at
+        if page.status_code != 304:
+            metrics.bytes_downloaded += len(page.content)
+        if self.pending_commits is not None:
+            page.defer_commit_to(self.pending_commits)
+        return page
 
     @abstractmethod
     def scrape(self) -> List[InboxItem]:
@@ -18,4 +95,21 @@ class BaseScraper(ABC):
         """
         pass
 
+    def iter_items(self) -> Iterator[InboxItem]:
+        """
+        Yields the scraped InboxItems one by one, as soon as each of them is parsed.
+        The runner consumes this instead of scrape(), so items reach the inbox while a long scrape is still going.
+        The default just yields the items of scrape(); scrapers that fetch several pages should override it
+        (and implement scrape() as list(self.iter_items())).
+        """
+        yield from self.scrape()
+
+    def recording_kwargs(self) -> Dict[str, Any]:
+        """
+        The constructor arguments that create this scraper again with the same requests. Cassettes store them, so
+        a replay runs the scrapers that were recorded (see scrapers/http_replay.py). Override it if the constructor
+        takes arguments.
+        """
+        return {}
+
     # You could add common helper methods here if needed later
\ No newline at end of file
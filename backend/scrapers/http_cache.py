@@ -0,0 +1,173 @@
+"""
+Persistent HTTP cache for scraper fetches.
+
+Event listings rarely change between two scrapes, so the last body of every fetched URL is kept on disk with its
+ETag/Last-Modified. The next fetch is a conditional request: on 304 Not Modified, or a 200 with the same body
+(hash) for servers without validators, the Page is marked unchanged and the scraper skips parsing it and yields
+nothing, so the run costs one small request and no database work for that page.
+
+A new body is only written to the cache when the scraper calls Page.commit() after it yielded all items of the
+page, and in a scrape run only once those items are in the database (see Page.defer_commit_to). A scrape or an
+ingest that fails halfway leaves the old entry, so the next run sees the page as changed and retries it.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from settings import settings
+from .http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: Optional[str] = None
+
+
+class HttpCache:
+    """Body and validators of the last committed response per URL, two files per URL in directory."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}{suffix}"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # Write to a temp file and rename, so a crash or a concurrent reader never sees half a file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        try:
+            entry = CacheEntry(**json.loads(self._path(url, ".json").read_text()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable HTTP cache entry for {url}: {e}")
+            return None
+        return entry if entry.url == url and self._path(url, ".body").exists() else None
+
+    def body(self, url: str) -> bytes:
+        return self._path(url, ".body").read_bytes()
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> CacheEntry:
+        entry = CacheEntry(
+            url=url, body_hash=body_hash(body), etag=etag, last_modified=last_modified,
+            stored_at=datetime.now(timezone.utc).isoformat(),
+        )
+        # The body first: an entry is only valid once its metadata exists
+        self._write(self._path(url, ".body"), body)
+        self._write(self._path(url, ".json"), json.dumps(asdict(entry)).encode())
+        return entry
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass
+class Page:
+    """
+    A fetched page. unchanged is True if it is the same as the last committed fetch of the URL.
+    encoding is the charset of the response's Content-Type header, None if it has none (or the page came from the cache).
+    """
+    url: str
+    status_code: int
+    content: bytes
+    unchanged: bool
+    encoding: Optional[str] = None
+    _commit: Optional[Callable[[], None]] = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def commit(self) -> None:
+        """Marks the page as fully processed, so the next fetch of an identical page is skipped."""
+        if self._commit is not None:
+            self._commit()
+            self._commit = None
+
+    def defer_commit_to(self, pending: List[Callable[[], None]]) -> None:
+        """Makes commit() append the cache write to pending instead, for whoever stores the page's items."""
+        if self._commit is not None:
+            write = self._commit
+            self._commit = lambda: pending.append(write)
+
+
+def fetch(client: HttpClient, cache: Optional[HttpCache], url: str, **kwargs) -> Page:
+    """
+    GETs the URL with conditional request headers from the cache. Without a cache every page counts as changed.
+
+    Raises:
+        httpx.HTTPError: If the request fails or returns an error status.
+    """
+    entry = cache.get(url) if cache is not None else None
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    response = client.get(url, headers=headers, **kwargs)
+    if response.status_code == 304 and entry is not None:
+        return Page(url=url, status_code=304, content=cache.body(url), unchanged=True)
+    response.raise_for_status()
+
+    content = response.content
+    encoding = response.charset_encoding
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache is None:
+        return Page(url=url, status_code=response.status_code, content=content, unchanged=False, encoding=encoding)
+    if entry is not None and entry.body_hash == body_hash(content):
+        if (etag, last_modified) != (entry.etag, entry.last_modified):
+            cache.put(url, content, etag, last_modified)  # Same body, but validators for the next fetch
+        return Page(url=url, status_code=response.status_code, content=content, unchanged=True, encoding=encoding)
+    return Page(
+        url=url, status_code=response.status_code, content=content, unchanged=False, encoding=encoding,
+        _commit=lambda: cache.put(url, content, etag, last_modified),
+    )
+
+
+_shared_cache: Optional[HttpCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """
+    The cache of the current database, in a folder of settings.SCRAPER_HTTP_CACHE_DIR named after it. None if
+    that setting is empty (caching disabled).
+
+    A page is unchanged relative to what is stored in a database, so every database has its own cache: a page
+    committed while scraping into staging is new to production.
+    """
+    global _shared_cache
+    if not settings.SCRAPER_HTTP_CACHE_DIR:
+        return None
+    directory = Path(settings.SCRAPER_HTTP_CACHE_DIR) / settings.mongodb_database
+    with _shared_lock:
+        if _shared_cache is None or _shared_cache.directory != directory:
+            _shared_cache = HttpCache(directory)
+        return _shared_cache
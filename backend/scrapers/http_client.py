@@ -0,0 +1,189 @@
+"""
+Shared HTTP client for scrapers.
+
+All scrapers of a process share one pooled httpx.Client (see get_http_client), so consecutive requests to a host
+reuse keep-alive connections instead of paying the TCP/TLS setup every time. httpx.Client is thread safe, which
+the concurrent runner (scraper_pool.py) relies on.
+
+Requests failing with a transport error (connection, timeout) or a retryable status (429, 5xx) are retried with
+jittered exponential backoff. Every host has a circuit breaker: after SCRAPER_HTTP_CIRCUIT_FAILURES failures in a
+row its requests fail immediately with CircuitOpenError for SCRAPER_HTTP_CIRCUIT_RESET_SECONDS, then a single
+trial request decides whether it closes again. A site that is down so costs one quick error per request instead
+of the full retry schedule.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request to a host whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive failure counter of a host, open (rejecting requests) once it reaches failure_threshold."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if self.clock() - self.opened_at < self.reset_seconds else "half-open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent. Once the reset time has passed, one trial request is let through."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.clock() - self.opened_at < self.reset_seconds or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()  # Also re-opens it after a failed trial
+
+
+class HttpClient:
+    """
+    Pooled HTTP client with retries and per-host circuit breakers. The arguments default to the
+    SCRAPER_HTTP_* settings; transport and sleep are there for tests.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, max_connections: Optional[int] = None,
+                 max_keepalive_connections: Optional[int] = None, max_retries: Optional[int] = None,
+                 backoff: Optional[float] = None, backoff_max: Optional[float] = None,
+                 circuit_failures: Optional[int] = None, circuit_reset_seconds: Optional[float] = None,
+                 http2: Optional[bool] = None, headers: Optional[Dict[str, str]] = None,
+                 transport: Optional[httpx.BaseTransport] = None, sleep: Callable[[float], None] = time.sleep):
+        self.max_retries = settings.SCRAPER_HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.SCRAPER_HTTP_BACKOFF_SECONDS if backoff is None else backoff
+        self.backoff_max = settings.SCRAPER_HTTP_BACKOFF_MAX_SECONDS if backoff_max is None else backoff_max
+        self.circuit_failures = settings.SCRAPER_HTTP_CIRCUIT_FAILURES if circuit_failures is None else circuit_failures
+        self.circuit_reset_seconds = (settings.SCRAPER_HTTP_CIRCUIT_RESET_SECONDS
+                                      if circuit_reset_seconds is None else circuit_reset_seconds)
+        self._sleep = sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._client = httpx.Client(
+            timeout=settings.SCRAPER_HTTP_TIMEOUT_SECONDS if timeout is None else timeout,
+            limits=httpx.Limits(
+                max_connections=settings.SCRAPER_HTTP_MAX_CONNECTIONS if max_connections is None else max_connections,
+                max_keepalive_connections=(settings.SCRAPER_HTTP_MAX_KEEPALIVE_CONNECTIONS
+                                           if max_keepalive_connections is None else max_keepalive_connections),
+            ),
+            # Needs the h2 package (httpx[http2])
+            http2=settings.SCRAPER_HTTP2 if http2 is None else http2,
+            headers=headers,
+            transport=transport,
+            follow_redirects=True,
+        )
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.circuit_failures, self.circuit_reset_seconds)
+            return self._breakers[host]
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full jitter: a random delay up to backoff * 2^attempt, so scrapers that failed together don't retry together."""
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+    def _retry_after(self, response: httpx.Response) -> float:
+        try:
+            return min(self.backoff_max, float(response.headers.get("Retry-After", 0)))
+        except ValueError:
+            return 0.0  # An HTTP date, not worth parsing for a capped delay
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request with retries. Returns the response of the last attempt, which can still have a
+        retryable status; callers check it with raise_for_status() as usual.
+
+        Raises:
+            httpx.TransportError: If the last attempt failed without a response.
+            CircuitOpenError: If the host's circuit breaker is open.
+        """
+        host = httpx.URL(url).host
+        breaker = self.breaker(host)
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {host} after {breaker.failures} failed requests",
+                    request=self._client.build_request(method, url),
+                )
+            try:
+                response = self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"{method} {url} failed ({e!r}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()  # A 404 still means the host is up
+                    return response
+                breaker.record_failure()
+                if attempt == self.max_retries:
+                    return response
+                delay = max(self.backoff_delay(attempt), self._retry_after(response))
+                response.close()
+                logger.warning(f"{method} {url} returned {response.status_code}, "
+                               f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            self._sleep(delay)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """The process-wide client, created on first use."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
+
+
+def close_http_client() -> None:
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
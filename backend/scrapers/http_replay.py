@@ -0,0 +1,210 @@
+"""
+Record and replay of scraper HTTP traffic, for tests and benchmarks that run without the network.
+
+A cassette is a JSON file with the requests a scrape made and the responses it got, next to a folder with the
+response bodies, one file per response, so a changed page shows up as a readable diff. Cassettes of registered
+scrapers are named after their name in scraper_registry.py (see cassette_path):
+
+    fixtures/cassettes/mlh.json
+    fixtures/cassettes/mlh/0.html
+
+A cassette also lists the scrapers that made the requests, by class and constructor arguments (see
+BaseScraper.recording_kwargs), so a replay creates the same scrapers, whatever the day or settings.
+
+recording() and replaying() install an HttpClient with a RecordingTransport or ReplayTransport as the shared
+client of all scrapers (see http_client.get_http_client), so any scraper runs unchanged against live sites or
+against its cassette. Both disable the HTTP cache, so every page is fetched and parsed.
+"""
+import importlib
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from settings import settings
+from . import http_client
+from .base_scraper import BaseScraper
+from .http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the cassette format changes; older cassettes have to be recorded again
+CASSETTE_VERSION = 2
+# Response headers kept in cassettes. Others (Date, Set-Cookie, ...) change on every request and aren't used.
+RECORDED_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "retry-after", "location")
+_EXTENSIONS = {"text/html": ".html", "application/json": ".json", "text/plain": ".txt", "application/xml": ".xml"}
+
+
+class UnrecordedRequestError(httpx.TransportError):
+    """A replayed scrape made a request that isn't in its cassette. Scrapers see it like an unreachable host."""
+
+
+@dataclass
+class Interaction:
+    method: str
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content, request=request)
+
+
+@dataclass
+class RecordedScraper:
+    """A scraper of a recording: its class as "module:ClassName" and its recording_kwargs()."""
+    target: str
+    kwargs: Dict[str, Any]
+
+    @classmethod
+    def of(cls, scraper: BaseScraper) -> "RecordedScraper":
+        scraper_class = type(scraper)
+        return cls(f"{scraper_class.__module__}:{scraper_class.__qualname__}", scraper.recording_kwargs())
+
+    def create(self) -> BaseScraper:
+        module_name, _, attribute = self.target.partition(":")
+        return getattr(importlib.import_module(module_name), attribute)(**self.kwargs)
+
+
+@dataclass
+class Cassette:
+    interactions: List[Interaction] = field(default_factory=list)
+    recorded_at: Optional[str] = None
+    scrapers: List[RecordedScraper] = field(default_factory=list)
+
+    def create_scrapers(self) -> List[BaseScraper]:
+        """New instances of the recorded scrapers, to replay the cassette with."""
+        return [scraper.create() for scraper in self.scrapers]
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        """
+        Raises:
+            ValueError: If the cassette was recorded with another CASSETTE_VERSION.
+        """
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path} has cassette version {data.get('version')}, expected {CASSETTE_VERSION}. "
+                             f"Record it again.")
+        interactions = [
+            Interaction(entry["method"], entry["url"], entry["status_code"], entry["headers"],
+                        (path.parent / entry["body"]).read_bytes())
+            for entry in data["interactions"]
+        ]
+        scrapers = [RecordedScraper(entry["target"], entry["kwargs"]) for entry in data["scrapers"]]
+        return cls(interactions, data.get("recorded_at"), scrapers)
+
+    def save(self, path: Path) -> None:
+        """Writes the cassette to path and the bodies to a folder named like it, replacing earlier recordings."""
+        bodies = path.with_suffix("")
+        bodies.mkdir(parents=True, exist_ok=True)
+        for old in bodies.iterdir():
+            old.unlink()
+        entries = []
+        for index, interaction in enumerate(self.interactions):
+            content_type = interaction.headers.get("content-type", "").split(";")[0].strip()
+            body = bodies / f"{index}{_EXTENSIONS.get(content_type, '.bin')}"
+            body.write_bytes(interaction.content)
+            entries.append({
+                "method": interaction.method, "url": interaction.url, "status_code": interaction.status_code,
+                "headers": interaction.headers, "body": body.relative_to(path.parent).as_posix(),
+            })
+        data = {
+            "version": CASSETTE_VERSION, "recorded_at": self.recorded_at,
+            "scrapers": [{"target": scraper.target, "kwargs": scraper.kwargs} for scraper in self.scrapers],
+            "interactions": entries,
+        }
+        path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def cassette_path(directory: Path, name: str) -> Path:
+    """The cassette of the registered scraper name in directory."""
+    return Path(directory) / f"{name}.json"
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Sends requests over the network and appends every response to a cassette."""
+
+    def __init__(self, cassette: Cassette, transport: Optional[httpx.BaseTransport] = None):
+        self.cassette = cassette
+        self._transport = transport or httpx.HTTPTransport()
+        self._lock = threading.Lock()  # Scrapers fetch from several threads
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._transport.handle_request(request)
+        try:
+            content = response.read()  # Decoded, so Content-Encoding is not recorded
+        finally:
+            response.close()
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        interaction = Interaction(request.method, str(request.url), response.status_code, headers, content)
+        with self._lock:
+            self.cassette.interactions.append(interaction)
+        return interaction.to_response(request)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    Answers requests from a cassette, matched by method and URL. A URL requested several times gets its
+    recorded responses in order, and the last one again once they're used up.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self._responses: Dict[Tuple[str, str], List[Interaction]] = {}
+        for interaction in cassette.interactions:
+            self._responses.setdefault((interaction.method, interaction.url), []).append(interaction)
+        self._served: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = (request.method, str(request.url))
+        if key not in self._responses:
+            raise UnrecordedRequestError(f"{request.method} {request.url} is not in the cassette", request=request)
+        with self._lock:
+            recorded = self._responses[key]
+            index = min(self._served.get(key, 0), len(recorded) - 1)
+            self._served[key] = index + 1
+        return recorded[index].to_response(request)
+
+
+@contextmanager
+def _installed(transport: httpx.BaseTransport) -> Iterator[HttpClient]:
+    previous_client, previous_cache_dir = http_client._shared_client, settings.SCRAPER_HTTP_CACHE_DIR
+    client = HttpClient(transport=transport, max_retries=0)
+    http_client._shared_client = client
+    settings.SCRAPER_HTTP_CACHE_DIR = ""
+    try:
+        yield client
+    finally:
+        http_client._shared_client, settings.SCRAPER_HTTP_CACHE_DIR = previous_client, previous_cache_dir
+        client.close()
+
+
+@contextmanager
+def recording(path: Path, scrapers: Sequence[BaseScraper] = (),
+              transport: Optional[httpx.BaseTransport] = None) -> Iterator[Cassette]:
+    """Records the requests of all scrapers run inside the block to the cassette at path, along with the scrapers."""
+    cassette = Cassette(recorded_at=datetime.now(timezone.utc).isoformat(),
+                        scrapers=[RecordedScraper.of(scraper) for scraper in scrapers])
+    with _installed(RecordingTransport(cassette, transport)):
+        yield cassette
+    cassette.save(path)
+    logger.info(f"Recorded {len(cassette.interactions)} responses to {path}")
+
+
+@contextmanager
+def replaying(path: Path) -> Iterator[Cassette]:
+    """Answers the requests of all scrapers run inside the block from the cassette at path."""
+    cassette = Cassette.load(path)
+    with _installed(ReplayTransport(cassette)):
+        yield cassette
@@ -1,11 +1,14 @@
 from .base_scraper import BaseScraper
 from shared_models.models import InboxItem, DateRange
-from typing import List
-from bs4 import BeautifulSoup
-from datetime import datetime, timezone
-import requests
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+from bs4 import BeautifulSoup, UnicodeDammit
+from datetime import date, datetime, timezone
+from lxml import etree, html as lxml_html
+import httpx
 import logging
 
+from settings import settings
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -25,102 +28,220 @@ def create_daterange(start_str: str | None, end_str: str | None) -> DateRange |
         return None
 
 
+class MlhEventCard(NamedTuple):
+    """The raw fields of an event card on an MLH season page."""
+    name: Optional[str]
+    url: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    city: Optional[str]
+    state: Optional[str]
+    in_person: bool
+
+
+# --- Parsing engines ---
+# Each takes the page's bytes and the charset of its Content-Type header, if any, and returns the cards of the
+# "Upcoming Events" section, None if the page has none.
+# They must return identical cards, see tests/backend/test_mlh_parsing.py and benchmarks/bench_mlh_parsing.py.
+
+EVENT_CARD_SELECTOR = 'div.col-lg-3.col-md-4.col-sm-6'
+
+
+def decode_page(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    The page's text, decoded the same way for every engine: with the charset of the response if there is one,
+    else with the one the page declares, else with a detected one (UTF-8 before Windows-1252).
+    """
+    return UnicodeDammit(content, known_definite_encodings=[encoding] if encoding else []).unicode_markup
+
+
+def parse_cards_soup(content: bytes, encoding: Optional[str] = None) -> Optional[List[MlhEventCard]]:
+    """Reference engine: a full BeautifulSoup tree and CSS selectors."""
+    soup = BeautifulSoup(decode_page(content, encoding), 'lxml')
+
+    # --- Find upcoming events container ---
+    upcoming_events_container = None
+    section_containers = soup.find_all('div', class_='row')
+    for container in section_containers:
+         heading = container.find('h3', recursive=False)
+         if heading and 'Upcoming Events' in heading.get_text():
+              upcoming_events_container = container
+              break
+
+    if not upcoming_events_container:
+        return None
+
+    # --- Extract data using selectors based on the provided HTML ---
+    cards = []
+    for card in upcoming_events_container.select(EVENT_CARD_SELECTOR):
+        in_person_tag = card.select_one("div.event-hybrid-notes span")
+
+        name_tag = card.select_one('h3.event-name')
+        link_tag = card.select_one('a.event-link')
+        start_date_tag = card.select_one('meta[itemprop="startDate"]')
+        end_date_tag = card.select_one('meta[itemprop="endDate"]')
+        city_tag = card.select_one('span[itemprop="city"]')
+        state_tag = card.select_one('span[itemprop="state"]')
+
+        cards.append(MlhEventCard(
+            name=name_tag.get_text(strip=True) if name_tag else None,
+            url=link_tag['href'] if link_tag and link_tag.has_attr('href') else None,
+            start_date=start_date_tag['content'] if start_date_tag and start_date_tag.has_attr('content') else None,
+            end_date=end_date_tag['content'] if end_date_tag and end_date_tag.has_attr('content') else None,
+            city=city_tag.get_text(strip=True) if city_tag else None,
+            state=state_tag.get_text(strip=True) if state_tag else None,
+            in_person=bool(in_person_tag and "In-Person Only" in in_person_tag.get_text(strip=True)),
+        ))
+    return cards
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Compiled once; the same element lookups as the CSS selectors of parse_cards_soup
+_UPCOMING_CONTAINER = etree.XPath(f"(//div[{_has_class('row')}][h3[1][contains(., 'Upcoming Events')]])[1]")
+_EVENT_CARDS = etree.XPath(
+    f".//div[{_has_class('col-lg-3')} and {_has_class('col-md-4')} and {_has_class('col-sm-6')}]")
+_HYBRID_NOTES = etree.XPath(f"(.//div[{_has_class('event-hybrid-notes')}]//span)[1]")
+_NAME = etree.XPath(f"(.//h3[{_has_class('event-name')}])[1]")
+_LINK_HREF = etree.XPath(f"(.//a[{_has_class('event-link')}])[1]/@href")
+_START_DATE = etree.XPath("(.//meta[@itemprop='startDate'])[1]/@content")
+_END_DATE = etree.XPath("(.//meta[@itemprop='endDate'])[1]/@content")
+_CITY = etree.XPath("(.//span[@itemprop='city'])[1]")
+_STATE = etree.XPath("(.//span[@itemprop='state'])[1]")
+_TEXT = etree.XPath(".//text()")  # Text nodes only, like get_text() without comments
+
+
+def _stripped_text(elements: list) -> Optional[str]:
+    """Like BeautifulSoup's get_text(strip=True): every text node stripped, then joined without separator."""
+    if not elements:
+        return None
+    return "".join(text.strip() for text in _TEXT(elements[0]))
+
+
+def _first(values: list) -> Optional[str]:
+    return str(values[0]) if values else None
+
+
+def parse_cards_lxml(content: bytes, encoding: Optional[str] = None) -> Optional[List[MlhEventCard]]:
+    """Fast engine: lxml's tree with precompiled XPath, no BeautifulSoup objects or CSS selector matching."""
+    # Not the bytes: without a <meta charset> lxml would read them as Latin-1, whatever the response said
+    tree = lxml_html.fromstring(decode_page(content, encoding))
+    containers = _UPCOMING_CONTAINER(tree)
+    if not containers:
+        return None
+
+    cards = []
+    for card in _EVENT_CARDS(containers[0]):
+        notes = _stripped_text(_HYBRID_NOTES(card))
+        cards.append(MlhEventCard(
+            name=_stripped_text(_NAME(card)),
+            url=_first(_LINK_HREF(card)),
+            start_date=_first(_START_DATE(card)),
+            end_date=_first(_END_DATE(card)),
+            city=_stripped_text(_CITY(card)),
+            state=_stripped_text(_STATE(card)),
+            in_person=notes is not None and "In-Person Only" in notes,
+        ))
+    return cards
+
+
+PARSERS: Dict[str, Callable[[bytes, Optional[str]], Optional[List[MlhEventCard]]]] = {
+    "soup": parse_cards_soup,
+    "lxml": parse_cards_lxml,
+}
+
+
 class MlhScraper(BaseScraper):
     BASE_URL_TEMPLATE = "https://mlh.io/seasons/{year}/events"
     HEADERS = {
          'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
     }
-    def __init__(self, year: int):
+    def __init__(self, year: int, parser: str = "lxml"):
         """
         Initializes the scraper for a specific MLH season year.
 
         Args:
             year: The season year (e.g. 2025, 2026).
+            parser: The parsing engine, a key of PARSERS.
         """
         super().__init__() # Call parent __init__ if BaseScraper has one (currently doesn't, but good practice)
         if not isinstance(year, int) or year < 2000: # Basic validation
             raise ValueError("Invalid year provided for MLH Scraper")
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown MLH parser '{parser}', expected one of {sorted(PARSERS)}")
 
         self.year = year
+        self.parser = parser
         self.target_url = self.BASE_URL_TEMPLATE.format(year=self.year)
         self.SCRAPER_NAME = f"mlh_events_{self.year}_inperson"
         logger.info(f"Initialized MlhScraper for year {self.year} ({self.target_url})")
 
+    def recording_kwargs(self) -> Dict[str, Any]:
+        # Not the parser: a replay may compare engines on the same pages
+        return {"year": self.year}
+
 
     def scrape(self) -> List[InboxItem]:
+        return list(self.iter_items())
+
+    def iter_items(self) -> Iterator[InboxItem]:
         logger.info(f"Executing specific scrape logic for {self.SCRAPER_NAME}...")
-        scraped_items: List[InboxItem] = []
 
         try:
-            response = requests.get(self.target_url, headers=self.HEADERS, timeout=15)
-            logger.info(f"Status: {response.status_code}")
-            logger.info(f"First 1000 chars of response:{response.text[:1000]}")
-            response.raise_for_status() # Raise error if there is an HTTP error
-            soup = BeautifulSoup(response.content, 'lxml')
-            logger.info("  Successfully fetched and parsed MLH page.")
-        except requests.exceptions.RequestException as e:
+            page = self.fetch(self.target_url, headers=self.HEADERS) # Raises on an HTTP error
+            logger.info(f"Status: {page.status_code}")
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching {self.target_url}: {e}")
-            return []
-
-        # --- Find upcoming events container ---
-        upcoming_events_container = None
-        section_containers = soup.find_all('div', class_='row')
-        for container in section_containers:
-             heading = container.find('h3', recursive=False)
-             if heading and 'Upcoming Events' in heading.get_text():
-                  upcoming_events_container = container
-                  break
-
-        if not upcoming_events_container:
-            logger.warning("  Could not find MLH upcoming events container.")
-            return []
+            return
+        if page.unchanged:
+            # Same events as at the last scrape, which are all in the inbox already
+            logger.info(f"  {self.target_url} is unchanged since the last scrape, skipping it.")
+            return
+        logger.info(f"First 1000 chars of response:{page.text[:1000]}")
 
-        # --- Select and filter cards ---
-        event_card_selector = 'div.col-lg-3.col-md-4.col-sm-6'
-        all_upcoming_cards = upcoming_events_container.select(event_card_selector)
-        logger.info(f"  Found {len(all_upcoming_cards)} total upcoming cards. Filtering for in-person...")
+        cards = self.parse_cards(page.content, page.encoding)
+        if cards is None:
+            return  # Not committed: once the parser is fixed for the new layout, the same page is parsed again
+        item_count = 0
+        for item in self.items_from_cards(cards):
+            item_count += 1
+            yield item
 
-        in_person_cards = []
-        for card in all_upcoming_cards:
-             in_person_tag = card.select_one("div.event-hybrid-notes span")
-             if in_person_tag and "In-Person Only" in in_person_tag.get_text(strip=True):
-                  in_person_cards.append(card)
+        page.commit()
+        logger.info(f"  {self.SCRAPER_NAME} finished. Found {item_count} items.")
 
+    def parse_cards(self, content: bytes, encoding: Optional[str] = None) -> Optional[List[MlhEventCard]]:
+        """The upcoming event cards of a season page, None if it has no upcoming events section."""
+        cards = PARSERS[self.parser](content, encoding)
+        if cards is None:
+            logger.warning("  Could not find MLH upcoming events container.")
+        else:
+            logger.info(f"  Successfully parsed MLH page with the {self.parser} parser.")
+        return cards
+
+    def items_from_cards(self, cards: List[MlhEventCard]) -> Iterator[InboxItem]:
+        """Yields the in-person events among the cards as InboxItems."""
+        # --- Filter cards ---
+        logger.info(f"  Found {len(cards)} total upcoming cards. Filtering for in-person...")
+        in_person_cards = [card for card in cards if card.in_person]
         logger.info(f"  Found {len(in_person_cards)} in-person cards. Parsing...")
 
-        # --- Extract data using selectors based on the provided HTML ---
         for card in in_person_cards:
-            name_tag = card.select_one('h3.event-name')
-            name = name_tag.get_text(strip=True) if name_tag else None
-
-            link_tag = card.select_one('a.event-link')
-            hackathon_url = link_tag['href'] if link_tag and link_tag.has_attr('href') else None
-
-            start_date_tag = card.select_one('meta[itemprop="startDate"]')
-            start_date_str = start_date_tag['content'] if start_date_tag and start_date_tag.has_attr('content') else None
-
-            end_date_tag = card.select_one('meta[itemprop="endDate"]')
-            end_date_str = end_date_tag['content'] if end_date_tag and end_date_tag.has_attr('content') else None
-
-            city_tag = card.select_one('span[itemprop="city"]')
-            city = city_tag.get_text(strip=True) if city_tag else None
-
-            state_tag = card.select_one('span[itemprop="state"]')
-            state = state_tag.get_text(strip=True) if state_tag else None
-
             # Combine City and State for location string
-            location_parts = [part for part in [city, state] if part]
+            location_parts = [part for part in [card.city, card.state] if part]
             location = ", ".join(location_parts) if location_parts else None
 
             # --- Create DateRange object ---
-            date_range = create_daterange(start_date_str, end_date_str)
+            date_range = create_daterange(card.start_date, card.end_date)
 
             # --- Assemble data for InboxItem ---
             item_data = {
-                "name": name,
+                "name": card.name,
                 "date": date_range, # Use the Pydantic DateRange object
                 "location": location,
-                "url": hackathon_url, # This is the direct hackathon link
+                "url": card.url, # This is the direct hackathon link
                 "notes": None,
                 # Status isn't usually available on the list page
                 "source_url": self.target_url, # The page where we found this item
@@ -131,10 +252,21 @@ class MlhScraper(BaseScraper):
                 # Filter out None values *before* passing to Pydantic
                 valid_item_data = {k: v for k, v in item_data.items() if v is not None}
                 inbox_item = InboxItem(**valid_item_data)
-                scraped_items.append(inbox_item)
             except Exception as e:
-                logger.error(f"  Error creating InboxItem for {name}: {e}")
+                logger.error(f"  Error creating InboxItem for {card.name}: {e}")
                 logger.error(f"  Data: {valid_item_data}")
-                
-        logger.info(f"  {self.SCRAPER_NAME} finished. Found {len(scraped_items)} items.")
-        return scraped_items
+                continue
+            yield inbox_item
+
+
+def current_seasons_scrapers() -> List[MlhScraper]:
+    """
+    The scrapers registered as "mlh" (see scraper_registry.py), one per season in settings.MLH_SEASON_OFFSETS.
+
+    Seasons overlap the turn of the year (the 2026 season starts in the summer of 2025), so by default the current
+    and the next season are scraped. Each season is a scraper of its own, so the runner fetches them side by side
+    within the mlh.io limit of SCRAPER_HOST_CONCURRENCY_BY_HOST. An event listed in two seasons is only processed
+    once per run (see inbox_processor.process_scraped_items).
+    """
+    current_year = date.today().year
+    return [MlhScraper(year) for year in sorted({current_year + offset for offset in settings.MLH_SEASON_OFFSETS})]
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import Any, Dict, List
 
 from .base_scraper import BaseScraper
 from shared_models.models import InboxItem, DateRange
@@ -18,6 +18,9 @@ class MockScraper(BaseScraper):
         self.scenario = scenario
         print(f"Initialized MockScraper (Scenario: {self.scenario})")
 
+    def recording_kwargs(self) -> Dict[str, Any]:
+        return {"scenario": self.scenario}
+
     def scrape(self) -> List[InboxItem]:
         """
         Returns a hardcoded list of InboxItem objects based on the scenario.
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Security, Depends, HTTPException, BackgroundTasks
+from datetime import timedelta
+from fastapi import APIRouter, Security, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
+from pymongo.errors import DuplicateKeyError
 from settings import settings
-from database import get_db
-from run_scrapers import run_all_scrapes
-import time
-from datetime import datetime, timedelta
+from database import get_async_db
+from data_access import fail_stale_scrape_job, find_latest_scrape_job, find_scrape_runs, insert_scrape_job
+from scrape_jobs import MIN_SCRAPE_INTERVAL, as_utc, is_active, is_stale, job_status, new_job, utc_now
+from scrape_telemetry import summarize_runs
 import logging
 
 
@@ -16,67 +18,40 @@ def get_api_key(api_key: str = Security(api_key_scheme)):
         raise HTTPException(status_code=403, detail="Invalid API key")
     return api_key
 
-# Rate limiting setup
-last_scrape_time = None
-MIN_SCRAPE_INTERVAL = timedelta(seconds=30)  # Minimum time between scrapes
-
 logger = logging.getLogger(__name__)
 
 scraping_router = APIRouter()
 
-# Store the status of the last scraping job
-scraping_status = {
-    "is_running": False,
-    "last_run": None,
-    "last_status": None,
-    "items_collected": 0
-}
-
-def background_scraping():
-    """Background task to run the scraping process"""
-    global scraping_status
-    
-    try:
-        scraping_status["is_running"] = True
-        scraping_status["last_run"] = datetime.now().isoformat()
-        scraping_status["last_status"] = "running"
-        
-        # Run the scraping process
-        logger.info("Starting background scraping process")
-        run_all_scrapes()
-        
-        # Update status on completion
-        scraping_status["last_status"] = "completed"
-        logger.info("Background scraping process completed successfully")
-        
-    except Exception as e:
-        # Log any errors and update status
-        logger.error(f"Error in background scraping: {str(e)}", exc_info=True)
-        scraping_status["last_status"] = f"failed: {str(e)}"
-    
-    finally:
-        scraping_status["is_running"] = False
+
+def job_in_progress_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=409,
+        content={
+            "status": "error",
+            "message": "A scraping job is already in progress"
+        }
+    )
+
 
 @scraping_router.post("/trigger", dependencies=[Depends(get_api_key)])
-async def trigger_scrape(background_tasks: BackgroundTasks):
+async def trigger_scrape(db = Depends(get_async_db)):
     """
-    Trigger a new scraping run if rate limiting allows
+    Queue a new scraping job if rate limiting allows.
+    The job is run by a scrape worker process (scrape_worker.py), not by the API.
     """
-    global last_scrape_time
-    
+    latest_job = await find_latest_scrape_job(db)
+
     # Check if scraping is already running
-    if scraping_status["is_running"]:
-        return JSONResponse(
-            status_code=409,
-            content={
-                "status": "error",
-                "message": "A scraping job is already in progress"
-            }
+    if latest_job and is_active(latest_job):
+        return job_in_progress_response()
+    if latest_job and is_stale(latest_job):
+        # Its worker died; until another worker requeues it, it would block every trigger
+        if await fail_stale_scrape_job(db, latest_job["_id"]):
+            logger.warning(f"Failed scrape job {latest_job['_id']}, its worker stopped responding")
 
-        )
-    
     # Check rate limiting
-    current_time = datetime.now()
+    current_time = utc_now()
+    last_scrape_time = as_utc(latest_job["created_at"]) if latest_job else None
     if last_scrape_time and (current_time - last_scrape_time) < MIN_SCRAPE_INTERVAL:
         wait_time = (MIN_SCRAPE_INTERVAL - (current_time - last_scrape_time)).seconds
         return JSONResponse(
@@ -86,30 +61,41 @@ async def trigger_scrape(background_tasks: BackgroundTasks):
                 "message": f"Rate limit exceeded. Please wait {wait_time} seconds before triggering another scrape."
             }
         )
-    
-    # Update last scrape time and trigger background task
-    last_scrape_time = current_time
-    background_tasks.add_task(background_scraping)
-    
+
+    try:
+        job_id = await insert_scrape_job(db, new_job())
+    except DuplicateKeyError:
+        # Another trigger queued a job since we looked
+        return job_in_progress_response()
+    logger.info(f"Queued scrape job {job_id}")
+
     return JSONResponse(
         content={
             "status": "success",
-            "message": "Scraping initiated in background"
+            "message": "Scraping job queued",
+            "job_id": str(job_id)
         }
     )
 
 
 @scraping_router.get("/status", dependencies=[Depends(get_api_key)])
-async def get_scrape_status():
+async def get_scrape_status(db = Depends(get_async_db)):
     """
-    Get the current status of the scraping process
+    Get the status of the latest scraping job
     """
     return JSONResponse(content={
         "status": "success",
-        "data": {
-            "is_running": scraping_status["is_running"],
-            "last_run": scraping_status["last_run"],
-            "last_status": scraping_status["last_status"]
-        }
+        "data": job_status(await find_latest_scrape_job(db))
     })
 
+
+@scraping_router.get("/stats", dependencies=[Depends(get_api_key)])
+async def get_scrape_stats(days: int = Query(30, ge=1, le=365), db = Depends(get_async_db)):
+    """
+    Latency percentiles and daily trends per scraper over the scrape runs of the last days
+    """
+    runs = await find_scrape_runs(db, utc_now() - timedelta(days=days))
+    return JSONResponse(content={
+        "status": "success",
+        "data": {"days": days, **summarize_runs(runs)}
+    })
@@ -0,0 +1,221 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from shared_models import Hackathon
+
+logger = logging.getLogger(__name__)
+
+# Fields that are searched and how much a match in them is worth
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "city": 2.0,
+    "country": 1.0,
+}
+# A token that only starts with the query token (typeahead) is worth less than a whole word match
+PREFIX_MATCH_FACTOR = 0.6
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercases, strips accents ("Zürich" -> "zurich") and splits text into words."""
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text.casefold())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(normalized)
+
+
+@dataclass(frozen=True)
+class _IndexData:
+    tokens: List[str] = field(default_factory=list)  # Sorted
+    # token -> [(doc number, weight)], best weight first, then earliest start date
+    postings: Dict[str, List[Tuple[int, float]]] = field(default_factory=dict)
+    # Number of postings of all tokens before tokens[i], to estimate how many documents a prefix matches in O(1)
+    cumulative_counts: List[int] = field(default_factory=lambda: [0])
+    doc_tokens: List[Dict[str, float]] = field(default_factory=list)  # doc number -> {token: weight}
+    docs: List[Dict[str, Any]] = field(default_factory=list)  # Serialized hackathons, position is the doc number
+    start_dates: List[datetime] = field(default_factory=list)
+
+
+class HackathonSearchIndex:
+    """
+    In-memory inverted index over hackathon name, city and country with prefix matching.
+
+    Tokens are kept in a sorted list, so all tokens starting with a prefix are found with two binary searches.
+    Postings are sorted by score, which lets a search stop as soon as no remaining document can make it into
+    the top results, so common prefixes like "h" cost about as much as rare ones.
+
+    The index is rebuilt from MongoDB whenever the hackathons collection version changes, which keeps it in
+    sync with every write path that bumps the version (see database.bump_collection_version).
+    """
+
+    def __init__(self):
+        self.version: Optional[Hashable] = None
+        # Replaced as a whole on rebuild, so searches running meanwhile always see a consistent index
+        self._data = _IndexData()
+        self._lock = asyncio.Lock()
+
+    def build(self, raw_docs: Iterable[Dict[str, Any]], version: Hashable) -> None:
+        """Indexes raw hackathon documents. Documents that aren't valid Hackathons are left out."""
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        doc_tokens = []
+        docs = []
+        start_dates = []
+        hackathons = (h for h in (Hackathon.safe_from_mongo(doc) for doc in raw_docs) if h is not None)
+        for doc_number, hackathon in enumerate(hackathons):
+            fields = {
+                "name": hackathon.name,
+                "city": hackathon.location.city,
+                "country": hackathon.location.country,
+            }
+            token_weights: Dict[str, float] = {}
+            for field_name, text in fields.items():
+                for token in tokenize(text):
+                    # A token counts once per document, with the weight of the best field it appears in
+                    token_weights[token] = max(token_weights.get(token, 0), FIELD_WEIGHTS[field_name])
+            for token, weight in token_weights.items():
+                postings[token][doc_number] = weight
+            doc_tokens.append(token_weights)
+            docs.append(hackathon.model_dump(mode="json", by_alias=True))
+            start_date = hackathon.date.start_date
+            start_dates.append(start_date if start_date.tzinfo else start_date.replace(tzinfo=timezone.utc))
+
+        tokens = sorted(postings)
+        sorted_postings = {
+            token: sorted(postings[token].items(), key=lambda p: (-p[1], start_dates[p[0]]))
+            for token in tokens
+        }
+        cumulative_counts = [0]
+        for token in tokens:
+            cumulative_counts.append(cumulative_counts[-1] + len(sorted_postings[token]))
+
+        self._data = _IndexData(
+            tokens=tokens,
+            postings=sorted_postings,
+            cumulative_counts=cumulative_counts,
+            doc_tokens=doc_tokens,
+            docs=docs,
+            start_dates=start_dates,
+        )
+        self.version = version
+
+    async def ensure_current(self, load_docs, version: Hashable) -> None:
+        """
+        Rebuilds the index if it was built for another collection version.
+
+        Args:
+            load_docs: Coroutine function returning every raw hackathon document to index.
+            version: Collection version the caller saw. Any hashable that changes with every write.
+        """
+        if self.version == version:
+            return
+        async with self._lock:
+            if self.version == version:
+                return  # Another request rebuilt it while we were waiting
+            raw_docs = await load_docs()
+            # Validating and indexing is CPU bound, keep it off the event loop
+            await asyncio.to_thread(self.build, raw_docs, version)
+            logger.info(f"Rebuilt search index for version {version}: "
+                        f"{len(self._data.docs)} hackathons, {len(self._data.tokens)} tokens")
+
+    @staticmethod
+    def _prefix_range(data: _IndexData, prefix: str) -> Tuple[int, int]:
+        """Positions [start, end) of the tokens starting with prefix."""
+        start = bisect.bisect_left(data.tokens, prefix)
+        end = bisect.bisect_left(data.tokens, prefix + "\U0010ffff")
+        return start, end
+
+    @staticmethod
+    def _token_score(token: str, query_token: str, weight: float) -> float:
+        return weight * (1.0 if token == query_token else PREFIX_MATCH_FACTOR)
+
+    def _iter_prefix(self, data: _IndexData, query_token: str) -> Iterator[Tuple[float, int]]:
+        """Yields (score, doc number) of every document matching query_token, best score (then earliest) first."""
+        def stream(token: str):
+            for doc, weight in data.postings[token]:
+                yield (-self._token_score(token, query_token, weight), data.start_dates[doc]), doc
+
+        start, end = self._prefix_range(data, query_token)
+        for (negative_score, _), doc in heapq.merge(*(stream(token) for token in data.tokens[start:end])):
+            yield -negative_score, doc
+
+    def _doc_score(self, data: _IndexData, doc: int, query_token: str) -> float:
+        """Best score of query_token in one document, 0 if none of its tokens start with it."""
+        best = 0.0
+        for token, weight in data.doc_tokens[doc].items():
+            if token.startswith(query_token):
+                best = max(best, self._token_score(token, query_token, weight))
+        return best
+
+    def _max_score(self, data: _IndexData, query_token: str) -> float:
+        """Highest score query_token reaches in any document."""
+        start, end = self._prefix_range(data, query_token)
+        return max(
+            (self._token_score(token, query_token, data.postings[token][0][1]) for token in data.tokens[start:end]),
+            default=0.0,
+        )
+
+    def search(self, query: str, limit: int, start_from: Optional[datetime] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Returns up to limit (score, serialized hackathon) pairs, best match first.
+        Every query word has to match (as a whole word or a prefix) in one of the indexed fields.
+        Ties are broken by start date, so sooner hackathons come first.
+        """
+        data = self._data
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+
+        # Walk the postings of the most selective query word, the others are checked per candidate
+        def match_count(query_token: str) -> int:
+            start, end = self._prefix_range(data, query_token)
+            return data.cumulative_counts[end] - data.cumulative_counts[start]
+
+        query_tokens.sort(key=match_count)
+        lead, rest = query_tokens[0], query_tokens[1:]
+        max_rest_score = sum(self._max_score(data, query_token) for query_token in rest)
+
+        worst_kept: List[Tuple[float, float]] = []  # Min-heap of (score, -start timestamp) of the best results so far
+        results = []
+        seen = set()
+        for lead_score, doc in self._iter_prefix(data, lead):
+            if doc in seen:
+                continue  # Matched by another token with the same prefix, the first match had the better score
+            seen.add(doc)
+            start_date = data.start_dates[doc]
+            if len(worst_kept) == limit:
+                # Nothing from here on can beat the worst result we keep: candidates come by descending lead score,
+                # and within the same lead score by start date, so a tie on score would lose on start date as well.
+                bound = round(lead_score + max_rest_score, 6)
+                worst_score, worst_negative_timestamp = worst_kept[0]
+                if bound < worst_score or (bound == worst_score and start_date.timestamp() >= -worst_negative_timestamp):
+                    break
+            if start_from is not None and start_date < start_from:
+                continue
+
+            score = lead_score
+            for query_token in rest:
+                token_score = self._doc_score(data, doc, query_token)
+                if token_score == 0:
+                    break
+                score += token_score
+            else:
+                score = round(score, 6)  # Keeps sums comparable with the bound above
+                results.append((score, start_date, doc))
+                entry = (score, -start_date.timestamp())
+                if len(worst_kept) < limit:
+                    heapq.heappush(worst_kept, entry)
+                elif entry > worst_kept[0]:
+                    heapq.heapreplace(worst_kept, entry)
+
+        ranked = heapq.nsmallest(limit, results, key=lambda r: (-r[0], r[1]))
+        return [(score, data.docs[doc]) for score, _, doc in ranked]
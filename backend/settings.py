@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Literal
+from typing import Dict, List, Literal, Optional
 from pathlib import Path
 import os
 
@@ -10,6 +10,43 @@ class Settings(BaseSettings):
     ENVIRONMENT: Literal["production", "staging", "test"] 
     MONGODB_URI: str
     ADMIN_API_KEY: str
+    # MongoDB connection pool, see https://pymongo.readthedocs.io/en/stable/api/pymongo/mongo_client.html
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 5000
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = None
+    PUBLIC_CACHE_MAX_AGE: int = 0  # Seconds browsers/CDNs may reuse /api responses before revalidating them
+    LISTING_SNAPSHOT_MAX_BYTES: int = 32 * 1024 * 1024  # Memory for pre-serialized listing responses, 0 disables them
+    # Scraper runs, see scraper_pool.py
+    SCRAPER_MAX_WORKERS: int = 4  # Scrapers running at the same time
+    SCRAPER_HOST_CONCURRENCY: int = 1  # Scrapers of the same host running at the same time
+    # SCRAPER_HOST_CONCURRENCY per host. mlh.io serves a page per season, which are scraped at the same time.
+    SCRAPER_HOST_CONCURRENCY_BY_HOST: Dict[str, int] = {"mlh.io": 2}
+    SCRAPER_HOST_DELAY_SECONDS: float = 1.0  # Minimum time between the starts of two scrapers of the same host
+    SCRAPER_TIMEOUT_SECONDS: float = 300.0  # Per scraper, unless it sets TIMEOUT_SECONDS
+    # Names in scraper_registry.py to run, per environment. Environments not listed run their defaults.
+    SCRAPERS_ENABLED: Dict[str, List[str]] = {}
+    MLH_SEASON_OFFSETS: List[int] = [0, 1]  # MLH seasons to scrape, relative to the current year
+    # Periodic scrapes, see scrape_scheduler.py
+    SCRAPE_SCHEDULER_ENABLED: bool = True
+    SCRAPE_INTERVAL_SECONDS: float = 6 * 3600.0  # Initial interval, unless the scraper sets SCRAPE_INTERVAL_SECONDS
+    SCRAPE_INTERVAL_MIN_SECONDS: float = 3600.0
+    SCRAPE_INTERVAL_MAX_SECONDS: float = 3 * 24 * 3600.0
+    SCRAPE_INTERVAL_JITTER: float = 0.1  # Next runs are spread by +-10% of the interval
+    # Scraper HTTP client, see scrapers/http_client.py
+    SCRAPER_HTTP_TIMEOUT_SECONDS: float = 15.0
+    SCRAPER_HTTP_MAX_CONNECTIONS: int = 20
+    SCRAPER_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    SCRAPER_HTTP2: bool = False  # Needs httpx[http2]
+    SCRAPER_HTTP_MAX_RETRIES: int = 3
+    SCRAPER_HTTP_BACKOFF_SECONDS: float = 0.5  # Upper bound of the first retry's delay, doubled per retry
+    SCRAPER_HTTP_BACKOFF_MAX_SECONDS: float = 10.0
+    SCRAPER_HTTP_CIRCUIT_FAILURES: int = 5  # Failed requests in a row that open a host's circuit breaker
+    SCRAPER_HTTP_CIRCUIT_RESET_SECONDS: float = 60.0
+    SCRAPER_HTTP_CACHE_DIR: str = str(Path(__file__).parent / ".cache" / "http")  # Empty disables the cache
     
     @property
     def is_production(self) -> bool:
@@ -22,13 +59,22 @@ class Settings(BaseSettings):
     
     @property
     def mongodb_database(self) -> str:
+        return self.database_for(self.ENVIRONMENT)
+
+    def database_for(self, environment: str) -> str:
+        """The database of an environment, the test database for all of them while testing."""
         if self.is_testing:
             return "hackathons_pytest"
-        elif self.is_production:
+        elif environment == "production":
             return "hackathons_prod"
         else:
             return "hackathons_test_1"
 
+    @property
+    def environment_databases(self) -> List[str]:
+        """The databases /set-environment can switch between, so every one of them has to be set up."""
+        return sorted({self.database_for(environment) for environment in ("production", "staging")})
+
     def update_environment(self, new_environment: Literal["production", "staging"]) -> None:
         """
         Update the environment setting.
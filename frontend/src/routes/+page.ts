@@ -2,11 +2,22 @@ import type { Load } from '@sveltejs/kit';
 
 export const load: Load = async ({ fetch }) => {
     try{
-    const res = await fetch(`${import.meta.env.VITE_API_URL}/hackathons`);
-    if (!res.ok) {
-        throw new Error('Failed to fetch hackathons');
-    }
-    const hackathons = await res.json();
+    // The API is paginated, follow next_cursor until we have every upcoming hackathon
+    const hackathons = [];
+    let cursor: string | null = null;
+    do {
+        const params = new URLSearchParams({ limit: '500' });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        const res = await fetch(`${import.meta.env.VITE_API_URL}/hackathons?${params}`);
+        if (!res.ok) {
+            throw new Error('Failed to fetch hackathons');
+        }
+        const page = await res.json();
+        hackathons.push(...page.data);
+        cursor = page.next_cursor;
+    } while (cursor);
     return { hackathons };
     }
     catch (error) {
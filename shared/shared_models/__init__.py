@@ -13,8 +13,11 @@ from .models import (
     HackathonBase,
     Hackathon,
     InboxItem,
-    InboxStatus
+    InboxStatus,
+    DuplicateMatch,
+    ContentChange
 )
+from .urls import canonicalize_url
 
 # Define what's available when using `from shared_models import *`
 __all__ = [
@@ -27,5 +30,8 @@ __all__ = [
     "HackathonBase",
     "Hackathon",
     "InboxItem",
-    "InboxStatus"
+    "InboxStatus",
+    "DuplicateMatch",
+    "ContentChange",
+    "canonicalize_url"
 ]
\ No newline at end of file
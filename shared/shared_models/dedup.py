@@ -0,0 +1,96 @@
+"""
+Blocking keys for fuzzy duplicate detection.
+
+Comparing every scraped item against every stored hackathon doesn't scale, so records are put into blocks and only
+records sharing a block are compared. A block combines the start week with one band of a MinHash signature of the
+name: records with similar names (by character trigram Jaccard similarity) very likely share at least one band,
+records with unrelated names very likely share none.
+
+The keys are stored on inbox items and hackathons as dedup_blocks (multikey index), so candidates for a batch of
+scraped items are found with a single $in query. They have to be deterministic across processes, which is why
+blake2b is used instead of the builtin hash().
+"""
+import hashlib
+import random
+import re
+import unicodedata
+from datetime import datetime
+from typing import List, Optional, Set
+
+# Words that don't tell events apart. Years are dropped as well, the start week takes care of editions.
+NAME_STOPWORDS = frozenset({"hackathon", "hackathons", "the", "annual", "edition", "official"})
+_YEAR_RE = re.compile(r"(19|20)\d\d")
+_TOKEN_RE = re.compile(r"\w+")
+
+SHINGLE_SIZE = 3
+# 8 bands of 2 rows: names with a trigram similarity of 0.5 share a band with a probability of 90%, 0.7 with 99.6%
+NUM_BANDS = 8
+ROWS_PER_BAND = 2
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240501)  # Fixed seed: stored keys have to stay valid between releases
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase, accent-free name without spaces, stop words and years ("HackZürich 2025" -> "hackzurich")."""
+    if not name:
+        return ""
+    normalized = unicodedata.normalize("NFKD", name.casefold())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    tokens = [t for t in _TOKEN_RE.findall(normalized) if t not in NAME_STOPWORDS and not _YEAR_RE.fullmatch(t)]
+    return "".join(tokens)
+
+
+def name_shingles(name: Optional[str]) -> Set[str]:
+    """Character trigrams of the normalized name. Spaces are removed, so "Hack Zurich" and "HackZurich" are equal."""
+    normalized = normalize_name(name)
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def minhash_signature(shingles: Set[str]) -> List[int]:
+    hashes = [_hash64(s) for s in shingles]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def name_bands(name: Optional[str]) -> List[str]:
+    """One short hash per LSH band of the name's MinHash signature. Empty for names without shingles."""
+    shingles = name_shingles(name)
+    if not shingles:
+        return []
+    signature = minhash_signature(shingles)
+    bands = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(",".join(map(str, rows)).encode(), digest_size=5).hexdigest()
+        bands.append(f"{band}:{digest}")
+    return bands
+
+
+def start_week(start_date: datetime) -> int:
+    """Number of the week the date falls into, counted from year 1. Neighbouring weeks differ by one."""
+    return start_date.toordinal() // 7
+
+
+def dedup_blocks(name: Optional[str], start_date: Optional[datetime]) -> List[str]:
+    """Blocks a record is stored under. Records without a start date or a usable name aren't blocked."""
+    if start_date is None:
+        return []
+    week = start_week(start_date)
+    return [f"{week}:{band}" for band in name_bands(name)]
+
+
+def candidate_blocks(name: Optional[str], start_date: Optional[datetime], week_tolerance: int = 1) -> List[str]:
+    """Blocks to look up for a record, including neighbouring weeks so shifted dates still find each other."""
+    if start_date is None:
+        return []
+    week = start_week(start_date)
+    bands = name_bands(name)
+    return [f"{w}:{band}" for w in range(week - week_tolerance, week + week_tolerance + 1) for band in bands]
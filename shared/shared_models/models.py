@@ -1,8 +1,13 @@
-from pydantic import BaseModel, EmailStr, Field, field_serializer, SerializationInfo, field_validator, HttpUrl, BeforeValidator
+from pydantic import BaseModel, EmailStr, Field, field_serializer, SerializationInfo, field_validator, model_validator, HttpUrl, BeforeValidator
 from enum import Enum
-from typing import Optional, Dict, Any, Annotated
+from typing import Optional, Dict, Any, Annotated, List
 from datetime import datetime, timezone
 from bson import ObjectId
+import hashlib
+import json
+
+from .dedup import dedup_blocks
+from .urls import canonicalize_url
 
 """
 Database structure:
@@ -20,7 +25,10 @@ location
   coordinates
       lat
       long
+  geo (GeoJSON point of the coordinates, written by to_mongo for the 2dsphere index)
 url
+url_key (canonical form of the url used for duplicate detection, see urls.canonicalize_url)
+dedup_blocks (blocking keys for fuzzy duplicate detection, see dedup.dedup_blocks)
 Notes
 status
 created_at
@@ -41,8 +49,13 @@ class HackathonSubmission(BaseModel):
 
 
 class Coordinates(BaseModel):
-    lat: float
-    long: float
+    # Out of range values would be rejected by the 2dsphere index on location.geo
+    lat: float = Field(ge=-90, le=90)
+    long: float = Field(ge=-180, le=180)
+
+    def to_geojson(self) -> Dict[str, Any]:
+        """GeoJSON point as MongoDB's 2dsphere index expects it. Note that GeoJSON is [longitude, latitude]."""
+        return {"type": "Point", "coordinates": [self.long, self.lat]}
 
 
 class Location(BaseModel):
@@ -95,6 +108,38 @@ class HackathonBase(BaseModel):
         return v
 
 
+class DuplicateMatch(BaseModel):
+    """A stored record that a scraped item is probably a duplicate of, found by fuzzy matching."""
+    collection: str  # "hackathons" or "inbox"
+    id: PyObjectId
+    name: Optional[str] = None
+    score: float  # 0 to 1, see backend/fuzzy_dedup.py
+
+
+class ContentChange(BaseModel):
+    """One re-scrape that changed an inbox item: field -> {"old": ..., "new": ...} in normalized form."""
+    at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    scraper_name: Optional[str] = None
+    changes: Dict[str, Dict[str, Any]]
+
+
+# Scraped fields that make up an inbox item's content, see InboxItem.content_hash
+INBOX_CONTENT_FIELDS = ("name", "date", "location", "url", "notes", "status")
+
+
+def _normalize_content(value: Any) -> Any:
+    """JSON-compatible form that doesn't depend on how the value was stored (e.g. MongoDB drops the timezone)."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {k: _normalize_content(v) for k, v in value.items()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
 class InboxItem(BaseModel):
     id: Optional[PyObjectId] = Field(None, alias="_id") # MongoDB ID
 
@@ -103,6 +148,8 @@ class InboxItem(BaseModel):
     date: Optional[DateRange] = None
     location: Optional[str] = None  # Store as simple string for inbox
     url: Optional[str] = None
+    url_key: Optional[str] = None  # Derived from url, unique in the inbox collection
+    dedup_blocks: Optional[List[str]] = None  # Derived from name and start date
     notes: Optional[str] = None
     status: Optional[HackathonStatus] = None
 
@@ -111,6 +158,15 @@ class InboxItem(BaseModel):
     scraper_name: Optional[str] = None
     scraped_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     review_status: InboxStatus = Field(default=InboxStatus.PENDING)
+    # Set when the item looks like an event we already know under another URL, for the reviewer to check
+    possible_duplicate: Optional[DuplicateMatch] = None
+    # Hash of the scraped content, lets re-scrapes detect changes without comparing fields (see content_hash)
+    content_hash: Optional[str] = None
+    content_updated_at: Optional[datetime] = None
+    change_log: List[ContentChange] = Field(default_factory=list)  # Most recent last, capped by the inbox processor
+    # Set when a re-scrape changed an item that was already approved or rejected: the published hackathon may be
+    # out of date. Cleared by the reviewer (admin /inbox/reviewed).
+    needs_review: bool = False
 
     model_config = {
         "populate_by_name": True,
@@ -118,6 +174,24 @@ class InboxItem(BaseModel):
         "use_enum_values": True,
     }
 
+    @model_validator(mode='after')
+    def derive_dedup_keys(self) -> "InboxItem":
+        if self.url_key is None:
+            self.url_key = canonicalize_url(self.url)
+        if self.dedup_blocks is None:
+            self.dedup_blocks = dedup_blocks(self.name, self.date.start_date if self.date else None)
+        return self
+
+    def content(self) -> Dict[str, Any]:
+        """The scraped fields in normalized form, see INBOX_CONTENT_FIELDS."""
+        dumped = self.model_dump(mode='python', include=set(INBOX_CONTENT_FIELDS))
+        return {field: _normalize_content(dumped.get(field)) for field in INBOX_CONTENT_FIELDS}
+
+    def compute_content_hash(self) -> str:
+        """Stable hash of content(), equal for equal content no matter in which process or order it was built."""
+        serialized = json.dumps(self.content(), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
 
 class Hackathon(HackathonBase):
     id: Optional[PyObjectId] = Field(None, alias="_id")
@@ -143,6 +217,11 @@ class Hackathon(HackathonBase):
     def to_mongo(self) -> Dict[str, Any]:
         # Convert to dict that MongoDB can store
         data = self.model_dump(by_alias=True, exclude={"id"}, mode='python')
+        # Stored next to the coordinates for the 2dsphere index, not part of the model
+        data["location"]["geo"] = self.location.coordinates.to_geojson()
+        # Stored for duplicate detection against scraped items, not part of the model
+        data["url_key"] = canonicalize_url(str(self.url))
+        data["dedup_blocks"] = dedup_blocks(self.name, self.date.start_date)
         if self.id:
             data["_id"] = self.id
         return data
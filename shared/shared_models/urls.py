@@ -0,0 +1,55 @@
+"""URL normalization used to recognize the same hackathon under different spellings of its URL."""
+import re
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Query parameters that only track where a visitor came from and never change the page
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid", "_hsenc", "_hsmi",
+})
+TRACKING_PARAM_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {80, 443}
+
+_REPEATED_SLASHES = re.compile(r"/{2,}")
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Returns a key that is equal for URLs pointing to the same page, e.g.
+    "HTTP://www.Example.com/Event/?utm_source=x&b=2&a=1" -> "example.com/event?a=1&b=2".
+
+    Scheme, "www.", default ports, fragments, tracking parameters, trailing and repeated slashes and
+    case are ignored, the remaining query parameters are sorted. The key is meant for comparing, not for
+    opening: it has no scheme and paths are lowercased even though servers may treat them case-sensitively.
+    Returns None for empty input.
+    """
+    if url is None or not url.strip():
+        return None
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+
+    host = (parts.hostname or "").rstrip(".")  # hostname is lowercased and has no credentials or port
+    if host.startswith("www."):
+        host = host[len("www."):]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None  # Invalid port, don't let it make an otherwise identical URL look different
+    if port is not None and port not in DEFAULT_PORTS:
+        host = f"{host}:{port}"
+
+    path = _REPEATED_SLASHES.sub("/", parts.path).rstrip("/")
+    params = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+    query = f"?{urlencode(params)}" if params else ""
+    return f"{host}{path}{query}".lower()
@@ -9,6 +9,11 @@ tell application "Terminal"
     -- Execute first command in the current tab
     do script "cd $CURRENT_PATH/backend && source .venv/bin/activate && pip install -e ../shared && python main.py" in front window
     
+    -- Create a new tab for the scrape worker
+    tell application "System Events" to tell process "Terminal" to keystroke "t" using command down
+    delay 0.5
+    do script "cd $CURRENT_PATH/backend && source .venv/bin/activate && python scrape_worker.py" in front window
+    
     -- Create a new tab for the admin service
     tell application "System Events" to tell process "Terminal" to keystroke "t" using command down
     delay 0.5
@@ -0,0 +1,22 @@
+from contextlib import ExitStack
+from pathlib import Path
+
+import pytest
+
+from scrapers.http_replay import cassette_path, replaying
+
+CASSETTES = Path(__file__).parent / "fixtures" / "cassettes"
+
+
+@pytest.fixture
+def recorded():
+    """
+    recorded(name) replays the cassette of the registered scraper name, as written by
+    benchmarks/record_scraper_fixtures.py, and returns it with new instances of the scrapers it recorded.
+    """
+    with ExitStack() as stack:
+        def replay(name: str):
+            cassette = stack.enter_context(replaying(cassette_path(CASSETTES, name)))
+            return cassette, cassette.create_scrapers()
+
+        yield replay
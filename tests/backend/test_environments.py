@@ -0,0 +1,32 @@
+from scrape_worker import running_as, served_environments
+from scraper_registry import enabled_scrapers
+from settings import settings
+
+
+def test_both_environment_databases_are_set_up(monkeypatch):
+    monkeypatch.setenv("PYTEST_RUNNING", "0")
+    monkeypatch.setattr(settings, "ENVIRONMENT", "staging")
+
+    assert settings.mongodb_database == "hackathons_test_1"
+    assert settings.environment_databases == ["hackathons_prod", "hackathons_test_1"]
+
+
+def test_worker_serves_both_environment_databases(monkeypatch):
+    monkeypatch.setenv("PYTEST_RUNNING", "0")
+    monkeypatch.setattr(settings, "ENVIRONMENT", "staging")
+
+    assert served_environments() == {"hackathons_test_1": "staging", "hackathons_prod": "production"}
+    monkeypatch.setattr(settings, "ENVIRONMENT", "test")
+    assert served_environments() == {"hackathons_pytest": "test"}
+
+
+def test_worker_runs_the_scrapers_of_each_environment(monkeypatch):
+    monkeypatch.setenv("PYTEST_RUNNING", "0")
+    monkeypatch.setattr(settings, "ENVIRONMENT", "staging")
+    monkeypatch.setattr(settings, "SCRAPERS_ENABLED", {"staging": ["mock"]})
+
+    enabled = {}
+    for database, environment in served_environments().items():
+        with running_as(environment):
+            enabled[database] = [entry.name for entry in enabled_scrapers()]
+    assert enabled == {"hackathons_test_1": ["mock"], "hackathons_prod": ["mlh"]}
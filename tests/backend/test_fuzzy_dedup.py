@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from backend.fuzzy_dedup import MatchRecord, best_match, match_score, FUZZY_MATCH_THRESHOLD
+from shared_models.models import InboxItem, DateRange
+
+
+def hackathon_doc(name: str, start: datetime, end: datetime, city: str, country: str) -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": name,
+        "date": {"start_date": start, "end_date": end},
+        "location": {"city": city, "state": None, "country": country},
+        "url_key": f"{name.lower().replace(' ', '')}.example.com",
+    }
+
+
+def scraped(name: str, start: datetime, end: datetime, location: str, url: str) -> MatchRecord:
+    item = InboxItem(name=name, date=DateRange(start_date=start, end_date=end), location=location, url=url)
+    return MatchRecord.from_inbox_item(item)
+
+
+def test_same_event_from_another_source_matches():
+    stored = MatchRecord.from_doc("hackathons", hackathon_doc(
+        "HackZurich", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich", "Switzerland"))
+    item = scraped("Hack Zürich 2030", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich, CH", "https://mlh.io/hackzurich")
+    assert match_score(item, stored) >= FUZZY_MATCH_THRESHOLD
+
+
+def test_different_event_on_the_same_days_does_not_match():
+    stored = MatchRecord.from_doc("hackathons", hackathon_doc(
+        "HackZurich", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich", "Switzerland"))
+    item = scraped("Junction", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich", "https://junction.example.com")
+    assert match_score(item, stored) == 0.0
+
+
+def test_dates_far_apart_lower_the_score():
+    stored = MatchRecord.from_doc("hackathons", hackathon_doc(
+        "HackZurich", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich", "Switzerland"))
+    same_dates = scraped("HackZurich", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich", "https://a.example.com")
+    month_later = scraped("HackZurich", datetime(2030, 10, 13), datetime(2030, 10, 15), "Zurich", "https://a.example.com")
+    assert match_score(month_later, stored) < FUZZY_MATCH_THRESHOLD <= match_score(same_dates, stored)
+
+
+def test_best_match_ignores_the_same_url():
+    doc = hackathon_doc("HackZurich", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich", "Switzerland")
+    stored = MatchRecord.from_doc("hackathons", doc)
+    item = scraped("HackZurich", datetime(2030, 9, 13), datetime(2030, 9, 15), "Zurich", f"https://{doc['url_key']}")
+    assert best_match(item, [stored]) is None
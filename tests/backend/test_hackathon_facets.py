@@ -0,0 +1,45 @@
+from datetime import date
+
+from backend.hackathon_facets import build_facets_pipeline, format_facets
+from backend.hackathon_queries import start_of_day
+from shared_models.models import HackathonStatus
+
+
+def facet_matches(pipeline) -> dict:
+    return {name: stages[0]["$match"] for name, stages in pipeline[1]["$facet"].items()}
+
+
+def test_date_window_applies_to_all_facets():
+    pipeline = build_facets_pipeline(start_from=date(2030, 1, 1))
+    assert pipeline[0] == {"$match": {"date.start_date": {"$gte": start_of_day(date(2030, 1, 1))}}}
+
+
+def test_each_facet_ignores_its_own_filter():
+    matches = facet_matches(build_facets_pipeline(
+        status=[HackathonStatus.ANNOUNCED], country=["Germany"], city=["Berlin"], include_past=True,
+    ))
+    assert matches["status"] == {"location.country": {"$in": ["Germany"]}, "location.city": {"$in": ["Berlin"]}}
+    assert matches["country"] == {"status": {"$in": ["announced"]}}
+    # Cities are still limited to the selected countries
+    assert matches["city"] == {"status": {"$in": ["announced"]}, "location.country": {"$in": ["Germany"]}}
+    assert matches["total"] == {
+        "status": {"$in": ["announced"]},
+        "location.country": {"$in": ["Germany"]},
+        "location.city": {"$in": ["Berlin"]},
+    }
+
+
+def test_format_facets():
+    result = {
+        "status": [{"_id": "announced", "count": 3}],
+        "country": [{"_id": "Germany", "count": 3}],
+        "city": [{"_id": {"city": "Berlin", "country": "Germany"}, "count": 3}],
+        "total": [{"_id": None, "count": 3}],
+    }
+    assert format_facets(result) == {
+        "status": [{"value": "announced", "count": 3}],
+        "country": [{"value": "Germany", "count": 3}],
+        "city": [{"value": "Berlin", "country": "Germany", "count": 3}],
+        "total": 3,
+    }
+    assert format_facets({})["total"] == 0
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import orjson
+import pytest
+from bson import ObjectId
+
+from backend.hackathon_fields import parse_fields, mongo_projection, safe_from_mongo
+from backend.listing_snapshot import render_json
+
+
+def make_doc() -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": "HackZurich",
+        "date": {"start_date": datetime(2030, 9, 1), "end_date": datetime(2030, 9, 3)},
+        "location": {"city": "Zurich", "country": "Switzerland", "coordinates": {"lat": 47.4, "long": 8.5}},
+        "url": "https://hackzurich.com",
+        "notes": "Long notes",
+        "status": "announced",
+        "created_at": datetime(2024, 1, 1),
+    }
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(" ") is None
+    assert parse_fields("name, status,") == frozenset({"name", "status"})
+    with pytest.raises(ValueError, match="notes_html"):
+        parse_fields("name,notes_html")
+
+
+def test_projection_keeps_cursor_fields():
+    assert mongo_projection(None) is None
+    assert mongo_projection(frozenset({"name"})) == {"name": 1, "_id": 1, "date.start_date": 1}
+    assert mongo_projection(frozenset({"name", "date"})) == {"name": 1, "date": 1, "_id": 1}
+
+
+def test_only_selected_fields_are_serialized():
+    doc = make_doc()
+    # As returned by the projection: the start date is only there for the cursor
+    projected = {"_id": doc["_id"], "name": doc["name"], "status": doc["status"], "date": {"start_date": doc["date"]["start_date"]}}
+    hackathon = safe_from_mongo(projected, frozenset({"name", "status"}))
+    assert orjson.loads(render_json(hackathon)) == {"_id": str(doc["_id"]), "name": "HackZurich", "status": "announced"}
+
+
+def test_selected_fields_serialize_like_the_full_model():
+    doc = make_doc()
+    full = orjson.loads(render_json(safe_from_mongo(dict(doc), None)))
+    partial = orjson.loads(render_json(safe_from_mongo(dict(doc), frozenset({"url", "date", "created_at"}))))
+    assert partial == {key: full[key] for key in ("_id", "url", "date", "created_at")}
@@ -0,0 +1,62 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from backend.hackathon_queries import build_hackathon_filter, encode_cursor, decode_cursor, apply_cursor
+from shared_models.models import HackathonStatus
+
+
+def test_default_filter_is_upcoming_only():
+    query = build_hackathon_filter()
+    today = datetime.now(timezone.utc).date()
+    assert query == {"date.start_date": {"$gte": datetime(today.year, today.month, today.day, tzinfo=timezone.utc)}}
+
+
+def test_include_past_removes_date_window():
+    assert build_hackathon_filter(include_past=True) == {}
+
+
+def test_all_filters_combined():
+    query = build_hackathon_filter(
+        status=[HackathonStatus.ANNOUNCED, HackathonStatus.APPLICATIONS_OPEN],
+        country=["Germany"],
+        city=["Berlin", "Munich"],
+        start_from=date(2025, 1, 1),
+        start_to=date(2025, 1, 31),
+        name="hack (berlin)",
+    )
+    assert query["status"] == {"$in": ["announced", "applications_open"]}
+    assert query["location.country"] == {"$in": ["Germany"]}
+    assert query["location.city"] == {"$in": ["Berlin", "Munich"]}
+    assert query["date.start_date"] == {
+        "$gte": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "$lt": datetime(2025, 2, 1, tzinfo=timezone.utc),  # start_to is inclusive
+    }
+    # User input must not be interpreted as a regex
+    assert query["name"] == {"$regex": r"hack\ \(berlin\)", "$options": "i"}
+
+
+def test_cursor_roundtrip():
+    doc = {"_id": ObjectId(), "date": {"start_date": datetime(2025, 3, 1, 9, 30)}}
+    start_date, last_id = decode_cursor(encode_cursor(doc))
+    assert start_date == doc["date"]["start_date"]
+    assert last_id == doc["_id"]
+
+
+def test_apply_cursor_continues_after_last_document():
+    doc = {"_id": ObjectId(), "date": {"start_date": datetime(2025, 3, 1)}}
+    query = apply_cursor({"status": {"$in": ["announced"]}}, encode_cursor(doc))
+    assert query == {"$and": [
+        {"status": {"$in": ["announced"]}},
+        {"$or": [
+            {"date.start_date": {"$gt": datetime(2025, 3, 1)}},
+            {"date.start_date": datetime(2025, 3, 1), "_id": {"$gt": doc["_id"]}},
+        ]},
+    ]}
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "eyJkIjpudWxsfQ"])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,93 @@
+import httpx
+
+from backend.scrapers.http_cache import HttpCache, fetch, get_http_cache
+from backend.scrapers.http_client import HttpClient
+from settings import settings
+
+URL = "https://mlh.io/seasons/2030/events"
+
+
+class Site:
+    """Serves body, answering conditional requests with 304 if validators are enabled."""
+
+    def __init__(self, body: bytes, etag: str = None):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, request=request)
+        headers = {"ETag": self.etag} if self.etag else {}
+        return httpx.Response(200, content=self.body, headers=headers, request=request)
+
+
+def client_for(site: Site) -> HttpClient:
+    return HttpClient(transport=httpx.MockTransport(site), max_retries=0)
+
+
+def test_not_modified_page_is_unchanged(tmp_path):
+    site = Site(b"<html>events</html>", etag='"v1"')
+    client, cache = client_for(site), HttpCache(tmp_path)
+    first = fetch(client, cache, URL)
+    assert not first.unchanged
+    first.commit()
+
+    second = fetch(client, cache, URL)
+    assert site.requests[1].headers["If-None-Match"] == '"v1"'
+    assert second.status_code == 304
+    assert second.unchanged
+    assert second.content == b"<html>events</html>"
+
+
+def test_identical_body_without_validators_is_unchanged(tmp_path):
+    site = Site(b"<html>events</html>")
+    client, cache = client_for(site), HttpCache(tmp_path)
+    fetch(client, cache, URL).commit()
+
+    assert fetch(client, cache, URL).unchanged
+    site.body = b"<html>new events</html>"
+    assert not fetch(client, cache, URL).unchanged
+
+
+def test_uncommitted_page_is_fetched_as_changed_again(tmp_path):
+    site = Site(b"<html>events</html>", etag='"v1"')
+    client, cache = client_for(site), HttpCache(tmp_path)
+    fetch(client, cache, URL)  # The scrape failed before commit()
+
+    assert not fetch(client, cache, URL).unchanged
+    assert "If-None-Match" not in site.requests[1].headers
+
+
+def test_without_cache_every_page_is_changed():
+    site = Site(b"<html>events</html>", etag='"v1"')
+    client = client_for(site)
+    fetch(client, None, URL).commit()
+
+    assert not fetch(client, None, URL).unchanged
+
+
+def test_page_has_the_charset_of_the_response():
+    site = Site(b"<html>events</html>")
+    client = client_for(site)
+    assert fetch(client, None, URL).encoding is None
+
+    client = HttpClient(transport=httpx.MockTransport(lambda request: httpx.Response(
+        200, content=b"<html>events</html>", headers={"Content-Type": "text/html; charset=ISO-8859-1"}, request=request,
+    )), max_retries=0)
+    assert fetch(client, None, URL).encoding == "iso-8859-1"
+
+
+def test_every_database_has_its_own_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("PYTEST_RUNNING", "0")
+    monkeypatch.setattr(settings, "SCRAPER_HTTP_CACHE_DIR", str(tmp_path))
+    site = Site(b"<html>events</html>", etag='"v1"')
+    client = client_for(site)
+    monkeypatch.setattr(settings, "ENVIRONMENT", "staging")
+    fetch(client, get_http_cache(), URL).commit()
+    assert fetch(client, get_http_cache(), URL).unchanged
+
+    # Not in the production database yet
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    assert not fetch(client, get_http_cache(), URL).unchanged
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+from starlette.requests import Request
+
+from backend.http_caching import make_etag, is_not_modified, listing_last_modified
+
+
+def make_request(headers: dict) -> Request:
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+LAST_MODIFIED = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def test_matching_etag_is_not_modified():
+    etag = make_etag("db", 3)
+    assert is_not_modified(make_request({"If-None-Match": etag}), etag, LAST_MODIFIED)
+    # Weak comparison, and lists of ETags
+    assert is_not_modified(make_request({"If-None-Match": '"other", "db-3"'}), etag, LAST_MODIFIED)
+    assert is_not_modified(make_request({"If-None-Match": "*"}), etag, LAST_MODIFIED)
+
+
+def test_changed_etag_is_modified():
+    etag = make_etag("db", 4)
+    assert not is_not_modified(make_request({"If-None-Match": make_etag("db", 3)}), etag, LAST_MODIFIED)
+    assert not is_not_modified(make_request({}), etag, LAST_MODIFIED)
+
+
+def test_if_modified_since():
+    etag = make_etag("db", 3)
+    assert is_not_modified(make_request({"If-Modified-Since": "Fri, 10 Jan 2025 12:00:00 GMT"}), etag, LAST_MODIFIED)
+    assert not is_not_modified(make_request({"If-Modified-Since": "Fri, 10 Jan 2025 11:59:59 GMT"}), etag, LAST_MODIFIED)
+    assert not is_not_modified(make_request({"If-Modified-Since": "garbage"}), etag, LAST_MODIFIED)
+    # If-None-Match takes precedence over If-Modified-Since
+    assert not is_not_modified(
+        make_request({"If-None-Match": make_etag("db", 2), "If-Modified-Since": "Fri, 10 Jan 2025 12:00:00 GMT"}),
+        etag,
+        LAST_MODIFIED,
+    )
+
+
+def test_listing_last_modified_is_never_before_today():
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    assert listing_last_modified(None) == today
+    assert listing_last_modified(datetime(2000, 1, 1)) == today
+    recent = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(seconds=1)
+    assert listing_last_modified(recent.replace(tzinfo=None)) == recent
@@ -0,0 +1,85 @@
+import httpx
+import pytest
+
+from backend.scrapers.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+
+class Server:
+    """Answers requests with the given statuses in order (an exception instance is raised), then 200."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        response = self.responses.pop(0) if self.responses else 200
+        if isinstance(response, Exception):
+            raise response
+        return httpx.Response(response, text="ok", request=request)
+
+
+def make_client(server: Server, **kwargs) -> HttpClient:
+    options = dict(max_retries=3, backoff=0.01, circuit_failures=5, circuit_reset_seconds=60,
+                   transport=httpx.MockTransport(server), sleep=lambda seconds: None)
+    options.update(kwargs)
+    return HttpClient(**options)
+
+
+def test_retries_server_errors_and_connection_failures():
+    server = Server(503, httpx.ConnectError("refused"), 502)
+    response = make_client(server).get("https://mlh.io/seasons/2030/events")
+
+    assert response.status_code == 200
+    assert server.calls == 4
+
+
+def test_returns_last_response_when_retries_run_out():
+    server = Server(503, 503, 503, 503, 503)
+    response = make_client(server).get("https://mlh.io/seasons/2030/events")
+
+    assert response.status_code == 503
+    assert server.calls == 4
+    with pytest.raises(httpx.HTTPStatusError):
+        response.raise_for_status()
+
+
+def test_client_errors_are_not_retried():
+    server = Server(404)
+    response = make_client(server).get("https://mlh.io/missing")
+
+    assert response.status_code == 404
+    assert server.calls == 1
+
+
+def test_open_circuit_fails_fast_for_its_host_only():
+    server = Server(*[httpx.ConnectError("down")] * 4)
+    client = make_client(server, circuit_failures=4)
+    with pytest.raises(httpx.ConnectError):
+        client.get("https://down.example.com/")
+
+    with pytest.raises(CircuitOpenError):
+        client.get("https://down.example.com/")
+    assert server.calls == 4
+    assert client.get("https://up.example.com/").status_code == 200
+
+
+def test_circuit_lets_one_trial_through_after_reset():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=lambda: now[0])
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 31
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one trial at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
@@ -180,6 +180,113 @@ def test_skip_duplicate_in_main_collection(db: Database, mock_items: list[InboxI
     assert hackathons_collection.count_documents({"url": duplicate_url_str}) == 1
 
 
+def test_rerun_inserts_nothing(db: Database, mock_items: list[InboxItem]):
+    """Processing the same scrape twice leaves the inbox unchanged, the upserts match the existing items."""
+    inbox_collection = db['inbox']
+    process_scraped_items(mock_items)
+    first_run = list(inbox_collection.find({}, sort=[("_id", 1)]))
+
+    process_scraped_items(mock_items)
+    assert list(inbox_collection.find({}, sort=[("_id", 1)])) == first_run
+
+
+def test_skip_url_variants(db: Database, mock_items: list[InboxItem]):
+    """URLs that only differ in scheme, www, case, trailing slash or tracking parameters are duplicates."""
+    inbox_collection = db['inbox']
+    variant = InboxItem(name="MockHacks Alpha (other source)", url="http://www.Example.com/mockhacks-alpha/?utm_source=twitter")
+    assert variant.url_key == "example.com/mockhacks-alpha"
+    process_scraped_items([variant])
+    assert inbox_collection.count_documents({}) == 1
+
+    process_scraped_items([item for item in mock_items if "Alpha" in item.name])
+    assert inbox_collection.count_documents({}) == 1
+    # Same item scraped again, with its new content
+    stored = inbox_collection.find_one({"url_key": "example.com/mockhacks-alpha"})
+    assert stored["name"] == "MockHacks Alpha"
+    assert stored["change_log"][-1]["changes"]["name"]["old"] == variant.name
+
+
+def test_flag_same_event_under_another_url(db: Database):
+    """An event we already have under another URL is still inserted, but flagged as a possible duplicate."""
+    start = datetime(2030, 9, 13, tzinfo=timezone.utc)
+    hackathon = Hackathon(
+        name="HackZurich",
+        date=DateRange(start_date=start, end_date=start + timedelta(days=2)),
+        location=Location(city="Zurich", country="Switzerland", coordinates=Coordinates(lat=47.4, long=8.5)),
+        url=HttpUrl("https://hackzurich.com"),
+        status=HackathonStatus.ANNOUNCED,
+    )
+    hackathon_id = db['hackathons'].insert_one(hackathon.to_mongo()).inserted_id
+
+    process_scraped_items([
+        InboxItem(name="Hack Zurich 2030", date=DateRange(start_date=start, end_date=start + timedelta(days=2)),
+                  location="Zurich, Switzerland", url="https://mlh.io/events/hackzurich"),
+        InboxItem(name="Junction", date=DateRange(start_date=start, end_date=start + timedelta(days=2)),
+                  location="Espoo, Finland", url="https://junction.example.com"),
+    ])
+
+    flagged = db['inbox'].find_one({"name": "Hack Zurich 2030"})
+    assert flagged['possible_duplicate']['collection'] == "hackathons"
+    assert flagged['possible_duplicate']['id'] == str(hackathon_id)
+    assert flagged['possible_duplicate']['score'] >= 0.75
+    assert db['inbox'].find_one({"name": "Junction"})['possible_duplicate'] is None
+
+
+def test_rescrape_updates_changed_fields(db: Database):
+    """A re-scrape with new dates updates the stored item and logs the change, an unchanged one writes nothing."""
+    inbox_collection = db['inbox']
+    start = datetime(2030, 9, 13, tzinfo=timezone.utc)
+    item = InboxItem(name="HackZurich", date=DateRange(start_date=start, end_date=start + timedelta(days=2)),
+                     location="Zurich", url="https://hackzurich.com", scraper_name="mock_scraper_v1")
+    process_scraped_items([item])
+    original = inbox_collection.find_one({"url_key": "hackzurich.com"})
+    assert original['content_hash'] and original['change_log'] == []
+
+    moved = item.model_copy(update={"date": DateRange(start_date=start + timedelta(days=7), end_date=start + timedelta(days=9)),
+                                    "content_hash": None})
+    process_scraped_items([moved])
+    updated = inbox_collection.find_one({"url_key": "hackzurich.com"})
+    assert updated['_id'] == original['_id']
+    assert updated['date']['start_date'].date() == (start + timedelta(days=7)).date()
+    assert updated['content_hash'] != original['content_hash']
+    assert [list(entry['changes']) for entry in updated['change_log']] == [["date"]]
+    assert updated['change_log'][0]['changes']['date']['old']['start_date'] == "2030-09-13T00:00:00"
+
+    process_scraped_items([moved.model_copy()])
+    assert inbox_collection.find_one({"url_key": "hackzurich.com"}) == updated
+
+
+def test_change_to_approved_item_is_flagged_for_review(db: Database):
+    """The hackathon of an approved item was published from its old content, so a reviewer has to look again."""
+    inbox_collection = db['inbox']
+    start = datetime(2030, 9, 13, tzinfo=timezone.utc)
+    item = InboxItem(name="HackZurich", date=DateRange(start_date=start, end_date=start + timedelta(days=2)),
+                     location="Zurich", url="https://hackzurich.com", scraper_name="mock_scraper_v1")
+    process_scraped_items([item])
+    assert inbox_collection.find_one({"url_key": "hackzurich.com"})['needs_review'] is False
+    inbox_collection.update_one({"url_key": "hackzurich.com"}, {"$set": {"review_status": InboxStatus.APPROVED.value}})
+
+    process_scraped_items([item.model_copy(update={"content_hash": None})])
+    assert inbox_collection.find_one({"url_key": "hackzurich.com"})['needs_review'] is False  # Unchanged
+    process_scraped_items([item.model_copy(update={"location": "Zurich, Switzerland", "content_hash": None})])
+    updated = inbox_collection.find_one({"url_key": "hackzurich.com"})
+    assert updated['needs_review'] is True
+    assert updated['review_status'] == InboxStatus.APPROVED.value
+    assert updated['location'] == "Zurich, Switzerland"
+
+
+def test_outcomes_are_counted_per_scraper(db: Database, mock_items: list[InboxItem]):
+    process_scraped_items(mock_items[:1])
+    by_scraper = {}
+
+    process_scraped_items(mock_items, by_scraper=by_scraper)
+
+    outcomes = by_scraper[MockScraper.SCRAPER_NAME]
+    assert outcomes["unchanged"] == 1
+    assert outcomes["inserted"] == db['inbox'].count_documents({}) - 1
+    assert sum(outcomes.values()) == len(mock_items)
+
+
 # TODO: Add more tests?
 # - Test for item without URL (ensure it's handled - currently assumed not duplicate)
 # - Test edge cases in is_duplicate if logic becomes more complex (e.g., name/date checks)
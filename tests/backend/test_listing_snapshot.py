@@ -0,0 +1,52 @@
+import orjson
+
+from backend.listing_snapshot import ListingSnapshotCache, render_json, query_key
+from shared_models.models import Hackathon
+
+
+def test_cache_hit_and_version_invalidation():
+    cache = ListingSnapshotCache(max_bytes=1024)
+    cache.put("v1", ("a",), b"body-a")
+    assert cache.get("v1", ("a",)) == b"body-a"
+    assert cache.get("v1", ("b",)) is None
+
+    # A new version makes every older body unreachable and frees its memory
+    cache.put("v2", ("b",), b"body-b")
+    assert cache.get("v1", ("a",)) is None
+    assert cache.get("v2", ("a",)) is None
+    assert cache.get("v2", ("b",)) == b"body-b"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ListingSnapshotCache(max_bytes=10)
+    cache.put("v1", "a", b"aaaa")
+    cache.put("v1", "b", b"bbbb")
+    cache.get("v1", "a")  # a is now more recent than b
+    cache.put("v1", "c", b"cccc")
+    assert cache.get("v1", "a") == b"aaaa"
+    assert cache.get("v1", "b") is None
+    assert cache.get("v1", "c") == b"cccc"
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ListingSnapshotCache(max_bytes=0)
+    cache.put("v1", "a", b"aaaa")
+    assert cache.get("v1", "a") is None
+
+
+def test_query_key_ignores_parameter_order():
+    assert query_key([("status", "announced"), ("limit", "10")]) == query_key([("limit", "10"), ("status", "announced")])
+
+
+def test_render_json_matches_fastapi_serialization():
+    hackathon = Hackathon.model_validate({
+        "_id": "65f1c0ffee0000000000abcd",
+        "name": "Snapshot Hacks",
+        "date": {"start_date": "2030-01-01T00:00:00Z", "end_date": "2030-01-03T00:00:00Z"},
+        "location": {"city": "Munich", "country": "Germany", "coordinates": {"lat": 48.1, "long": 11.5}},
+        "url": "https://snapshot.example.com",
+        "status": "announced",
+    })
+    body = orjson.loads(render_json({"data": [hackathon], "next_cursor": None}))
+    assert body == {"data": [hackathon.model_dump(mode="json", by_alias=True)], "next_cursor": None}
+    assert body["data"][0]["_id"] == "65f1c0ffee0000000000abcd"
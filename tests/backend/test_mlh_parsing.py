@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from backend.scrapers.mlh_scraper import MlhScraper, PARSERS
+
+FIXTURE = Path(__file__).parent / "fixtures" / "mlh_season_2030.html"
+
+
+def without_meta_charset(name: str, encoding: str) -> bytes:
+    """The fixture page without its <meta charset>, with the first event renamed, in the given encoding."""
+    text = FIXTURE.read_text(encoding="utf-8")
+    assert '<meta charset="utf-8">' in text
+    return text.replace('<meta charset="utf-8">', "").replace("HackZurich", name).encode(encoding)
+
+
+def items(parser: str, content: bytes, encoding: str | None = None) -> list[dict]:
+    scraper = MlhScraper(2030, parser=parser)
+    cards = scraper.parse_cards(content, encoding)
+    return [item.model_dump(exclude={"scraped_at"}) for item in scraper.items_from_cards(cards)]
+
+
+@pytest.mark.parametrize("parser", sorted(set(PARSERS) - {"soup"}))
+def test_parser_matches_the_reference_parser(parser):
+    content = FIXTURE.read_bytes()
+
+    assert PARSERS[parser](content) == PARSERS["soup"](content)
+    assert items(parser, content) == items("soup", content)
+
+
+@pytest.mark.parametrize("parser", sorted(PARSERS))
+@pytest.mark.parametrize("encoding", ["utf-8", None])
+def test_utf8_page_without_meta_charset(parser, encoding):
+    # The response's charset, or UTF-8 detected in the bytes, not lxml's Latin-1 default ("HackZÃ¼rich")
+    parsed = items(parser, without_meta_charset("HackZürich", "utf-8"), encoding)
+
+    assert parsed[0]["name"] == "HackZürich"
+
+
+@pytest.mark.parametrize("parser", sorted(PARSERS))
+def test_charset_of_the_response_is_used(parser):
+    parsed = items(parser, without_meta_charset("HackZürich", "latin-1"), "iso-8859-1")
+
+    assert parsed[0]["name"] == "HackZürich"
+
+
+def test_fixture_items():
+    parsed = items("lxml", FIXTURE.read_bytes())
+
+    # Digital, hybrid and past events are left out
+    assert [item["name"] for item in parsed] == [
+        "HackZurich", "Junction", "HackMIT", "TreeHacks & Friends", "nwHacks", "HackPrinceton",
+        "Missing End Date Hacks", "Bad Date Hacks", "CalHacks", "HackGT",
+    ]
+    hackzurich = parsed[0]
+    assert hackzurich["url"] == "https://hackzurich.com/?utm_source=mlh&utm_medium=referral"
+    assert hackzurich["location"] == "Zurich, ZH"
+    assert hackzurich["date"]["start_date"].isoformat() == "2030-09-13T00:00:00+00:00"
+    assert hackzurich["source_url"] == "https://mlh.io/seasons/2030/events"
+    assert parsed[1]["location"] == "Espoo"
+    assert parsed[5]["url"] is None
+    assert parsed[6]["date"] is None
+
+
+@pytest.mark.parametrize("parser", sorted(PARSERS))
+def test_page_without_upcoming_events(parser):
+    assert PARSERS[parser](b"<html><body><div class='row'><h3>Past Events</h3></div></body></html>") is None
@@ -0,0 +1,80 @@
+import queue
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+import pytest
+
+import backend.scrapers.http_client as http_client
+from backend.scraper_pool import run_concurrently
+from backend.scrapers.mlh_scraper import MlhScraper, current_seasons_scrapers
+from settings import settings
+from shared_models.models import InboxItem
+
+FIXTURE = Path(__file__).parent / "fixtures" / "mlh_season_2030.html"
+
+
+@pytest.fixture
+def mlh_site(monkeypatch, tmp_path):
+    """Serves the fixture page for every season, taking 0.2s per request. Returns the requested paths."""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        time.sleep(0.2)
+        if request.url.path == "/seasons/2029/events":
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, content=FIXTURE.read_bytes(), request=request)
+
+    client = http_client.HttpClient(transport=httpx.MockTransport(handler), max_retries=0)
+    monkeypatch.setattr(http_client, "_shared_client", client)
+    monkeypatch.setattr(settings, "SCRAPER_HTTP_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "SCRAPER_HOST_DELAY_SECONDS", 0)
+    return requested
+
+
+def run(scrapers):
+    """Runs the scrapers like a scrape run does. Returns their timings and the number of items they queued."""
+    item_queue = queue.Queue()
+    timings = run_concurrently(scrapers, item_queue, threading.Event())
+    queued = [item_queue.get() for _ in range(item_queue.qsize())]
+    return timings, sum(isinstance(item, InboxItem) for item in queued)
+
+
+def test_every_season_is_a_scraper(monkeypatch):
+    monkeypatch.setattr(settings, "MLH_SEASON_OFFSETS", [1, 0, 1])
+
+    scrapers = current_seasons_scrapers()
+
+    assert [scraper.year for scraper in scrapers] == [date.today().year, date.today().year + 1]
+    assert {scraper.host for scraper in scrapers} == {"mlh.io"}
+
+
+def test_seasons_are_fetched_side_by_side(mlh_site, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_HOST_CONCURRENCY_BY_HOST", {"mlh.io": 3})
+    started = time.monotonic()
+    timings, items = run([MlhScraper(year) for year in (2030, 2031, 2032)])
+
+    assert time.monotonic() - started < 0.5  # One after the other it would take 0.6s
+    assert sorted(mlh_site) == ["/seasons/2030/events", "/seasons/2031/events", "/seasons/2032/events"]
+    # Every season lists the same 10 in-person events, processing keeps one of each (seen_keys)
+    assert items == 30
+    assert [timing.scraper_name for timing in timings] == [f"mlh_events_{year}_inperson" for year in (2030, 2031, 2032)]
+
+
+def test_other_hosts_keep_the_default_concurrency(mlh_site, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_HOST_CONCURRENCY_BY_HOST", {"devpost.com": 3})
+    started = time.monotonic()
+    run([MlhScraper(year) for year in (2030, 2031)])
+
+    assert time.monotonic() - started >= 0.4
+
+
+def test_failing_season_does_not_lose_the_others(mlh_site):
+    # 2029 returns a 404, which MlhScraper logs and skips
+    timings, items = run([MlhScraper(2029), MlhScraper(2030)])
+
+    assert items == 10
+    assert [timing.status for timing in timings] == ["ok", "ok"]
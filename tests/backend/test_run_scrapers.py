@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+from typing import List
+
+import httpx
+import pytest
+
+import backend.run_scrapers as run_scrapers
+import backend.scrapers.http_client as http_client
+import scraper_pool
+from backend.inbox_processor import ProcessingStats
+from backend.scrapers.base_scraper import BaseScraper
+from settings import settings
+from shared_models.models import InboxItem
+
+
+def make_item(i: int) -> InboxItem:
+    return InboxItem(name=f"Streamed Hackathon {i}", url=f"https://hackathon-{i}.example.com/", scraper_name="streaming")
+
+
+class StreamingScraper(BaseScraper):
+    SCRAPER_NAME = "streaming"
+
+    def __init__(self, count: int, delay: float = 0.0, fail_after: int = None):
+        self.count = count
+        self.delay = delay
+        self.fail_after = fail_after
+        self.yielded = 0
+
+    def scrape(self) -> List[InboxItem]:
+        return list(self.iter_items())
+
+    def iter_items(self):
+        for i in range(self.count):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("page 2 is gone")
+            time.sleep(self.delay)
+            self.yielded += 1
+            yield make_item(i)
+
+
+class PageScraper(BaseScraper):
+    """One cached page with one item, committed after it was yielded."""
+    SCRAPER_NAME = "page"
+
+    def scrape(self) -> List[InboxItem]:
+        return list(self.iter_items())
+
+    def iter_items(self):
+        page = self.fetch("https://hackathons.example.com/")
+        if page.unchanged:
+            return
+        yield make_item(0)
+        page.commit()
+
+
+@pytest.fixture
+def processed(monkeypatch):
+    """Records the batches passed to process_scraped_items instead of writing them."""
+    batches = []
+
+    def fake_process(items, seen_keys=None, by_scraper=None):
+        batches.append(list(items))
+        return ProcessingStats(inserted=len(items))
+
+    monkeypatch.setattr(run_scrapers, "process_scraped_items", fake_process)
+    monkeypatch.setattr(scraper_pool.settings, "SCRAPER_HOST_DELAY_SECONDS", 0)
+    return batches
+
+
+def test_default_iter_items_yields_scrape_results():
+    class ListScraper(BaseScraper):
+        def scrape(self):
+            return [make_item(1), make_item(2)]
+
+    assert [item.name for item in ListScraper().iter_items()] == ["Streamed Hackathon 1", "Streamed Hackathon 2"]
+
+
+def test_items_are_processed_in_fixed_size_batches(processed):
+    run = run_scrapers.run_all_scrapes([StreamingScraper(25), StreamingScraper(5)], batch_size=10)
+
+    assert [len(batch) for batch in processed] == [10, 10, 10]
+    assert run.stats.inserted == 30
+
+
+def test_failing_scraper_keeps_its_items_and_the_others(processed):
+    run = run_scrapers.run_all_scrapes([StreamingScraper(10, fail_after=4), StreamingScraper(3)], batch_size=100)
+
+    assert run.stats.inserted == 7
+    assert [timing.status for timing in run.timings] == ["failed", "ok"]
+
+
+def test_page_is_committed_once_its_items_are_stored(processed, monkeypatch, tmp_path):
+    site = lambda request: httpx.Response(200, content=b"<html></html>", request=request)
+    monkeypatch.setattr(http_client, "_shared_client",
+                        http_client.HttpClient(transport=httpx.MockTransport(site), max_retries=0))
+    monkeypatch.setattr(settings, "SCRAPER_HTTP_CACHE_DIR", str(tmp_path))
+
+    def failing_process(items, seen_keys=None, by_scraper=None):
+        raise RuntimeError("lost the database")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(run_scrapers, "process_scraped_items", failing_process)
+        run_scrapers.run_all_scrapes([PageScraper()])
+    # Not stored, so the page isn't cached and the next run scrapes it again
+    assert run_scrapers.run_all_scrapes([PageScraper()]).stats.inserted == 1
+    assert run_scrapers.run_all_scrapes([PageScraper()]).stats.inserted == 0
+
+
+def test_partial_batch_is_flushed_while_the_scrape_is_running(processed):
+    scraper = StreamingScraper(6, delay=0.1)
+    run_scrapers.run_all_scrapes([scraper], batch_size=100, flush_interval=0.15)
+
+    assert len(processed) > 1
+    assert sum(len(batch) for batch in processed) == 6
+
+
+def test_full_queue_pauses_the_scraper():
+    scraper = StreamingScraper(1000)
+    item_queue = queue.Queue(maxsize=5)
+    stop = threading.Event()
+    producer = threading.Thread(target=run_scrapers.produce_items, args=([scraper], item_queue, stop), daemon=True)
+    producer.start()
+    time.sleep(0.2)
+
+    # The queue holds 5 items, one more is waiting to be put
+    assert scraper.yielded <= 6
+    stop.set()
+    producer.join(timeout=2)
+    assert not producer.is_alive()
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from backend.database import get_db, ensure_indexes
+from backend.scrape_jobs import (
+    SCRAPE_JOBS, MAX_ATTEMPTS, STALE_AFTER, claim_next_job, complete_job, fail_job, failed_job_update, heartbeat,
+    job_status, new_job, requeue_stale_jobs, stale_jobs_filter, utc_now,
+)
+
+
+@pytest.fixture(scope="function")
+def db() -> Database:
+    database = get_db()
+    assert "pytest" in database.name  # Safety check: Ensure we're not using prod/staging DB
+    database[SCRAPE_JOBS].delete_many({})
+    ensure_indexes(database)
+    yield database
+
+
+def test_only_one_job_can_be_active(db):
+    db[SCRAPE_JOBS].insert_one(new_job())
+    with pytest.raises(DuplicateKeyError):
+        db[SCRAPE_JOBS].insert_one(new_job())
+
+
+def test_job_is_claimed_once(db):
+    job_id = db[SCRAPE_JOBS].insert_one(new_job()).inserted_id
+
+    claimed = claim_next_job(db, "worker-a")
+    assert claimed["_id"] == job_id
+    assert claimed["status"] == "running"
+    assert claimed["attempts"] == 1
+    assert claim_next_job(db, "worker-b") is None
+
+
+def test_completed_job_frees_the_queue(db):
+    job_id = db[SCRAPE_JOBS].insert_one(new_job()).inserted_id
+    claim_next_job(db, "worker-a")
+
+    assert not complete_job(db, job_id, "worker-b", {"inserted": 1}, [])  # Not its job
+    assert complete_job(db, job_id, "worker-a", {"inserted": 3, "updated": 1, "unchanged": 0, "skipped": 2}, [])
+    status = job_status(db[SCRAPE_JOBS].find_one({"_id": job_id}))
+    assert status["is_running"] is False
+    assert status["last_status"] == "completed"
+    assert status["items_collected"] == 6
+    db[SCRAPE_JOBS].insert_one(new_job())  # No longer blocked by the unique index
+
+
+def test_stale_job_is_requeued_then_failed(db):
+    job_id = db[SCRAPE_JOBS].insert_one(new_job()).inserted_id
+    stale_heartbeat = {"$set": {"heartbeat_at": utc_now() - STALE_AFTER - timedelta(seconds=1)}}
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        assert claim_next_job(db, f"worker-{attempt}")["attempts"] == attempt
+        assert heartbeat(db, job_id, f"worker-{attempt}")
+        db[SCRAPE_JOBS].update_one({"_id": job_id}, stale_heartbeat)
+        assert requeue_stale_jobs(db) == 1
+
+    job = db[SCRAPE_JOBS].find_one({"_id": job_id})
+    assert job["status"] == "failed"
+    assert "active" not in job
+    assert not heartbeat(db, job_id, f"worker-{MAX_ATTEMPTS}")
+    assert not fail_job(db, job_id, f"worker-{MAX_ATTEMPTS}", "too late")
+
+
+def test_job_of_a_dead_worker_is_not_running(db):
+    job_id = db[SCRAPE_JOBS].insert_one(new_job()).inserted_id
+    claim_next_job(db, "worker-a")
+    assert job_status(db[SCRAPE_JOBS].find_one({"_id": job_id}))["is_running"] is True
+
+    # No worker is left to requeue it
+    stale_heartbeat = utc_now() - STALE_AFTER - timedelta(seconds=1)
+    db[SCRAPE_JOBS].update_one({"_id": job_id}, {"$set": {"heartbeat_at": stale_heartbeat}})
+    status = job_status(db[SCRAPE_JOBS].find_one({"_id": job_id}))
+    assert status["is_running"] is False
+    assert status["last_status"] == "stalled: worker stopped responding"
+
+    # What /scraping/trigger does before queueing a new job
+    assert db[SCRAPE_JOBS].update_one({"_id": job_id, **stale_jobs_filter()}, failed_job_update("gone")).modified_count
+    db[SCRAPE_JOBS].insert_one(new_job())
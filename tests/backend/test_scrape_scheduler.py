@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from pymongo.database import Database
+
+import scrape_worker
+from backend.database import get_db, ensure_indexes
+from backend.scrape_jobs import SCRAPE_JOBS, utc_now
+from backend.scrape_scheduler import (
+    LOCK_LEASE, SCHEDULER_LOCKS, SCRAPE_SCHEDULE, acquire_scheduler_lock, adapt_interval, jittered, record_results,
+    schedule_due_scrapers,
+)
+from backend.scraper_pool import ScraperTiming
+from backend.scrapers.mock_scraper import MockScraper
+from settings import settings
+
+HOUR = 3600.0
+
+
+@pytest.fixture
+def intervals(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_SECONDS", 6 * HOUR)
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_MIN_SECONDS", 1 * HOUR)
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_MAX_SECONDS", 72 * HOUR)
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_JITTER", 0.1)
+
+
+@pytest.fixture(scope="function")
+def db(intervals) -> Database:
+    database = get_db()
+    assert "pytest" in database.name  # Safety check: Ensure we're not using prod/staging DB
+    for collection in (SCRAPE_JOBS, SCRAPE_SCHEDULE, SCHEDULER_LOCKS):
+        database[collection].delete_many({})
+    ensure_indexes(database)
+    yield database
+
+
+def timing(status="ok", items=3, fingerprint="a" * 64) -> ScraperTiming:
+    return ScraperTiming(MockScraper.SCRAPER_NAME, "mock", status, items=items, fingerprint=fingerprint)
+
+
+def test_interval_adapts_within_bounds(intervals):
+    assert adapt_interval(6 * HOUR, changed=True) == 3 * HOUR
+    assert adapt_interval(6 * HOUR, changed=False) == 9 * HOUR
+    assert adapt_interval(1.5 * HOUR, changed=True) == 1 * HOUR
+    assert adapt_interval(60 * HOUR, changed=False) == 72 * HOUR
+
+
+def test_jitter_stays_within_fraction(intervals):
+    samples = [jittered(10 * HOUR) for _ in range(200)]
+    assert all(9 * HOUR <= sample <= 11 * HOUR for sample in samples)
+    assert len(set(samples)) > 1
+
+
+def test_only_one_owner_holds_the_lock(db):
+    now = utc_now()
+    assert acquire_scheduler_lock(db, "worker-a", now)
+    assert not acquire_scheduler_lock(db, "worker-b", now)
+    assert acquire_scheduler_lock(db, "worker-a", now + timedelta(seconds=1))  # Renewal
+    assert acquire_scheduler_lock(db, "worker-b", now + LOCK_LEASE + timedelta(seconds=2))  # Expired
+
+
+def test_due_scrapers_are_queued_once(db):
+    now = utc_now()
+    job_id = schedule_due_scrapers(db, "worker-a", [MockScraper()], now)
+    job = db[SCRAPE_JOBS].find_one({"_id": job_id})
+    assert job["scrapers"] == [MockScraper.SCRAPER_NAME]
+    assert job["trigger"] == "schedule"
+
+    db[SCRAPE_JOBS].update_one({"_id": job_id}, {"$unset": {"active": ""}})
+    assert schedule_due_scrapers(db, "worker-a", [MockScraper()], now + timedelta(minutes=1)) is None  # Not due
+    assert schedule_due_scrapers(db, "worker-b", [MockScraper()], now + 2 * LOCK_LEASE) is None  # Not due either
+
+
+def test_results_adapt_the_schedule(db):
+    now = utc_now()
+    schedule_due_scrapers(db, "worker-a", [MockScraper()], now)
+
+    record_results(db, [timing()], now)
+    schedule = db[SCRAPE_SCHEDULE].find_one({"_id": MockScraper.SCRAPER_NAME})
+    assert schedule["interval_seconds"] == 3 * HOUR  # New content
+    assert schedule["last_fingerprint"] == "a" * 64
+
+    record_results(db, [timing()], now)
+    assert db[SCRAPE_SCHEDULE].find_one({"_id": MockScraper.SCRAPER_NAME})["interval_seconds"] == 4.5 * HOUR
+    record_results(db, [timing(items=0, fingerprint=None)], now)  # Unchanged pages yield no items
+    assert db[SCRAPE_SCHEDULE].find_one({"_id": MockScraper.SCRAPER_NAME})["interval_seconds"] == 6.75 * HOUR
+    record_results(db, [timing(status="failed", items=0, fingerprint=None)], now)
+    schedule = db[SCRAPE_SCHEDULE].find_one({"_id": MockScraper.SCRAPER_NAME})
+    assert schedule["interval_seconds"] == 6.75 * HOUR
+    assert schedule["last_fingerprint"] == "a" * 64
+    assert schedule["last_status"] == "failed"
+
+
+def test_scheduler_loads_the_scrapers_once(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(scrape_worker, "_scheduled_scrapers", {})
+    monkeypatch.setattr(scrape_worker, "load_scrapers", lambda entries: loaded.append(entries) or [MockScraper()])
+    monkeypatch.setattr(settings, "SCRAPERS_ENABLED", {settings.ENVIRONMENT: ["mock"]})
+
+    scrapers = scrape_worker.scheduled_scrapers()
+    assert scrape_worker.scheduled_scrapers() is scrapers
+    assert [entry.name for entries in loaded for entry in entries] == ["mock"]
+    monkeypatch.setattr(settings, "SCRAPERS_ENABLED", {settings.ENVIRONMENT: []})
+    scrape_worker.scheduled_scrapers()
+    assert len(loaded) == 2
@@ -0,0 +1,94 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+import backend.scrapers.http_client as http_client
+import database
+from data_access import find_scrape_runs
+from backend.inbox_processor import ProcessingStats
+from backend.run_scrapers import ScrapeRun
+from backend.scraper_pool import ScraperTiming
+from backend.scrape_telemetry import SCRAPE_RUNS, percentile, run_record, summarize_runs
+from backend.scrapers.base_scraper import FetchMetrics
+from backend.scrapers.mlh_scraper import MlhScraper
+from settings import settings
+
+
+def scraper_run(name: str, day: int, seconds: float, status: str = "ok", inserted: int = 0) -> dict:
+    record = {"scraper_name": name, "status": status, "seconds": seconds, "fetch_seconds": seconds / 2,
+              "items_found": 10, "inserted": inserted, "bytes_downloaded": 1000}
+    return {"finished_at": datetime(2030, 9, day, 12, tzinfo=timezone.utc), "scrapers": [record]}
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) is None
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 90) == pytest.approx(4.6)
+
+
+def test_runs_are_summarized_per_scraper_and_day():
+    runs = [scraper_run("mlh", 1, 10.0, inserted=5), scraper_run("mlh", 1, 20.0),
+            scraper_run("mlh", 2, 40.0, status="timeout"), scraper_run("devpost", 2, 5.0)]
+
+    summary = summarize_runs(runs)
+
+    assert summary["runs"] == 4
+    mlh = summary["scrapers"]["mlh"]
+    assert (mlh["runs"], mlh["failures"], mlh["last_status"]) == (3, 1, "timeout")
+    assert mlh["percentiles"]["seconds"]["p50"] == 20.0
+    assert mlh["percentiles"]["fetch_seconds"]["p50"] == 10.0
+    assert [(day["date"], day["runs"], day["p50_seconds"], day["inserted"]) for day in mlh["daily"]] == [
+        ("2030-09-01", 2, 15.0, 5), ("2030-09-02", 1, 40.0, 0),
+    ]
+    assert summary["scrapers"]["devpost"]["daily"][0]["bytes_downloaded"] == 1000
+
+
+def test_ingest_counts_are_rolled_up_per_scraper():
+    timing = ScraperTiming("mlh_events_inperson", "mlh.io", "ok", items=4, seconds=3.0, fetch_seconds=1.0,
+                           sources=["mlh_events_2030_inperson", "mlh_events_2031_inperson"])
+    run = ScrapeRun(ProcessingStats(inserted=3, skipped=1), [timing], 3.5, outcomes={
+        "mlh_events_2030_inperson": Counter(inserted=2),
+        "mlh_events_2031_inperson": Counter(inserted=1, duplicates=1),
+        "other": Counter(errors=5),
+    }, ingest_seconds={"mlh_events_2030_inperson": 0.25, "mlh_events_2031_inperson": 0.25})
+
+    record = run_record(run)["scrapers"][0]
+
+    assert (record["inserted"], record["duplicates"], record["errors"]) == (3, 1, 0)
+    assert record["ingest_seconds"] == 0.5
+    assert record["parse_seconds"] == 2.0
+
+
+def test_fetches_are_measured(monkeypatch, tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/seasons/2031/events":
+            return httpx.Response(503, request=request)
+        return httpx.Response(200, content=b"<html></html>", request=request)
+
+    monkeypatch.setattr(http_client, "_shared_client",
+                        http_client.HttpClient(transport=httpx.MockTransport(handler), max_retries=0))
+    monkeypatch.setattr(settings, "SCRAPER_HTTP_CACHE_DIR", str(tmp_path))
+    scrapers = [MlhScraper(2030), MlhScraper(2031)]
+    for scraper in scrapers:
+        scraper.scrape()
+
+    metrics = sum((scraper.fetch_metrics for scraper in scrapers), FetchMetrics())
+    assert (metrics.requests, metrics.errors, metrics.bytes_downloaded) == (2, 1, 13)
+
+
+def test_latest_runs_are_kept_over_the_limit(monkeypatch):
+    monkeypatch.setattr(database, "_async_client", None)  # Bound to the event loop of this test
+
+    async def find_latest_two():
+        db = database.get_async_db()
+        assert "pytest" in db.name  # Safety check: Ensure we're not using prod/staging DB
+        await db[SCRAPE_RUNS].delete_many({})
+        await db[SCRAPE_RUNS].insert_many([scraper_run("mlh_events_inperson", day, 1.0) for day in (3, 1, 2)])
+        return await find_scrape_runs(db, datetime(2030, 9, 1, tzinfo=timezone.utc), limit=2)
+
+    runs = asyncio.run(find_latest_two())
+    assert [run["finished_at"].day for run in runs] == [2, 3]
@@ -0,0 +1,65 @@
+"""
+Offline benchmarks of the scrapers against their recorded cassettes (see backend/scrapers/http_replay.py).
+
+Needs pytest-benchmark, and a test database for the ingest benchmarks. Compare a change against a saved run:
+    pytest tests/backend/test_scraper_benchmarks.py --benchmark-autosave
+    pytest tests/backend/test_scraper_benchmarks.py --benchmark-compare
+"""
+from typing import List
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from backend.database import get_db
+from backend.inbox_processor import process_scraped_items
+from scrapers.base_scraper import BaseScraper
+from scrapers.http_client import get_http_client
+from shared_models.models import InboxItem
+
+# Registered names of the benchmarked scrapers, replayed from their cassettes (see the recorded fixture); record
+# new cassettes with benchmarks/record_scraper_fixtures.py
+SCRAPERS = ["mlh"]
+
+
+def scrape_all(scrapers: List[BaseScraper]) -> List[InboxItem]:
+    return [item for scraper in scrapers for item in scraper.scrape()]
+
+
+@pytest.fixture(params=SCRAPERS)
+def case(request, recorded):
+    return recorded(request.param)
+
+
+def test_fetch(benchmark, case):
+    """The recorded responses through the shared client, without the network: the client's own overhead."""
+    cassette, _ = case
+
+    def fetch_all():
+        for interaction in cassette.interactions:
+            get_http_client().request(interaction.method, interaction.url).read()
+
+    benchmark(fetch_all)
+
+
+def test_parse(benchmark, case):
+    """A complete scrape. Fetches are replayed from memory, so this is mostly parsing and building the items."""
+    _, scrapers = case
+    items = benchmark(scrape_all, scrapers)
+    assert items
+
+
+def test_ingest(benchmark, case):
+    """Processing the scraped items into an empty inbox."""
+    _, scrapers = case
+    db = get_db()
+    assert "pytest" in db.name  # Safety check: Ensure we're not using prod/staging DB
+    items = scrape_all(scrapers)
+
+    def empty_inbox():
+        db["inbox"].delete_many({})
+        db["hackathons"].delete_many({})
+
+    stats = benchmark.pedantic(process_scraped_items, args=(items,), setup=empty_inbox, rounds=10)
+    assert stats.inserted
+    assert stats.total == len(items)  # Events listed on several pages (e.g. MLH seasons) are skipped
@@ -0,0 +1,77 @@
+import queue
+import threading
+import time
+from typing import List
+
+from backend.scraper_pool import run_concurrently
+from backend.scrapers.base_scraper import BaseScraper
+from shared_models.models import InboxItem
+
+
+class SleepingScraper(BaseScraper):
+    """Takes `seconds` per item and records when it ran."""
+
+    def __init__(self, name: str, host: str, seconds: float, items: int = 1):
+        self.SCRAPER_NAME = name
+        self.target_url = f"https://{host}/events"
+        self.seconds = seconds
+        self.items = items
+        self.ran = None
+
+    def scrape(self) -> List[InboxItem]:
+        return list(self.iter_items())
+
+    def iter_items(self):
+        start = time.monotonic()
+        for i in range(self.items):
+            time.sleep(self.seconds)
+            yield InboxItem(name=f"{self.SCRAPER_NAME} {i}", url=f"https://{self.SCRAPER_NAME}.example.com/{i}")
+        self.ran = (start, time.monotonic())
+
+
+def run(scrapers, **limits):
+    item_queue = queue.Queue()
+    started = time.monotonic()
+    timings = run_concurrently(scrapers, item_queue, threading.Event(), **limits)
+    return timings, time.monotonic() - started, item_queue.qsize()
+
+
+def test_scrapers_of_different_hosts_run_in_parallel():
+    scrapers = [SleepingScraper(f"scraper_{i}", f"host-{i}.example.com", 0.2) for i in range(4)]
+    timings, seconds, items = run(scrapers, max_workers=4, host_concurrency=1, host_delay=0, timeout=10)
+
+    assert seconds < 0.6  # Sequentially it would take 0.8s
+    assert items == 4
+    assert [timing.status for timing in timings] == ["ok"] * 4
+
+
+def test_scrapers_of_the_same_host_take_turns_with_a_delay():
+    first = SleepingScraper("first", "mlh.io", 0.1)
+    second = SleepingScraper("second", "mlh.io", 0.1)
+    timings, _, _ = run([first, second], max_workers=4, host_concurrency=1, host_delay=0.3, timeout=10)
+
+    later, earlier = sorted([first.ran, second.ran], reverse=True)
+    assert later[0] >= earlier[1]  # Not at the same time
+    assert later[0] - earlier[0] >= 0.29  # Started at least host_delay apart
+    assert max(timing.waited_seconds for timing in timings) >= 0.29
+
+
+def test_timed_out_scraper_does_not_hold_up_the_run():
+    slow = SleepingScraper("slow", "slow.example.com", 0.2, items=50)
+    fast = SleepingScraper("fast", "fast.example.com", 0.01)
+    timings, seconds, items = run([slow, fast], max_workers=4, host_concurrency=1, host_delay=0, timeout=0.5)
+
+    assert seconds < 1.5
+    assert [timing.status for timing in timings] == ["timeout", "ok"]
+    assert 1 <= timings[0].items < 50
+    assert items == timings[0].items + 1
+
+
+def test_timed_out_scraper_frees_its_host_slot():
+    hung = SleepingScraper("hung", "mlh.io", 3.0)
+    hung.TIMEOUT_SECONDS = 0.2
+    waiting = SleepingScraper("waiting", "mlh.io", 0.01)
+    timings, seconds, _ = run([hung, waiting], max_workers=1, host_concurrency=1, host_delay=0, timeout=10)
+
+    assert seconds < 1.0  # Not held up until the hung scraper's sleep returns
+    assert [timing.status for timing in timings] == ["timeout", "ok"]
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+
+import scraper_registry
+from scraper_registry import ENTRY_POINT_GROUP, enabled_scrapers, load_scrapers
+from settings import settings
+
+BACKEND = Path(__file__).parent.parent.parent / "backend"
+
+
+@pytest.fixture
+def plugin(monkeypatch):
+    """An installed package that registers the mock scraper as "plugin"."""
+    entry_point = EntryPoint("plugin", "scrapers.mock_scraper:MockScraper", ENTRY_POINT_GROUP)
+    monkeypatch.setattr(scraper_registry, "entry_points",
+                        lambda group: [entry_point] if group == ENTRY_POINT_GROUP else [])
+
+
+def names(entries) -> list:
+    return [entry.name for entry in entries]
+
+
+def test_scrapers_are_enabled_per_environment(plugin):
+    assert names(enabled_scrapers("production", None)) == ["mlh", "plugin"]
+    assert names(enabled_scrapers("staging", ["mock", "unknown"])) == ["mock"]
+    assert enabled_scrapers("staging", []) == []
+
+
+def test_enabled_scrapers_are_set_per_environment(plugin, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPERS_ENABLED", {"staging": ["mock"]})
+
+    assert names(enabled_scrapers("staging")) == ["mock"]
+    assert names(enabled_scrapers("production")) == ["mlh", "plugin"]
+
+
+def test_scrapers_are_loaded_from_their_target(plugin):
+    scrapers = load_scrapers(enabled_scrapers("test", ["plugin"]))
+
+    assert [scraper.SCRAPER_NAME for scraper in scrapers] == ["mock_scraper_v1"]
+
+
+def test_failing_scraper_is_left_out():
+    broken = scraper_registry.ScraperEntry("broken", "scrapers.does_not_exist:Scraper")
+
+    assert load_scrapers([broken]) == []
+
+
+def test_api_does_not_import_scrapers():
+    # A fresh interpreter, the test session has imported the scrapers already
+    code = ("import sys, main; "
+            "print(' '.join(m for m in ('httpx', 'bs4', 'lxml', 'scrapers.base_scraper') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
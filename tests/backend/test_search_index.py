@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.search_index import HackathonSearchIndex, tokenize
+
+
+def make_doc(name: str, city: str, country: str, start: datetime) -> dict:
+    return {
+        "name": name,
+        "date": {"start_date": start, "end_date": start},
+        "location": {"city": city, "country": country, "coordinates": {"lat": 0.0, "long": 0.0}},
+        "url": f"https://{tokenize(name)[0]}.example.com",
+        "status": "announced",
+    }
+
+
+@pytest.fixture
+def index() -> HackathonSearchIndex:
+    index = HackathonSearchIndex()
+    index.build([
+        make_doc("HackZurich", "Zürich", "Switzerland", datetime(2030, 9, 1, tzinfo=timezone.utc)),
+        make_doc("Junction", "Espoo", "Finland", datetime(2030, 11, 1, tzinfo=timezone.utc)),
+        make_doc("Berlin Hack Days", "Berlin", "Germany", datetime(2030, 5, 1, tzinfo=timezone.utc)),
+        make_doc("Hack the North", "Waterloo", "Canada", datetime(2020, 9, 1, tzinfo=timezone.utc)),
+        {"name": "Invalid document without date"},
+    ], version=1)
+    return index
+
+
+def names(results) -> list:
+    return [hackathon["name"] for _, hackathon in results]
+
+
+def test_tokenize_normalizes_case_and_accents():
+    assert tokenize("Hack-Zürich 2030") == ["hack", "zurich", "2030"]
+
+
+def test_prefix_match(index):
+    assert names(index.search("junc", limit=10)) == ["Junction"]
+    assert names(index.search("zur", limit=10)) == ["HackZurich"]  # Accent-insensitive
+
+
+def test_all_words_have_to_match(index):
+    assert names(index.search("hack berl", limit=10)) == ["Berlin Hack Days"]
+    assert names(index.search("hack espoo", limit=10)) == []
+
+
+def test_ranking_prefers_name_and_whole_words(index):
+    # "berlin" is a whole word in the name and the city of the same hackathon, "germany" only the country
+    results = index.search("berlin", limit=10)
+    assert names(results) == ["Berlin Hack Days"]
+    assert results[0][0] == 3.0
+    # Whole word "hack" beats the prefix match in "HackZurich", ties are ordered by start date
+    assert names(index.search("hack", limit=10)) == ["Hack the North", "Berlin Hack Days", "HackZurich"]
+
+
+def test_start_from_filters_past_hackathons(index):
+    start_from = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert names(index.search("hack", limit=10, start_from=start_from)) == ["Berlin Hack Days", "HackZurich"]
+
+
+def test_limit_and_empty_query(index):
+    assert len(index.search("hack", limit=1)) == 1
+    assert index.search("  --- ", limit=10) == []
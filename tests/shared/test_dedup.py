@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+from shared_models.dedup import normalize_name, name_shingles, dedup_blocks, candidate_blocks, NUM_BANDS
+
+
+def test_normalize_name():
+    assert normalize_name("HackZürich 2025") == "hackzurich"
+    assert normalize_name("The Junction Hackathon") == "junction"
+    assert normalize_name(None) == ""
+
+
+def test_spacing_does_not_change_shingles():
+    assert name_shingles("Hack Zurich") == name_shingles("HackZurich")
+
+
+def test_blocks_are_deterministic_and_week_scoped():
+    start = datetime(2030, 9, 16)
+    blocks = dedup_blocks("HackZurich", start)
+    assert len(blocks) == NUM_BANDS
+    assert blocks == dedup_blocks("HackZurich 2030", start + timedelta(days=1))
+    assert dedup_blocks("HackZurich", None) == []
+    assert dedup_blocks("", start) == []
+
+
+def test_candidate_blocks_cover_neighbouring_weeks():
+    start = datetime(2030, 9, 16)
+    candidates = set(candidate_blocks("HackZurich", start))
+    assert set(dedup_blocks("HackZurich", start - timedelta(days=7))) <= candidates
+    assert set(dedup_blocks("HackZurich", start + timedelta(days=7))) <= candidates
+    assert not set(dedup_blocks("HackZurich", start + timedelta(days=21))) & candidates
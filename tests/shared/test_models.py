@@ -0,0 +1,14 @@
+import pytest
+from pydantic import ValidationError
+
+from shared_models.models import Coordinates
+
+
+def test_coordinates_within_range():
+    assert Coordinates(lat=-90, long=180).to_geojson() == {"type": "Point", "coordinates": [180, -90]}
+
+
+@pytest.mark.parametrize("lat, long", [(90.5, 0), (-91, 0), (0, 180.1), (0, -200)])
+def test_coordinates_out_of_range_are_rejected(lat, long):
+    with pytest.raises(ValidationError):
+        Coordinates(lat=lat, long=long)
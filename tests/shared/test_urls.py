@@ -0,0 +1,28 @@
+import pytest
+
+from shared_models import canonicalize_url
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/event",
+    "http://example.com/event",
+    "https://www.example.com/event/",
+    "HTTPS://Example.com/Event",
+    "example.com/event",
+    "https://example.com:443//event#schedule",
+    "https://example.com/event?utm_source=newsletter&utm_medium=email&fbclid=abc",
+])
+def test_variants_share_a_key(url):
+    assert canonicalize_url(url) == "example.com/event"
+
+
+def test_meaningful_differences_are_kept():
+    assert canonicalize_url("https://example.com/event?id=2&lang=en") == "example.com/event?id=2&lang=en"
+    assert canonicalize_url("https://example.com/event?lang=en&id=2") == "example.com/event?id=2&lang=en"
+    assert canonicalize_url("https://example.com:8080/event") == "example.com:8080/event"
+    assert canonicalize_url("https://other.example.com/event") != canonicalize_url("https://example.com/event")
+
+
+def test_empty_urls():
+    assert canonicalize_url(None) is None
+    assert canonicalize_url("  ") is None